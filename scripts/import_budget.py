@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Measure the import cost of pyhabitat and each of its submodules with
+`python -X importtime`, and compare it to the budgets committed in
+scripts/import_budgets.json.
+
+Each module is imported in a fresh interpreter, several times, and the
+lowest cumulative time is kept (the first run also warms the bytecode
+cache). Budgets are in milliseconds.
+
+    python scripts/import_budget.py            # table of cost vs. budget
+    python scripts/import_budget.py --check    # exit 1 if any budget is exceeded
+    python scripts/import_budget.py --update   # rewrite budgets from this machine
+    python scripts/import_budget.py pyhabitat.web --runs 10
+
+The budgets are absolute and were measured on one machine, so the test
+suite only checks them when PYHABITAT_IMPORT_BUDGETS is set. The checks
+that heavy modules stay lazy, and that every module has a budget, always run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import pkgutil
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+BUDGETS_PATH = Path(__file__).resolve().with_name("import_budgets.json")
+
+# --update sets each budget to the measured cost times HEADROOM, rounded up
+# and never below MIN_BUDGET, so timer noise on tiny modules doesn't fail CI.
+HEADROOM = 2.0
+MIN_BUDGET = 10.0
+
+
+def discover_modules() -> list[str]:
+    """pyhabitat and every submodule, except __main__ (which runs the CLI)."""
+    names = ["pyhabitat"]
+    for info in pkgutil.iter_modules([str(SRC / "pyhabitat")]):
+        if info.name != "__main__":
+            names.append(f"pyhabitat.{info.name}")
+    return names
+
+
+def _child_env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(SRC), env.get("PYTHONPATH")) if p)
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    return env
+
+
+def measure_once(module: str) -> int:
+    """Cumulative import time of module in microseconds, from a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=_child_env(),
+    )
+    if result.returncode != 0:
+        last = result.stderr.strip().splitlines()[-1:] or ["import failed"]
+        raise ImportError(f"{module}: {last[0]}")
+    # "import time: self [us] | cumulative | imported package"
+    for line in reversed(result.stderr.splitlines()):
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1])
+    raise ImportError(f"{module}: not found in -X importtime output")
+
+
+def measure(module: str, runs: int = 5) -> float:
+    """Best of runs, in milliseconds."""
+    return min(measure_once(module) for _ in range(max(runs, 1))) / 1000
+
+
+def load_budgets() -> dict[str, float]:
+    try:
+        return json.loads(BUDGETS_PATH.read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Check pyhabitat's import-time budgets")
+    parser.add_argument("modules", nargs="*", help="Modules to measure (default: pyhabitat and all submodules)")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module; the fastest run counts")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--check", action="store_true", help="Exit 1 if a module exceeds its budget or has none")
+    group.add_argument("--update", action="store_true", help=f"Rewrite budgets as {HEADROOM:g}x the measured cost")
+    args = parser.parse_args(argv)
+
+    budgets = load_budgets()
+    modules = args.modules or discover_modules()
+    failures = []
+    measured = {}
+
+    width = max(len(m) for m in modules)
+    print(f"{'module'.ljust(width)}  {'ms':>8}  {'budget':>8}")
+    for module in modules:
+        try:
+            cost = measure(module, args.runs)
+        except ImportError as e:
+            print(f"{module.ljust(width)}  {'error':>8}  {e}")
+            failures.append(module)
+            continue
+        measured[module] = cost
+        budget = budgets.get(module)
+        over = budget is None or cost > budget
+        flag = "  OVER" if budget is not None and cost > budget else ("  (no budget)" if budget is None else "")
+        print(f"{module.ljust(width)}  {cost:8.2f}  {budget if budget is not None else '-':>8}{flag}")
+        if over:
+            failures.append(module)
+
+    if args.update:
+        budgets.update({m: max(float(math.ceil(cost * HEADROOM)), MIN_BUDGET) for m, cost in measured.items()})
+        BUDGETS_PATH.write_text(json.dumps(dict(sorted(budgets.items())), indent=2) + "\n")
+        print(f"Wrote {BUDGETS_PATH}")
+        return 0
+    if args.check and failures:
+        print(f"Over budget: {', '.join(failures)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
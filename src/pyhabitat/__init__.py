@@ -18,6 +18,7 @@ __all__ = [
     "on_macos",
     "on_chromeos_crostini",
     "on_ish_alpine",
+    "in_container",
     "as_pyinstaller",
     "as_frozen",
     "is_msix",
@@ -50,12 +51,14 @@ __all__ = [
     "is_in_git_repo",
     "read_magic_bytes",
     "check_executable_path",
+    "fingerprint",
 
     # system_info
     "SystemInfo",
 
     # reporting
     "report",
+    "collect_report",
 
     # launch
     "edit_textfile",
@@ -70,6 +73,9 @@ __all__ = [
     "browse_directory",
     "serve_directory",
     "serve_file",
+
+    # readiness
+    "wait_until_ready",
 ]
 
 
@@ -84,6 +90,7 @@ _ENVIRONMENT_EXPORTS = {
     "on_macos",
     "on_chromeos_crostini",
     "on_ish_alpine",
+    "in_container",
     "as_pyinstaller",
     "as_frozen",
     "is_msix",
@@ -119,6 +126,7 @@ _FILE_CHARACTER_EXPORTS = {
     "is_in_git_repo",
     "read_magic_bytes",
     "check_executable_path",
+    "fingerprint",
 }
 
 _LAUNCH_EXPORTS = {
@@ -137,6 +145,10 @@ _WEB_EXPORTS = {
     "serve_file",
 }
 
+_READINESS_EXPORTS = {
+    "wait_until_ready",
+}
+
 
 def __getattr__(name: str):
 
@@ -160,9 +172,9 @@ def __getattr__(name: str):
         from .system_info import SystemInfo
         value = SystemInfo
 
-    elif name == "report":
-        from .reporting import report
-        value = report
+    elif name in ("report", "collect_report"):
+        from . import reporting
+        value = getattr(reporting, name)
 
     elif name in _LAUNCH_EXPORTS:
         from . import launch
@@ -172,6 +184,10 @@ def __getattr__(name: str):
         from . import web
         value = getattr(web, name)
 
+    elif name in _READINESS_EXPORTS:
+        from . import readiness
+        value = getattr(readiness, name)
+
     else:
         raise AttributeError(
             f"module {__name__!r} has no attribute {name!r}"
@@ -0,0 +1,56 @@
+# src/pyhabitat/_cli_manifest.py
+# Generated by `python -m pyhabitat.cli_manifest`; do not edit by hand.
+# command -> (module, help, ((parameter, kind), ...)); kind is one of
+# "bool", "path", "int", "float" or "str".
+
+MANIFEST = {
+    'on_termux': ('pyhabitat.environment', 'Detect if running in Termux environment on Android, based on Termux-specific environmental variables.', ()),
+    'on_freebsd': ('pyhabitat.environment', 'Detect if running on FreeBSD.', ()),
+    'on_linux': ('pyhabitat.environment', 'Detect if running on Linux.', ()),
+    'on_pydroid': ('pyhabitat.environment', 'Return True if running under Pydroid 3 (Android app).', ()),
+    'on_android': ('pyhabitat.environment', 'Detect if running on Android.', ()),
+    'on_windows': ('pyhabitat.environment', 'Detect if running on Windows.', ()),
+    'on_wsl': ('pyhabitat.environment', 'Return True if running inside Windows Subsystem for Linux (WSL or WSL2).', ()),
+    'on_macos': ('pyhabitat.environment', 'Detect if running on MacOS. Does not consider on_ish_alpine().', ()),
+    'on_chromeos_crostini': ('pyhabitat.environment', 'Detects if running within a Crostini Linux container on ChromeOS.', ()),
+    'on_ish_alpine': ('pyhabitat.environment', 'Detect if running in iSH Alpine environment on iOS.', ()),
+    'in_container': ('pyhabitat.environment', 'Detect if running inside a Linux container (Docker, Podman, Kubernetes, LXC, systemd-nspawn).', ()),
+    'as_pyinstaller': ('pyhabitat.environment', "Detects if the Python script is running as a 'frozen' in the course of generating a PyInstaller binary executable.", ()),
+    'as_frozen': ('pyhabitat.environment', "Detects if the Python script is running as a 'frozen' (standalone) ", ()),
+    'is_msix': ('pyhabitat.environment', 'Detect whether the current Python process is running inside an MSIX', ()),
+    'in_repl': ('pyhabitat.environment', "Detects if the code is running in the Python interactive REPL (e.g., when 'python' is typed in a console).", ()),
+    'interp_path': ('pyhabitat.environment', 'Returns the path to the Python interpreter binary and optionally prints it.', (('debug', 'bool'),)),
+    'get_interp_shebang': ('pyhabitat.environment', 'Returns the most compatible shebang for the current platform.', ()),
+    'is_likely_ci_or_non_interactive': ('pyhabitat.console', 'Heuristic: are we probably in a CI/CD pipeline or non-interactive container?', ()),
+    'interactive_terminal_is_available': ('pyhabitat.console', 'Check if the script is running in an interactive terminal. ', ()),
+    'can_spawn_shell': ('pyhabitat.console', 'Check if a shell command can be executed successfully.', (('override_known', 'bool'),)),
+    'user_darrin_deyoung': ('pyhabitat.console', 'Detect typical demo/kiosk Windows user account on retail systems (e.g. Walmart demo units).', ()),
+    'is_running_in_uvicorn': ('pyhabitat.console', 'Heuristic check to see if the current code is running inside a Uvicorn worker process.', ()),
+    'can_spawn_shell_lite': ('pyhabitat.console', 'Check if a shell command can be executed successfully.', ()),
+    'matplotlib_is_available_for_gui_plotting': ('pyhabitat.gui_elements', 'Check if Matplotlib is available AND can use a GUI backend for a popup window.', (('termux_has_gui', 'str'),)),
+    'matplotlib_is_available_for_headless_image_export': ('pyhabitat.gui_elements', 'Check if Matplotlib is available AND can use the Agg backend for image export.', ()),
+    'tkinter_is_available': ('pyhabitat.gui_elements', 'Check if tkinter is available and can successfully connect to a display.', ()),
+    'web_browser_is_available': ('pyhabitat.gui_elements', 'Check if a web browser can be launched in the current environment.', ()),
+    'is_elf': ('pyhabitat.file_character', 'Checks if the currently running executable (sys.argv[0]) is a standalone PyInstaller-built ELF binary.', (('exec_path', 'str'), ('debug', 'bool'), ('suppress_debug', 'bool'))),
+    'is_pyz': ('pyhabitat.file_character', 'Checks if the currently running executable (sys.argv[0]) is a PYZ zipapp .', (('exec_path', 'str'), ('debug', 'bool'), ('suppress_debug', 'bool'))),
+    'is_windows_portable_executable': ('pyhabitat.file_character', 'Checks if the specified path or sys.argv[0] is a Windows Portable Executable (PE) binary.', (('exec_path', 'str'), ('debug', 'bool'), ('suppress_debug', 'bool'))),
+    'is_macos_executable': ('pyhabitat.file_character', 'Checks if the currently running executable is a macOS/Darwin Mach-O binary, ', (('exec_path', 'str'), ('debug', 'bool'), ('suppress_debug', 'bool'))),
+    'is_pipx': ('pyhabitat.file_character', 'Checks if the executable is running from a pipx managed environment.', (('exec_path', 'str'), ('debug', 'bool'), ('suppress_debug', 'bool'))),
+    'is_python_script': ('pyhabitat.file_character', 'Checks if the specified path or running script is a Python source file (.py).', (('path', 'str'), ('debug', 'bool'), ('suppress_debug', 'bool'))),
+    'is_in_git_repo': ('pyhabitat.file_character', 'Checks if a path is in a Git repo.', (('path', 'str'),)),
+    'read_magic_bytes': ('pyhabitat.file_character', 'Return the first few bytes of a file for type detection.', (('path', 'str'), ('length', 'int'), ('debug', 'bool'))),
+    'check_executable_path': ('pyhabitat.file_character', 'Helper function to resolve an executable path and perform common checks.', (('exec_path', 'str'), ('debug', 'bool'), ('check_pipx', 'bool'))),
+    'fingerprint': ('pyhabitat.file_character', "Return the hex digest of a file's contents, hashed via mmap in large blocks.", (('path', 'str'), ('algo', 'str'))),
+    'SystemInfo': ('pyhabitat.system_info', 'Detects the current OS, distro, and version information.', ()),
+    'edit_textfile': ('pyhabitat.launch', "Opens a file with the environment's default application.", (('path', 'str'), ('background', 'str'))),
+    'show_system_explorer': ('pyhabitat.launch', 'Opens the system file explorer (File Explorer, Finder, or Nautilus/etc.)', (('path', 'str'),)),
+    'launch_file': ('pyhabitat.launch', "Opens a file or directory with the host system's default application.", (('path', 'str'),)),
+    'open_with_thunar': ('pyhabitat.launch', 'Run pyhabitat.open_with_thunar()', (('path', 'str'),)),
+    'launch_browser_after_http_poll': ('pyhabitat.web', "Open the user's browser as soon as a local HTTP server accepts connections.", (('url', 'str'), ('timeout', 'float'), ('poll_interval', 'float'))),
+    'launch_browser_now': ('pyhabitat.web', 'Open a URL using the best available launcher.', (('url', 'str'),)),
+    'find_open_port': ('pyhabitat.web', 'Return an available TCP port, searching upward defensively if contested.', (('start_port', 'int'), ('host', 'str'), ('max_attempts', 'int'))),
+    'browse_directory': ('pyhabitat.web', 'Run pyhabitat.browse_directory()', (('path', 'str'),)),
+    'serve_directory': ('pyhabitat.web', "Serve a directory using pyhabitat's servedirs HTTP server.", (('path', 'str'), ('host', 'str'), ('port', 'str'), ('rate_limit', 'str'), ('global_rate_limit', 'str'))),
+    'serve_file': ('pyhabitat.web', 'Run pyhabitat.serve_file()', (('path', 'str'), ('host', 'str'), ('port', 'str'))),
+    'wait_until_ready': ('pyhabitat.readiness', 'Wait until a local service accepts TCP connections (and, if health_path', (('url', 'str'), ('timeout', 'float'), ('health_path', 'str'), ('initial_delay', 'float'), ('max_delay', 'float'), ('attempt_timeout', 'float'))),
+}
@@ -1,6 +1,9 @@
 # pyhabitat/_compat.py
 from __future__ import annotations
+import os
 import sys
+import threading
+import weakref
 from functools import lru_cache, wraps
 
 if sys.version_info >= (3, 9):
@@ -18,3 +21,95 @@ else:
         # Optional: allow clearing cache like functools.cache
         wrapper.cache_clear = cached_func.cache_clear
         return wrapper
+
+
+class _Flight:
+    """One in-progress call that later callers with the same arguments wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: BaseException | None = None
+
+
+class _SingleFlightState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.results: dict = {}
+        self.flights: dict = {}
+        self.generation = 0
+
+    def clear(self) -> None:
+        with self.lock:
+            self.results.clear()
+            self.flights.clear()
+            self.generation += 1
+
+    def after_fork(self) -> None:
+        # Threads that held the lock or led a flight don't exist in the child.
+        self.lock = threading.Lock()
+        self.flights.clear()
+
+
+_single_flight_states: weakref.WeakSet = weakref.WeakSet()
+
+
+def single_flight(func=None, *, store: bool = True):
+    """
+    Like cache, but concurrent calls with the same arguments share one
+    computation: the first caller runs func and the others block until it
+    finishes, then reuse its result. An exception is raised in every caller
+    of that flight and is not cached, so the next call tries again.
+
+    With @single_flight(store=False) results are not kept either: only calls
+    that overlap share one computation, and every later call runs func again.
+    """
+    if func is None:
+        return lambda f: single_flight(f, store=store)
+    state = _SingleFlightState()
+    _single_flight_states.add(state)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+        with state.lock:
+            if key in state.results:
+                return state.results[key]
+            flight = state.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = state.flights[key] = _Flight()
+                generation = state.generation
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = func(*args, **kwargs)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with state.lock:
+                # A cache_clear() during the call means the result may be stale.
+                if store and flight.error is None and generation == state.generation:
+                    state.results[key] = flight.value
+                if state.flights.get(key) is flight:
+                    del state.flights[key]
+            flight.done.set()
+        return flight.value
+
+    wrapper.cache_clear = state.clear
+    return wrapper
+
+
+def _after_fork_in_child() -> None:
+    for state in list(_single_flight_states):
+        state.after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -1,5 +1,5 @@
 # src/pyhabitat/_version.py
-from pathlib import Path
+import os
 
 def get_version() -> str:
     # 1. Try local VERSION file FIRST (Source/Dev/Bundled)
@@ -7,9 +7,11 @@ def get_version() -> str:
     # the code currently running uses its own sibling VERSION file.
     try:
         # Path relative to this file: src/pyhabitat/VERSION
-        version_file = Path(__file__).resolve().parent / "VERSION"
-        if version_file.exists():
-            return version_file.read_text(encoding="utf-8").strip()
+        # (os.path rather than pathlib keeps `import pyhabitat` cheap)
+        version_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), "VERSION")
+        if os.path.exists(version_file):
+            with open(version_file, encoding="utf-8") as f:
+                return f.read().strip()
     except Exception:
         print("VERSION not found")
         pass
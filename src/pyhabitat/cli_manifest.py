@@ -0,0 +1,130 @@
+"""
+pyhabitat.cli_manifest
+
+Generate and check _cli_manifest.py, the static table of CLI commands that
+cli_rising builds its parser from. Reading the table instead of introspecting
+pyhabitat.__all__ at startup means a CLI call imports only the module that
+holds the command being run, and `pyhabitat --version` imports none of them.
+
+Regenerate after changing __all__ or a command's signature or docstring:
+
+    python -m pyhabitat.cli_manifest          # rewrite _cli_manifest.py
+    python -m pyhabitat.cli_manifest --check  # exit 1 if it is stale (CI, tests)
+"""
+
+from __future__ import annotations
+
+import argparse
+import inspect
+import sys
+import typing
+from pathlib import Path
+
+__all__ = [
+    'build_manifest',
+    'render_manifest',
+    'MANIFEST_PATH',
+]
+
+MANIFEST_PATH = Path(__file__).with_name("_cli_manifest.py")
+
+# Exported names that are not standalone subcommands.
+SKIPPED = ("__version__", "report", "collect_report", "safe_notify")
+
+_HEADER = '''\
+# src/pyhabitat/_cli_manifest.py
+# Generated by `python -m pyhabitat.cli_manifest`; do not edit by hand.
+# command -> (module, help, ((parameter, kind), ...)); kind is one of
+# "bool", "path", "int", "float" or "str".
+'''
+
+
+def _kind(annotation) -> str:
+    if annotation is bool:
+        return "bool"
+    if annotation is Path:
+        return "path"
+    if annotation in (int, float, str):
+        return annotation.__name__
+    return "str"
+
+
+def _type_hints(target, sig: inspect.Signature) -> dict:
+    """
+    Resolved parameter annotations. Falls back to resolving them one at a
+    time, so a return or parameter type that is only imported under
+    TYPE_CHECKING does not hide the others.
+    """
+    try:
+        return typing.get_type_hints(target)
+    except Exception:
+        pass
+    namespace = getattr(target, "__globals__", {})
+    hints = {}
+    for name, param in sig.parameters.items():
+        annotation = param.annotation
+        if isinstance(annotation, str):
+            try:
+                annotation = eval(annotation, namespace)
+            except Exception:
+                continue
+        if annotation is not param.empty:
+            hints[name] = annotation
+    return hints
+
+
+def build_manifest() -> dict[str, tuple]:
+    """Introspect pyhabitat.__all__ the way the CLI used to at every startup."""
+    import pyhabitat
+
+    manifest = {}
+    for name in pyhabitat.__all__:
+        if name in SKIPPED:
+            continue
+        func = getattr(pyhabitat, name, None)
+        if not callable(func):
+            continue
+        target = func.__init__ if inspect.isclass(func) else func
+        try:
+            sig = inspect.signature(func)
+        except (ValueError, TypeError):
+            continue
+        type_hints = _type_hints(target, sig)
+        doc = func.__doc__ or f"Run pyhabitat.{name}()"
+        params = tuple(
+            (p, _kind(type_hints.get(p, str)))
+            for p, param in sig.parameters.items()
+            if param.kind not in (param.VAR_POSITIONAL, param.VAR_KEYWORD)
+        )
+        manifest[name] = (func.__module__, doc.strip().split("\n")[0], params)
+    return manifest
+
+
+def render_manifest(manifest: dict[str, tuple]) -> str:
+    lines = [_HEADER, "MANIFEST = {"]
+    for name, (module, help_text, params) in manifest.items():
+        lines.append(f"    {name!r}: ({module!r}, {help_text!r}, {params!r}),")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate pyhabitat's static CLI manifest")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if the committed manifest is out of date")
+    args = parser.parse_args(argv)
+
+    rendered = render_manifest(build_manifest())
+    current = MANIFEST_PATH.read_text() if MANIFEST_PATH.exists() else ""
+    if args.check:
+        if rendered != current:
+            print(f"{MANIFEST_PATH.name} is stale; run: python -m pyhabitat.cli_manifest", file=sys.stderr)
+            return 1
+        return 0
+    if rendered != current:
+        MANIFEST_PATH.write_text(rendered)
+        print(f"Wrote {MANIFEST_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
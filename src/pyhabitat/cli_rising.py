@@ -1,23 +1,160 @@
 # src/pyhabitat/cli_rising.py
 from __future__ import annotations
 import argparse
-import inspect
+import importlib
 import logging
+import os
 from pathlib import Path
 import sys
-import typing
 
-
-import pyhabitat
 from ._version import __version__
-from .logging_setup import configure_logging
+from ._cli_manifest import MANIFEST
 
 logger = logging.getLogger(__name__)
 
+# Parameter kinds recorded in _cli_manifest.py -> argparse type
+_ARG_TYPES = {"path": Path, "int": int, "float": float, "str": str}
+
+
+def _clear_caches() -> None:
+    """Clear every cached environment check the CLI can run."""
+    from . import console, file_character, gui_elements
+    gui_elements.clear_mpl_cache()
+    console.clear_shell_cache()
+    file_character.clear_fingerprint_cache()
+
+
+def _resolve(command: str):
+    """Import only the module that defines `command` and return the callable."""
+    module, _, _ = MANIFEST[command]
+    return getattr(importlib.import_module(module), command)
+
+
+_TRUE = {"1", "true", "yes", "on"}
+_FALSE = {"0", "false", "no", "off", ""}
+
+
+def _convert(kind: str, raw: str):
+    if kind == "bool":
+        lowered = raw.lower()
+        if lowered in _TRUE:
+            return True
+        if lowered in _FALSE:
+            return False
+        raise ValueError(f"expected a boolean, got {raw!r}")
+    if kind == "path":
+        return Path(raw)
+    return _ARG_TYPES.get(kind, str)(raw)
+
+
+def parse_query_token(token: str) -> tuple[str, dict]:
+    """
+    'is_elf:exec_path=/bin/ls,debug=no' -> ('is_elf', {'exec_path': Path('/bin/ls'), 'debug': False}).
+    A bare 'path=' value is passed as whichever of path/exec_path the command takes.
+    """
+    name, _, arg_text = token.partition(":")
+    if name not in MANIFEST:
+        raise ValueError(f"unknown command {name!r}")
+    _, _, params = MANIFEST[name]
+    kinds = dict(params)
+    kwargs = {}
+    for item in filter(None, arg_text.split(",")):
+        key, sep, raw = item.partition("=")
+        if not sep:
+            raise ValueError(f"expected key=value, got {item!r}")
+        if key == "path" and "path" not in kinds and "exec_path" in kinds:
+            key = "exec_path"
+        if key not in kinds:
+            raise ValueError(f"{name} takes no argument {key!r}")
+        value = _convert(kinds[key], raw)
+        # Match the subcommands: path-like arguments are always Path objects.
+        kwargs[key] = Path(value) if key in {"path", "exec_path"} else value
+    return name, kwargs
+
+
+def _jsonable(value):
+    if isinstance(value, (str, bool, int, float)) or value is None:
+        return value
+    if isinstance(value, bytes):
+        return value.hex()
+    if isinstance(value, Path):
+        return str(value)
+    if hasattr(value, "__dict__"):
+        return {k: _jsonable(v) for k, v in vars(value).items()}
+    return str(value)
+
+
+def _env_key(token: str, prefix: str) -> str:
+    import re
+    key = re.sub(r"\W", "_", token)
+    return f"{prefix}{key}"
+
+
+def run_query(tokens: list[str], fmt: str = "json", prefix: str = "", use_daemon: bool = False) -> int:
+    """
+    Evaluate many commands in one process through the shared snapshot and
+    print the results as one JSON object, or as shell-quoted KEY=value lines
+    for `eval`. Failed commands are reported on stderr with a null value;
+    the exit status is 1 if any failed. With use_daemon, host facts are asked
+    of a running `pyhabitat daemon` first (see pyhabitat.daemon).
+    """
+    from .snapshot import HOST_FACTS, default_snapshot
+
+    snapshot = default_snapshot()
+    results = {}
+    if use_daemon:
+        from .daemon import DaemonClient
+        shared = [token for token in dict.fromkeys(tokens) if token in HOST_FACTS]
+        results.update((shared and DaemonClient().get(shared)) or {})
+    failed = False
+    for token in tokens:
+        if token in results:
+            continue
+        try:
+            name, kwargs = parse_query_token(token)
+            results[token] = _jsonable(snapshot.fact(name, **kwargs))
+        except Exception as e:
+            print(f"pyhabitat query: {token}: {e}", file=sys.stderr)
+            results[token] = None
+            failed = True
+
+    if fmt == "env":
+        import shlex
+        lines = []
+        for token, value in results.items():
+            if isinstance(value, bool):
+                text = "true" if value else "false"
+            elif value is None:
+                text = ""
+            elif isinstance(value, dict):
+                import json
+                text = json.dumps(value)
+            else:
+                text = str(value)
+            lines.append(f"{_env_key(token, prefix)}={shlex.quote(text)}")
+        sys.stdout.write("\n".join(lines) + "\n")
+    else:
+        import json
+        sys.stdout.write(json.dumps(results) + "\n")
+    return 1 if failed else 0
+
 
 def run_cli() -> None:
     """Parse CLI arguments using subparsers for an elegant, scalable tool."""
+    # PYHABITAT_PROFILE=1 (or =<file>) runs any command under cProfile.
+    if os.environ.get("PYHABITAT_PROFILE", "").lower() not in ("", "0", "false", "no", "off"):
+        from .profiling import run_profiled
+        return run_profiled(_run_cli)
+    return _run_cli()
+
+
+def _run_cli() -> None:
     current_version = __version__
+
+    # Fast path: nothing but the version string is needed.
+    if sys.argv[1:] in (["-v"], ["--version"]):
+        print(f"PyHabitat {current_version}")
+        return
     
     # Root parser
     parser = argparse.ArgumentParser(
@@ -57,81 +194,92 @@ def run_cli() -> None:
     # 1. Register a dedicated subparser for the default full system report
     report_parser = subparsers.add_parser("report", help="Run the full pyhabitat environment report (default)")
     report_parser.add_argument("--path", type=str, default=None, help="Path to inspect (defaults to sys.argv[0])")
+    report_parser.add_argument(
+        "--format", choices=("text", "json", "markdown"), default="text",
+        help="Output format (default: text)",
+    )
 
-    # 2. Dynamically loop through __all__ and map functions to CLI sub-commands
-    for name in pyhabitat.__all__:
-        if name in ("__version__", "report", "safe_notify"):
-            continue
-            
-        func = getattr(pyhabitat, name, None)
-        type_hints = typing.get_type_hints(func)
-
-        if not callable(func):
-            continue
-
-        # Create a subcommand matching the exact function name
-        doc = func.__doc__ or f"Run pyhabitat.{name}()"
-        first_line_doc = doc.strip().split("\n")[0]
-        cmd_parser = subparsers.add_parser(name, help=first_line_doc)
-
-        # Inspect the function signature to add targeted parameters automatically
-        # ---
-        try:
-            sig = inspect.signature(func)
-
-            for name, param in sig.parameters.items():
-
-                # skip debug and info arga because they exist as base command flags
-                if name in {"debug", "info"}:
-                    continue
-
-                arg = f"--{name.replace('_', '-')}"
+    # 2. Evaluate many commands in one process
+    query_parser = subparsers.add_parser(
+        "query", help="Evaluate several commands at once, e.g. query on_wsl is_elf:path=X"
+    )
+    query_parser.add_argument(
+        "tokens", nargs="+", metavar="command[:key=value,...]",
+        help="Commands to evaluate; arguments follow a colon, comma-separated",
+    )
+    query_parser.add_argument(
+        "--format", choices=("json", "env"), default="json",
+        help="One JSON object (default) or KEY=value lines for eval",
+    )
+    query_parser.add_argument(
+        "--prefix", default="", help="Prefix for KEY names in --format env output"
+    )
+    query_parser.add_argument(
+        "--daemon", action="store_true",
+        help="Ask a running `pyhabitat daemon` for host facts first (also: PYHABITAT_DAEMON=1)",
+    )
 
-                kwargs = {
-                    "dest": name,
-                }
+    # 3. Serve host facts to other processes
+    daemon_parser = subparsers.add_parser(
+        "daemon", help="Keep host facts warm and serve them over a Unix socket"
+    )
+    daemon_parser.add_argument("--socket", default=None, help="Socket path (default: $PYHABITAT_SOCKET or the runtime dir)")
+    daemon_parser.add_argument("--watch-interval", type=float, default=2.0, help="Seconds between checks of watched files")
+    daemon_group = daemon_parser.add_mutually_exclusive_group()
+    daemon_group.add_argument("--status", action="store_true", help="Exit 0 if a daemon is answering, 1 if not")
+    daemon_group.add_argument("--stop", action="store_true", help="Ask a running daemon to exit")
+
+    # 4. Stream changes to display, TTY, network mounts and git state
+    watch_parser = subparsers.add_parser(
+        "watch", help="Print JSON lines whenever display, tty, mounts or git state change"
+    )
+    watch_parser.add_argument(
+        "facts", nargs="*", metavar="fact",
+        help="Facts to follow: display, tty, mounts, git (default: all)",
+    )
+    watch_parser.add_argument("--interval", type=float, default=2.0, help="Seconds between checks (default: 2)")
 
-                annotation = type_hints.get(name, str)
-                if annotation is bool:
-                    kwargs["action"] = argparse.BooleanOptionalAction
-                if annotation is Path:
-                    kwargs["type"] = Path
-                elif annotation in (int, float, str):
-                    kwargs["type"] = annotation
-                else:
-                    kwargs["type"] = str
+    # 5. Profile the detectors on this machine
+    profile_parser = subparsers.add_parser(
+        "profile", help="Time every detector cold and warm; count file opens, spawns and memory"
+    )
+    profile_parser.add_argument(
+        "names", nargs="*", metavar="detector", help="Detectors to profile (default: all)"
+    )
+    profile_parser.add_argument("--runs", type=int, default=5, help="Calls per detector, cold and warm (default: 5)")
+    profile_parser.add_argument("--format", choices=("text", "json"), default="text")
 
-                # ---
-                '''
-                kwargs = {
-                    "dest": name,
-                    "type": str,
-                }
+    # 6. Map commands to sub-commands from the static manifest (see cli_manifest.py);
+    # nothing is imported or introspected here.
+    for name, (_module, first_line_doc, params) in MANIFEST.items():
+        cmd_parser = subparsers.add_parser(name, help=first_line_doc)
 
-                if param.default is inspect.Parameter.empty:
-                    kwargs["required"] = True
-                else:
-                    kwargs["default"] = param.default
-                '''
-                cmd_parser.add_argument(arg, **kwargs)
+        for param_name, kind in params:
+            # skip debug and info arga because they exist as base command flags
+            if param_name in {"debug", "info"}:
+                continue
+
+            arg = f"--{param_name.replace('_', '-')}"
+            kwargs = {
+                "dest": param_name,
+            }
+            if kind == "bool":
+                kwargs["action"] = argparse.BooleanOptionalAction
+            else:
+                kwargs["type"] = _ARG_TYPES.get(kind, str)
+            cmd_parser.add_argument(arg, **kwargs)
 
-        # ---
-        except (ValueError, TypeError):
-            logger.warning("Cannot inspect %s", func)
-            continue
-        
     # Intercept --clear-cache before parsing so it bypasses required subcommands
     if "--clear-cache" in sys.argv:
-        if hasattr(pyhabitat, "clear_mpl_cache"):
-            pyhabitat.clear_mpl_cache()
-        if hasattr(pyhabitat, "clear_shell_cache"):
-            pyhabitat.clear_shell_cache()
-        pyhabitat.safe_notify("All cached results cleared to allow for fresh checks.")
+        from .console import safe_notify
+        _clear_caches()
+        safe_notify("All cached results cleared to allow for fresh checks.")
         return
 
     # Handle the empty arguments edge-case by falling back to the standard report
     if len(sys.argv) == 1:
-        pyhabitat.report(path=None, debug=False)
+        from .reporting import report
+        report(path=None, debug=False)
         return
 
     args = parser.parse_args()
@@ -140,9 +288,27 @@ def run_cli() -> None:
     configure_logging(debug=args.debug, info=args.info)
 
     # Execution logic branch
+    if args.command == "query":
+        use_daemon = args.daemon or os.environ.get("PYHABITAT_DAEMON", "").lower() in _TRUE
+        sys.exit(run_query(args.tokens, args.format, args.prefix, use_daemon))
+
+    if args.command == "watch":
+        from .watch import run_watch
+        sys.exit(run_watch(args.facts, args.interval))
+
+    if args.command == "daemon":
+        from .daemon import run_daemon
+        sys.exit(run_daemon(args.socket, args.watch_interval, args.status, args.stop))
+
+    if args.command == "profile":
+        from .profiling import profile_detectors, render_profile
+        sys.stdout.write(render_profile(profile_detectors(args.names, args.runs), args.format))
+        return
+
     if args.command == "report":
+        from .reporting import report
         report_path = Path(args.path) if args.path else None
-        pyhabitat.report(path=report_path, debug=args.debug)
+        report(path=report_path, debug=args.debug, fmt=args.format)
         return
     # ---
     '''
@@ -195,18 +361,13 @@ def run_cli() -> None:
         # ---
     '''
     if args.command:
-        func = getattr(pyhabitat, args.command)
-
-        try:
-            sig = inspect.signature(func)
-            params = sig.parameters
-        except (ValueError, TypeError):
-            params = {}
+        func = _resolve(args.command)
+        _, _, params = MANIFEST[args.command]
 
         kwargs = {}
 
         # Copy parsed CLI arguments into function arguments
-        for name, param in params.items():
+        for name, _kind in params:
             if hasattr(args, name):
                 value = getattr(args, name)
 
@@ -222,6 +383,11 @@ def run_cli() -> None:
         try:
             result = func(**kwargs)
 
+            # Coroutine functions are run to completion on a fresh event loop.
+            if hasattr(result, "__await__") and hasattr(result, "send"):
+                import asyncio
+                result = asyncio.run(result)
+
             if result is not None:
                 if hasattr(result, "__dict__") and not isinstance(
                     result, (str, bool, int, dict, list)
@@ -232,6 +398,7 @@ def run_cli() -> None:
                     print(result)
 
         except Exception as e:
-            pyhabitat.safe_notify(
+            from .console import safe_notify
+            safe_notify(
                 f"Error executing '{args.command}': {e}"
             )
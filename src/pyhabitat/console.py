@@ -2,11 +2,9 @@
 from __future__ import annotations
 import os
 import sys
-import subprocess
-import getpass
 import shutil
 
-from ._compat import cache
+from ._compat import single_flight
 from .environment import on_windows
 
 __all__ = [
@@ -19,7 +17,7 @@ __all__ = [
 ]
 
 def clear_shell_cache()->None:
-    """Clear every @cache used in pyhabitat, and call from CLI using --clear-cache"""
+    """Clear the cached shell checks, and call from CLI using --clear-cache"""
     can_spawn_shell.cache_clear()
     can_spawn_shell_lite.cache_clear()
 
@@ -126,15 +124,16 @@ def interactive_terminal_is_available():
     return sys.stdin.isatty() and sys.stdout.isatty()
 
 
-@cache
+@single_flight
 def can_spawn_shell_lite()->bool: 
     """Check if a shell command can be executed successfully.""" 
     from .environment import on_windows
     return shutil.which('cmd.exe' if on_windows() else "sh") is not None
 
-@cache
+@single_flight
 def can_spawn_shell(override_known:bool=False)->bool: 
     """Check if a shell command can be executed successfully.""" 
+    import subprocess
     from .environment import on_windows
     cmd = "cmd.exe /c exit 0" if on_windows() else "true"
     try:
@@ -187,6 +186,7 @@ def user_darrin_deyoung():
     # Darrin Deyoung is the typical username on demo-mode Windows systems
     if not on_windows():
         return False
+    import getpass
     username = getpass.getuser()
     return username.lower() == "darrin deyoung"
 
@@ -0,0 +1,351 @@
+"""
+pyhabitat.daemon
+
+Keep the host facts (pyhabitat.snapshot.HOST_FACTS) warm in one long-lived
+process and answer queries over a Unix domain socket, so short-lived cron
+jobs and shell prompts don't each re-detect WSL, Termux, ChromeOS or a
+container.
+
+    pyhabitat daemon &                     # serve until stopped
+    pyhabitat query --daemon on_wsl on_termux
+    pyhabitat daemon --stop
+
+Protocol: one UTF-8 request line, one reply line, on a connection that may
+carry several requests.
+
+    PING                          -> OK pyhabitat <version>
+    GET <digest> <name> ...       -> OK {"name": value, ...} | STALE | ERR <reason>
+    INVALIDATE [<name> ...]       -> OK
+    SHUTDOWN                      -> OK
+
+<digest> is snapshot.env_digest() of the requested names in the client's
+environment. When it differs from the daemon's the reply is STALE and the
+client detects locally. The socket's directory must belong to this user
+with mode 0700, or neither the daemon nor its clients will use it, so
+another local user can't pre-create it and serve forged facts. The daemon also polls a few files that detection
+reads (e.g. /etc/wsl.conf, /.dockerenv) and forgets everything when one of
+them appears, disappears or changes.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Iterable, Optional
+
+from ._version import __version__
+from .snapshot import HOST_FACTS, HabitatSnapshot, default_snapshot, env_digest, prewarm
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'FactsDaemon',
+    'DaemonClient',
+    'default_socket_path',
+    'facts',
+    'run_daemon',
+    'WATCHED_PATHS',
+]
+
+# Files and directories the host detectors look at.
+WATCHED_PATHS = (
+    "/etc/os-release",
+    "/etc/wsl.conf",
+    "/.dockerenv",
+    "/run/.containerenv",
+    "/mnt/chromeos",
+    "/etc/apk",
+    "/proc/ish",
+)
+
+_MAX_LINE = 4096
+
+
+def default_socket_path() -> str:
+    """$PYHABITAT_SOCKET, else pyhabitat.sock in $XDG_RUNTIME_DIR or a private temp directory."""
+    configured = os.environ.get("PYHABITAT_SOCKET")
+    if configured:
+        return configured
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "pyhabitat.sock")
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(tempfile.gettempdir(), f"pyhabitat-{uid}", "pyhabitat.sock")
+
+
+def _socket_dir_problem(socket_path: str) -> Optional[str]:
+    """Why the socket's directory is unsafe to use, or None if only we can write to it."""
+    directory = os.path.dirname(os.path.abspath(socket_path))
+    try:
+        st = os.lstat(directory)
+    except OSError as e:
+        return f"{directory}: {e.strerror}"
+    if not stat.S_ISDIR(st.st_mode):
+        return f"{directory} is not a directory"
+    if hasattr(os, "getuid") and st.st_uid != os.getuid():
+        return f"{directory} is owned by uid {st.st_uid}, not {os.getuid()}"
+    if stat.S_IMODE(st.st_mode) != 0o700:
+        return f"{directory} has mode {stat.S_IMODE(st.st_mode):o}, not 700"
+    return None
+
+
+def _stat_signature(paths: Iterable[str]) -> tuple:
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            signature.append((path, st.st_mtime_ns, st.st_size, st.st_ino))
+        except OSError:
+            signature.append((path, None))
+    return tuple(signature)
+
+
+# --- server ---
+
+class _Handler(socketserver.StreamRequestHandler):
+    timeout = 5
+
+    def handle(self) -> None:
+        while True:
+            try:
+                line = self.rfile.readline(_MAX_LINE)
+            except (OSError, ValueError):
+                return
+            if not line:
+                return
+            reply = self.server.facts_daemon.respond(line.decode("utf-8", "replace").strip())
+            try:
+                self.wfile.write(reply.encode("utf-8") + b"\n")
+                self.wfile.flush()
+            except OSError:
+                return
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def service_actions(self) -> None:
+        self.facts_daemon.check_watched()
+
+
+class FactsDaemon:
+    """
+    Serve HOST_FACTS from one snapshot over a Unix socket.
+
+    watch_interval is how often (seconds) WATCHED_PATHS are re-checked;
+    prewarm computes every host fact before the first client connects.
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        watch_interval: float = 2.0,
+        snapshot: Optional[HabitatSnapshot] = None,
+        watched_paths: Iterable[str] = WATCHED_PATHS,
+    ):
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix domain sockets are not available on this platform")
+        self.socket_path = socket_path or default_socket_path()
+        self.watch_interval = watch_interval
+        self.snapshot = snapshot if snapshot is not None else default_snapshot()
+        self.watched_paths = tuple(watched_paths)
+        self._signature = _stat_signature(self.watched_paths)
+        self._next_check = time.monotonic() + watch_interval
+        self._server: Optional[_Server] = None
+
+    # --- request handling ---
+
+    def respond(self, line: str) -> str:
+        """Answer one protocol line."""
+        verb, _, rest = line.partition(" ")
+        args = rest.split()
+        if verb == "PING":
+            return f"OK pyhabitat {__version__}"
+        if verb == "GET":
+            if len(args) < 2:
+                return "ERR usage: GET <digest> <name> ..."
+            digest, names = args[0], args[1:]
+            unknown = [name for name in names if name not in HOST_FACTS]
+            if unknown:
+                return f"ERR not host facts: {' '.join(unknown)}"
+            if digest != env_digest(names):
+                return "STALE"
+            try:
+                values = {name: self.snapshot.fact(name) for name in names}
+            except Exception as e:
+                return f"ERR {type(e).__name__}: {e}"
+            return "OK " + json.dumps(values)
+        if verb == "INVALIDATE":
+            self.snapshot.invalidate(*args)
+            return "OK"
+        if verb == "SHUTDOWN":
+            if self._server is not None:
+                # shutdown() blocks until serve_forever() returns, so it can't
+                # run on this request's thread.
+                threading.Thread(target=self._server.shutdown, daemon=True).start()
+            return "OK"
+        return f"ERR unknown request {verb!r}"
+
+    def check_watched(self) -> bool:
+        """Invalidate the snapshot if a watched path changed; True if it did."""
+        now = time.monotonic()
+        if now < self._next_check:
+            return False
+        self._next_check = now + self.watch_interval
+        signature = _stat_signature(self.watched_paths)
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        logger.info("Watched files changed; forgetting cached facts")
+        self.snapshot.invalidate()
+        return True
+
+    # --- lifecycle ---
+
+    def _claim_socket(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.socket_path))
+        if not os.path.lexists(directory):
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        problem = _socket_dir_problem(self.socket_path)
+        if problem:
+            raise OSError(f"refusing to serve from an unsafe socket directory: {problem}")
+        if os.path.exists(self.socket_path):
+            if DaemonClient(self.socket_path).ping():
+                raise OSError(f"a pyhabitat daemon is already listening on {self.socket_path}")
+            os.unlink(self.socket_path)
+
+    def serve_forever(self, warm: bool = True) -> None:
+        """Bind the socket and serve until SHUTDOWN, stop() or KeyboardInterrupt."""
+        self._claim_socket()
+        if warm:
+            prewarm(HOST_FACTS, self.snapshot)
+        old_umask = os.umask(0o177)
+        try:
+            self._server = _Server(self.socket_path, _Handler)
+        finally:
+            os.umask(old_umask)
+        self._server.facts_daemon = self
+        logger.info("pyhabitat daemon listening on %s", self.socket_path)
+        try:
+            self._server.serve_forever(poll_interval=min(self.watch_interval, 0.5))
+        finally:
+            self._server.server_close()
+            self._server = None
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+
+
+# --- client ---
+
+class DaemonClient:
+    """Thin client for a running FactsDaemon. Every method fails soft."""
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = 0.25):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+
+    def _request(self, line: str) -> Optional[str]:
+        if not hasattr(socket, "AF_UNIX"):
+            return None
+        problem = _socket_dir_problem(self.socket_path)
+        if problem:
+            if os.path.lexists(self.socket_path):
+                logger.warning("Ignoring pyhabitat daemon socket in an unsafe directory: %s", problem)
+            return None
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(self.socket_path)
+                sock.sendall(line.encode("utf-8") + b"\n")
+                reply = b""
+                while not reply.endswith(b"\n"):
+                    chunk = sock.recv(65536)
+                    if not chunk:
+                        break
+                    reply += chunk
+        except OSError:
+            return None
+        return reply.decode("utf-8", "replace").strip()
+
+    def ping(self) -> bool:
+        reply = self._request("PING")
+        return reply is not None and reply.startswith("OK")
+
+    def get(self, names: Iterable[str]) -> Optional[dict[str, Any]]:
+        """
+        Host facts from the daemon, or None if it is unreachable, any name is
+        not a host fact, or the daemon's environment differs from ours.
+        """
+        names = list(names)
+        if not names or any(name not in HOST_FACTS for name in names):
+            return None
+        reply = self._request(f"GET {env_digest(names)} {' '.join(names)}")
+        if reply is None or not reply.startswith("OK "):
+            if reply and reply.startswith("ERR"):
+                logger.debug("pyhabitat daemon: %s", reply)
+            return None
+        try:
+            return json.loads(reply[3:])
+        except ValueError:
+            return None
+
+    def invalidate(self, *names: str) -> bool:
+        return self._request(" ".join(("INVALIDATE",) + names)) == "OK"
+
+    def shutdown(self) -> bool:
+        return self._request("SHUTDOWN") == "OK"
+
+
+def facts(names: Iterable[str], socket_path: Optional[str] = None) -> dict[str, Any]:
+    """
+    Values of zero-argument facts: host facts from the daemon when it can
+    answer for this environment, everything else (and everything, when no
+    daemon is running) from the local snapshot.
+    """
+    names = list(dict.fromkeys(names))
+    shared = [name for name in names if name in HOST_FACTS]
+    values = (DaemonClient(socket_path).get(shared) if shared else None) or {}
+    snapshot = default_snapshot()
+    for name in names:
+        if name not in values:
+            values[name] = snapshot.fact(name)
+    return {name: values[name] for name in names}
+
+
+def run_daemon(
+    socket_path: Optional[str] = None,
+    watch_interval: float = 2.0,
+    status: bool = False,
+    stop: bool = False,
+) -> int:
+    """`pyhabitat daemon`: serve in the foreground, or --status / --stop a running daemon."""
+    client = DaemonClient(socket_path)
+    if status:
+        alive = client.ping()
+        print(f"pyhabitat daemon {'running' if alive else 'not running'} on {client.socket_path}")
+        return 0 if alive else 1
+    if stop:
+        return 0 if client.shutdown() else 1
+
+    try:
+        FactsDaemon(socket_path, watch_interval=watch_interval).serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"pyhabitat daemon: {e}", file=sys.stderr)
+        return 1
+    return 0
@@ -3,15 +3,6 @@ from __future__ import annotations # Delays annotation evaluation, allowing mode
 import platform
 import sys
 import os
-import logging
-
-# On Windows, we need the msvcrt module for non-blocking I/O
-try:
-    import msvcrt
-except ImportError:
-    msvcrt = None
-
-logger = logging.getLogger(__name__)
 
 __all__ = [
     'on_termux',
@@ -24,6 +15,7 @@ __all__ = [
     'on_wsl',
     'on_macos',
     'on_ish_alpine',
+    'in_container',
     'as_pyinstaller',
     'as_frozen',
     'is_msix',
@@ -223,6 +215,33 @@ def on_ish_alpine() -> bool:
     
     return False
 
+_CONTAINER_CGROUP_MARKERS = ("docker", "kubepods", "containerd", "libpod", "lxc")
+
+def in_container() -> bool:
+    """
+    Detect if running inside a Linux container (Docker, Podman, Kubernetes, LXC, systemd-nspawn).
+    Checks the runtime marker files, $container, and the cgroups of PID 1.
+    """
+    if platform.system() != 'Linux':
+        return False
+
+    # Docker creates /.dockerenv; Podman creates /run/.containerenv.
+    if os.path.exists('/.dockerenv') or os.path.exists('/run/.containerenv'):
+        return True
+
+    # systemd-nspawn, Podman and LXC set $container for processes in the container.
+    if os.environ.get('container'):
+        return True
+
+    # Under cgroup v1 the runtime shows up in PID 1's cgroup paths.
+    # (Under cgroup v2 this is usually just "0::/", hence the checks above.)
+    try:
+        with open('/proc/1/cgroup', encoding='utf-8', errors='replace') as f:
+            cgroups = f.read()
+    except OSError:
+        return False
+    return any(marker in cgroups for marker in _CONTAINER_CGROUP_MARKERS)
+
 def in_repl() -> bool:
     """
     Detects if the code is running in the Python interactive REPL (e.g., when 'python' is typed in a console).
@@ -331,6 +350,7 @@ def interp_path(debug: bool = False) -> str:
     """
     path = sys.executable
     if debug:
+        import logging
         logging.debug(f"Python interpreter path: {path}")
     return path
 
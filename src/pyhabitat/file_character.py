@@ -1,24 +1,12 @@
 # src/pyhabitat/environment.py
 from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
-import platform
 import sys
 import os
-import webbrowser
-import shutil
 from pathlib import Path
-import subprocess
-import io
-import zipfile
+import threading
 import logging
 from typing import Optional
 
-
-# On Windows, we need the msvcrt module for non-blocking I/O
-try:
-    import msvcrt
-except ImportError:
-    msvcrt = None
-
 __all__ = [
     'is_elf',
     'is_pyz',
@@ -29,10 +17,22 @@ __all__ = [
     'is_in_git_repo',
     'read_magic_bytes',
     'check_executable_path',
+    'fingerprint',
+    'classify_executable',
 ]
 
 
 # --- Binary Characteristic Checks ---
+ELF_MAGIC = b'\x7fELF'
+PE_MAGIC = b'MZ'
+# Common Mach-O magic numbers (including their reversed-byte counterparts)
+MACHO_MAGIC = {
+    b'\xfe\xed\xfa\xce',  # MH_MAGIC
+    b'\xce\xfa\xed\xfe',  # MH_CIGAM (byte-swapped)
+    b'\xfe\xed\xfa\xcf',  # MH_MAGIC_64
+    b'\xcf\xfa\xed\xfe',  # MH_CIGAM_64 (byte-swapped)
+}
+
 def is_elf(exec_path: Path | str | None = None, debug: bool = False, suppress_debug: bool =False) -> bool:
     """Checks if the currently running executable (sys.argv[0]) is a standalone PyInstaller-built ELF binary."""
     # If it's a pipx installation, it is not the monolithic binary we are concerned with here.
@@ -46,7 +46,7 @@ def is_elf(exec_path: Path | str | None = None, debug: bool = False, suppress_de
         magic_bytes = read_magic_bytes(exec_path, 4, debug and not suppress_debug)
         if magic_bytes is None:
             return False
-        return magic_bytes == b'\x7fELF'
+        return magic_bytes == ELF_MAGIC
     except (OSError, IOError) as e:
         if debug:
             logging.debug("False (Exception during file check)")
@@ -86,7 +86,7 @@ def is_windows_portable_executable(exec_path: Path | str | None = None, debug: b
         magic_bytes = read_magic_bytes(exec_path, 2, debug and not suppress_debug)
         if magic_bytes is  None:
             return False
-        result = magic_bytes.startswith(b"MZ")
+        result = magic_bytes.startswith(PE_MAGIC)
         return result
     except (OSError, IOError) as e:
         if debug:
@@ -110,14 +110,6 @@ def is_macos_executable(exec_path: Path | str | None = None, debug: bool = False
         magic_bytes = read_magic_bytes(exec_path, 4, debug and not suppress_debug)
         if magic_bytes is None:
             return False
-        # Common Mach-O magic numbers (including their reversed-byte counterparts)
-        MACHO_MAGIC = {
-            b'\xfe\xed\xfa\xce',  # MH_MAGIC
-            b'\xce\xfa\xed\xfe',  # MH_CIGAM (byte-swapped)
-            b'\xfe\xed\xfa\xcf',  # MH_MAGIC_64
-            b'\xcf\xfa\xed\xfe',  # MH_CIGAM_64 (byte-swapped)
-        }
-        
         is_macho = magic_bytes in MACHO_MAGIC
         
             
@@ -198,6 +190,43 @@ def is_python_script(path: Path | str | None = None, debug: bool = False, suppre
         return False
     return exec_path.suffix.lower() == '.py'    
 
+def classify_executable(exec_path: Path | str | None = None, debug: bool = False) -> dict[str, bool]:
+    """
+    Run all of the binary characteristic checks above on one path, resolving
+    it once and reading its header once.
+
+    Returns a dict keyed by check name (is_elf, is_windows_portable_executable,
+    is_macos_executable, is_pyz, is_pipx, is_python_script) with the same
+    values the individual functions return.
+    """
+    result = dict.fromkeys(CLASSIFY_CHECKS, False)
+    exec_path, is_file = check_executable_path(exec_path, debug, check_pipx=False)
+    if not is_file:
+        return result
+
+    result["is_python_script"] = exec_path.suffix.lower() == '.py'
+    result["is_pipx"] = bool(is_pipx(exec_path, debug))
+    if result["is_pipx"]:
+        # The remaining checks all treat pipx-managed paths as invalid.
+        return result
+
+    magic_bytes = read_magic_bytes(exec_path, 4, debug)
+    if magic_bytes:
+        result["is_elf"] = magic_bytes == ELF_MAGIC
+        result["is_windows_portable_executable"] = magic_bytes.startswith(PE_MAGIC)
+        result["is_macos_executable"] = magic_bytes in MACHO_MAGIC
+    result["is_pyz"] = str(exec_path).endswith(".pyz") and _check_if_zip(exec_path)
+    return result
+
+CLASSIFY_CHECKS = (
+    "is_elf",
+    "is_windows_portable_executable",
+    "is_macos_executable",
+    "is_pyz",
+    "is_pipx",
+    "is_python_script",
+)
+
 # --- File encoding check ---
 def is_binary(path:str|Path|None=None)->bool:
     """
@@ -262,6 +291,7 @@ def _check_if_zip(path: Path | str | None) -> bool:
     path = Path(path).resolve()
 
     try:
+        import zipfile
         return zipfile.is_zipfile(path)
     except Exception:
         # Handle cases where the path might be invalid, or other unexpected errors
@@ -323,6 +353,8 @@ def is_in_git_repo(path: str = '.') -> Optional[bool]:
     The exisiting use case is to check if the source code is running from within developer environment for a typical Python project.
     
     """
+    import subprocess
+
     abs_path = os.path.abspath(path)
     try:
         result = subprocess.run(
@@ -342,4 +374,79 @@ def is_in_git_repo(path: str = '.') -> Optional[bool]:
         
     except (FileNotFoundError, PermissionError):
         # The tool is missing or blocked. We don't know the answer.
-        return None
\ No newline at end of file
+        return None
+
+# --- Content fingerprints ---
+
+# Large blocks keep hashlib in C for as long as possible per call.
+_FINGERPRINT_BLOCK_SIZE = 8 * 1024 * 1024
+
+# (st_dev, st_ino, st_size, st_mtime_ns, algo) -> hex digest, oldest first
+_fingerprint_cache: dict[tuple, str] = {}
+_FINGERPRINT_CACHE_MAX = 4096
+_fingerprint_lock = threading.Lock()
+
+def clear_fingerprint_cache() -> None:
+    """Forget every cached fingerprint() result."""
+    with _fingerprint_lock:
+        _fingerprint_cache.clear()
+
+def _stat_key(st: os.stat_result, algo: str) -> tuple:
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, algo)
+
+def fingerprint(path: Path | str, algo: str = 'blake2b') -> str:
+    """
+    Return the hex digest of a file's contents, hashed via mmap in large blocks.
+
+    Results are cached by (st_dev, st_ino, size, mtime_ns), so repeat checks of an
+    unchanged file (e.g. confirming a PyInstaller binary or .pyz matches a release)
+    cost one stat() instead of a full read.
+
+    Raises:
+        ValueError: If `algo` is not a fixed-length hashlib algorithm.
+        OSError: If the file cannot be read.
+    """
+    import hashlib
+    import mmap
+
+    path = Path(path)
+    algo = algo.lower()
+    if algo.startswith('shake_'):
+        raise ValueError(f"Variable-length digest {algo!r} is not supported for fingerprint().")
+    hasher = hashlib.new(algo) # ValueError for unknown algorithms
+
+    with open(path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        key = _stat_key(st, algo)
+        with _fingerprint_lock:
+            cached = _fingerprint_cache.get(key)
+        if cached is not None:
+            return cached
+
+        if st.st_size == 0:
+            pass # mmap cannot map an empty file; the empty digest is correct
+        else:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        for offset in range(0, len(view), _FINGERPRINT_BLOCK_SIZE):
+                            hasher.update(view[offset:offset + _FINGERPRINT_BLOCK_SIZE])
+                    finally:
+                        view.release()
+            except (ValueError, OSError):
+                # Not mappable (pipes, some network or virtual filesystems): stream it instead.
+                hasher = hashlib.new(algo)
+                f.seek(0)
+                for block in iter(lambda: f.read(_FINGERPRINT_BLOCK_SIZE), b''):
+                    hasher.update(block)
+
+        digest = hasher.hexdigest()
+
+        # Only remember the digest if the file did not change while it was being read.
+        if _stat_key(os.fstat(f.fileno()), algo) == key:
+            with _fingerprint_lock:
+                if len(_fingerprint_cache) >= _FINGERPRINT_CACHE_MAX:
+                    _fingerprint_cache.pop(next(iter(_fingerprint_cache)))
+                _fingerprint_cache[key] = digest
+    return digest
@@ -1,12 +1,10 @@
 # src/pyhabitat/gui_elements.py
 from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
 import os
-import io
-import webbrowser
 import shutil
 
-# Backport functools.cache for Python < 3.9
-from ._compat import cache
+# Cache that lets concurrent first calls share one probe
+from ._compat import single_flight
 from .environment import on_termux, on_linux
 
 # On Windows, we need the msvcrt module for non-blocking I/O
@@ -23,12 +21,12 @@ __all__ = [
 ]
 
 def clear_mpl_cache()->None:
-    """Clear every @cache used in pyhabitat, and call from CLI using --clear-cache"""
+    """Clear the cached GUI checks, and call from CLI using --clear-cache"""
     matplotlib_is_available_for_gui_plotting.cache_clear()
     matplotlib_is_available_for_headless_image_export.cache_clear()
 
 # --- GUI CHECKS ---
-@cache # alt to globals
+@single_flight # alt to globals
 def matplotlib_is_available_for_gui_plotting(termux_has_gui=False):
     """Check if Matplotlib is available AND can use a GUI backend for a popup window."""
     # 1. Termux exclusion check (assume no X11/GUI)
@@ -74,7 +72,7 @@ def matplotlib_is_available_for_gui_plotting(termux_has_gui=False):
         # Catches Matplotlib ImportError or any runtime error from the plt.figure() call
         return False
     
-@cache
+@single_flight
 def matplotlib_is_available_for_headless_image_export():
     """Check if Matplotlib is available AND can use the Agg backend for image export."""
     try:
@@ -88,6 +86,7 @@ def matplotlib_is_available_for_headless_image_export():
         # A simple test to ensure a figure can be generated
         fig = plt.figure()
         # Ensure it can save to an in-memory buffer (to avoid disk access issues)
+        import io
         fig.savefig(io.BytesIO(), format='png')
         plt.close(fig)
         return True
@@ -102,6 +101,9 @@ def matplotlib_is_available_for_headless_image_export():
         except:
             pass
 
+# Not cached: a long-running process may gain a display later. Overlapping
+# calls still share one Tk probe.
+@single_flight(store=False)
 def tkinter_is_available() -> bool:
     """Check if tkinter is available and can successfully connect to a display."""
 
@@ -127,6 +129,8 @@ def tkinter_is_available() -> bool:
 # --- Browser Check ---
 def web_browser_is_available() -> bool:
     """ Check if a web browser can be launched in the current environment."""
+    import webbrowser
+
     try:
         # 1. Standard Python check
         webbrowser.get()
@@ -2,28 +2,33 @@
 from __future__ import annotations
 import os
 import sys
+import logging
 import subprocess
 from pathlib import Path
 import shutil
-from typing import Optional
-
-# On Windows, we need the msvcrt module for non-blocking I/O
-try:
-    import msvcrt
-except ImportError:
-    msvcrt = None
+import tempfile
+import time
+from typing import Iterable, Iterator, NamedTuple, Optional
 
 from .console import interactive_terminal_is_available
 from .environment import (
     in_repl, on_windows, is_msix, on_termux, on_ish_alpine, on_linux, on_macos, on_wsl, on_chromeos_crostini
 )
+from .launchers import launcher_for
+from .supervisor import LaunchHandle, spawn, spawn_async
 from .web import browse_directory
+from .wslpath import default_translator
+
+logger = logging.getLogger(__name__)
 
 __all__ = [
     'edit_textfile',
     'show_system_explorer',
     'launch_file',
+    'launch_files',
     'open_with_thunar',
+    'launch_file_async',
+    'edit_textfile_async',
 ]
 
 # --- LAUNCH MECHANISMS BASED ON ENVIRONMENT ---
@@ -58,193 +63,200 @@ def edit_textfile(path: Path | str | None = None, background: Optional[bool] = N
     else:
         is_async = background
 
-    # Choose runner: Popen for fire-and-forget, run for blocking
-    launcher = subprocess.Popen if is_async else subprocess.run
-
+    # --- 2. Try each editor the platform offers until one starts ---
     try:
+        if not on_windows():
+            _normalize_line_endings(path)
+        for step in _editor_steps(path, background=is_async):
+            try:
+                if _start_editor(step, is_async):
+                    return
+            except OSError as e:
+                print(f"{_step_name(step)} failed in pyhabitat.edit_textfile(): {e}")
+        print(f"\n[Error] No suitable editor (GUI or Terminal) found. File saved at: {path}")
+    except Exception as e:
+        print(f"The file could not be opened: {e}")
 
-        # --- Windows --- 
-        if on_windows():
 
-            # Force resolve to handle MSIX VFS redirection
-            # Force resolve AND normalize slashes for the Windows API
-            abs_path = os.path.normpath(str(Path(path).resolve()))
-            #success = False
+# --- Editor selection, shared by edit_textfile() and edit_textfile_async() ---
 
-            # 0: Special case: MSIX files (Sandboxed, os.startfile() known to fail
-            if is_msix(): # 
+_GUI_EDITORS = ['gedit', 'mousepad', 'kate', 'xed', 'code']
 
-                try:
-                    # Use the explicit path to System32 notepad to bypass environment issues
-                    system_notepad = os.path.join(os.environ.get('SystemRoot', 'C:\\Windows'), 'System32', 'notepad.exe')
-                    subprocess.Popen([system_notepad, abs_path])
-                    return
-                except Exception as e:
-                    print(f"Notepad launch failed via MSIX package: {e}")
 
-            # 1. Primary: System Default (Natively non-blocking/async)
-            try:
-                # os.startfile is natively non-blocking (async)
-                os.startfile(abs_path)
-                #success = True
-                return
-            except Exception as e:
-                # This catches the "No program associated" or "Access denied" errors
-                print(f"os.startfile() failed in pyhabitat.edit_textfile(): {e}")
+class _EditorStep(NamedTuple):
+    """
+    One way to open a file for editing. kind says how to start it:
 
-            # 2. Secondary: Force Notepad (Guaranteed fallback)
-            # Use Popen to ENSURE it never blocks the caller, regardless of REPL status.
-            try:
-                subprocess.Popen(['notepad.exe', abs_path])
-                #success = True
-                return
-            except Exception as e: 
-                print(f"notepad.exe failed in pyhabitat.edit_textfile(): {e}")
+    gui        a windowed editor; waited for only when editing in the foreground
+    detached   a windowed editor that is never waited for (Windows notepad)
+    terminal   an editor that needs this process's terminal; always waited for
+    probe      an opener whose nonzero exit means "no handler", so try the next step
+    startfile  os.startfile(command[0]) on Windows
+    """
+    command: list[str]
+    kind: str
+    install: Optional[list[str]] = None  # install command to run if command is missing
 
-            print(f"\n[Error] Windows could not open the file: {abs_path}")
 
-        # --- Termux (Android) ---
-        elif on_termux():
-            try:
-                # Try to run directly assuming tools exist
-                _run_dos2unix(path)
-                subprocess.run(['nano', str(path)])
-            except FileNotFoundError:
-                # Fallback: Install missing tools
-                # Using -y ensures the package manager doesn't hang waiting for a 'Yes'
-                subprocess.run(['pkg', 'install', '-y', 'dos2unix', 'nano'], 
-                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                _run_dos2unix(path)
-                subprocess.run(['nano', str(path)])
-            
-        # --- iSH (iOS Alpine) ---
-        elif on_ish_alpine():
-            try:
-                _run_dos2unix(path)
-                subprocess.run(['nano', str(path)])
-            except FileNotFoundError:
-                # Alpine uses 'apk add'
-                subprocess.run(['apk', 'add', 'dos2unix', 'nano'], 
-                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                _run_dos2unix(path)
-                subprocess.run(['nano', str(path)])
-
-        elif on_wsl():
-            _run_dos2unix(path)
-            success = False
-            gui_editors = ['gedit', 'mousepad', 'kate', 'xed', 'code']
-            for editor in gui_editors:
-                if shutil.which(editor):
-                    # launcher will be Popen if we are in a GUI, or run if in a TTY
-                    launcher([editor, str(path)])
-                    success = True
-                    break
-            
-            if not success:
-                # 3. Final Fallback: Terminal Editor
-                # This MUST be blocking (subprocess.run) to work in a TTY/REPL context.
-                # We don't spawn a new window to avoid environmental/SSH crashes.
-                if shutil.which('nano'):
-                    # If we are in a GUI, the user might need to look at the terminal they launched from
-                    if is_async: 
-                        print(f"\n[Note] No GUI editor found. Opening {path.name} in nano within the terminal.")
-                    
-                    subprocess.run(['nano', str(path)])
-                    success = True
-                else:
-                    # Absolute last resort
-                    print(f"\n[Error] No suitable editor (GUI or Terminal) found. File saved at: {path}")
-
-        # --- Standard Desktop Linux ---
-        elif on_linux():
-            _run_dos2unix(path)
-            success = False
-            
-            # 1. Try System Default (xdg-open)
-            # We use subprocess.run here to check if the OS actually knows how to handle the file.
-            try:
-                # capture_output=True keeps the 'no mailcap rules' error out of the user's console
-                subprocess.run(['xdg-open', str(path)], check=True, capture_output=True)
-                # xdg open is non ideal for editing if it shows the web viewer, which happens to me in wsl; can i first access for which program will be used by WSL? maybe cache it and then alter it for repeat runs.
-                success = True
-            except subprocess.CalledProcessError:
-                pass
-            except FileNotFoundError:
-                pass
-                    # If xdg-open fails, we move to manual fallbacks
-            if not success:
-                # 2. Fallback Ladder: Common GUI Editors
-                # These are safe to background (using the 'launcher' Popen/run logic)
-                # Prioritize standalone editors over IDEs
-                gui_editors = ['gedit', 'mousepad', 'kate', 'xed', 'code']
-                for editor in gui_editors:
-                    if shutil.which(editor):
-                        # launcher will be Popen if we are in a GUI, or run if in a TTY
-                        launcher([editor, str(path)])
-                        success = True
-                        break
-            
-            if not success:
-                # 3. Final Fallback: Terminal Editor
-                # This MUST be blocking (subprocess.run) to work in a TTY/REPL context.
-                # We don't spawn a new window to avoid environmental/SSH crashes.
-                if shutil.which('nano'):
-                    # If we are in a GUI, the user might need to look at the terminal they launched from
-                    if is_async: 
-                        print(f"\n[Note] No GUI editor found. Opening {path.name} in nano within the terminal.")
-                    
-                    subprocess.run(['nano', str(path)])
-                    success = True
-                else:
-                    # Absolute last resort
-                    print(f"\n[Error] No suitable editor (GUI or Terminal) found. File saved at: {path}")
-                
-        # --- macOS ---
-        elif on_macos():
-            _run_dos2unix(path)
-            # 'open' on Mac usually returns immediately for GUI apps anyway, 
-            # but using our launcher keeps the Popen logic consistent.
-            try:
-                launcher(['open', str(path)])
-            except Exception:
-                # Terminal fallback for Mac if 'open' fails (very rare)
-                if shutil.which('nano'):
-                    subprocess.run(['nano', str(path)])
-        else:
-            print("Unsupported operating system.")
-            
-    except Exception as e:
-        print(f"The file could not be opened: {e}")
+def _editor_steps(path: Path, background: bool) -> Iterator[_EditorStep]:
+    """Ways to edit path on this platform, best first. Lazy: later steps are only probed if needed."""
+    # --- Windows --- 
+    if on_windows():
+        # Force resolve AND normalize slashes for the Windows API
+        abs_path = os.path.normpath(str(path))
+        # Special case: MSIX files (Sandboxed, os.startfile() known to fail).
+        # Use the explicit path to System32 notepad to bypass environment issues.
+        if is_msix():
+            system_notepad = os.path.join(os.environ.get('SystemRoot', 'C:\\Windows'), 'System32', 'notepad.exe')
+            yield _EditorStep([system_notepad, abs_path], "detached")
+        # System default (natively non-blocking), then force Notepad.
+        yield _EditorStep([abs_path], "startfile")
+        yield _EditorStep(['notepad.exe', abs_path], "detached")
+        return
+
+    # --- Termux (Android) and iSH (iOS Alpine): nano, installed on demand ---
+    # Using -y ensures the package manager doesn't hang waiting for a 'Yes'
+    if on_termux():
+        yield _EditorStep(['nano', str(path)], "terminal", install=['pkg', 'install', '-y', 'nano'])
+        return
+    if on_ish_alpine():
+        yield _EditorStep(['nano', str(path)], "terminal", install=['apk', 'add', 'nano'])
+        return
+
+    # --- macOS ---
+    if on_macos():
+        # 'open' on Mac usually returns immediately for GUI apps anyway.
+        yield _EditorStep(['open', str(path)], "gui")
+    elif on_linux():
+        # --- Standard Desktop Linux (WSL goes straight to the editor ladder) ---
+        if not on_wsl():
+            # System default, resolved once per MIME type and cached (see launchers.py),
+            # so repeat runs exec the handler directly instead of probing with xdg-open.
+            handler = launcher_for(path, default_mime='text/plain')
+            if handler is None:
+                # Nothing resolved: let xdg-open try.
+                yield _EditorStep(['xdg-open', str(path)], "probe")
+            elif not (handler.terminal and background):
+                # Terminal handlers (vim.desktop) need the TTY, so they always block.
+                yield _EditorStep(handler.command([path]), "terminal" if handler.terminal else "gui")
+        # Fallback ladder: common GUI editors, standalone editors before IDEs
+        for editor in _GUI_EDITORS:
+            if shutil.which(editor):
+                yield _EditorStep([editor, str(path)], "gui")
+    else:
+        raise OSError("Unsupported operating system.")
+
+    # Final fallback: terminal editor in the terminal we were started from.
+    # We don't spawn a new window to avoid environmental/SSH crashes.
+    if shutil.which('nano'):
+        yield _EditorStep(['nano', str(path)], "terminal")
+
+
+def _step_name(step: _EditorStep) -> str:
+    return "os.startfile()" if step.kind == "startfile" else step.command[0]
+
+
+def _start_editor(step: _EditorStep, background: bool) -> bool:
+    """Start one step for edit_textfile(); True if an editor was opened."""
+    if step.kind == "startfile":
+        os.startfile(step.command[0])
+        return True
+    if step.kind == "probe":
+        # capture_output=True keeps the 'no mailcap rules' error out of the user's console
+        try:
+            subprocess.run(step.command, check=True, capture_output=True)
+        except subprocess.CalledProcessError:
+            return False
+        return True
+    if step.kind == "terminal":
+        if background:
+            # The user might need to look at the terminal they launched from
+            print(f"\n[Note] Opening {Path(step.command[-1]).name} in {step.command[0]} within the terminal.")
+        try:
+            subprocess.run(step.command)
+        except FileNotFoundError:
+            if not step.install:
+                raise
+            subprocess.run(step.install, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            subprocess.run(step.command)
+        return True
+    # Supervised Popen for fire-and-forget, run for blocking
+    launcher = spawn if background or step.kind == "detached" else subprocess.run
+    launcher(step.command)
+    return True
 
 # --- Helper Functions ---    
-def _run_dos2unix(path: Path | str | None = None):
-    """Attempt to run dos2unix, failing silently if not installed."""
-    
-    path = Path(path).resolve()
+_NEWLINE_CHUNK = 1 << 20
 
+def _normalize_line_endings(path: Path | str, chunk_size: int = _NEWLINE_CHUNK) -> bool:
+    """
+    Convert CRLF line endings to LF in place, like dos2unix, without a subprocess.
+
+    Files whose first block has no CR are left alone after a single read, as
+    are files that look binary (NUL in the first block). Otherwise the file
+    is streamed in fixed-size chunks to a temp file in the same directory,
+    which then atomically replaces the original; memory use is constant.
+    Lone CRs are kept. Returns True if the file was rewritten; fails
+    silently (False) on I/O errors, as the editor should still open.
+    """
+    path = Path(path).resolve()
+    tmp = None
     try:
-        # We rely on shutil.which not being needed, as this is a robust built-in utility on most targets
-        # The command won't raise an exception unless the process itself fails, not just if the utility isn't found.
-        # We also don't use check=True here to allow silent failure if the utility is missing (e.g., minimalist Linux).
-        subprocess.run(['dos2unix', str(path)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    except FileNotFoundError:
-        # This will be raised if 'dos2unix' is not on the system PATH
-        pass 
-    except Exception:
-        # Catch other subprocess errors (e.g. permission issues)
-        pass
+        with open(path, 'rb') as src:
+            block = src.read(chunk_size)
+            if b'\r' not in block or b'\0' in block:
+                return False
+
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+            changed = False
+            with os.fdopen(fd, 'wb') as dst:
+                carry = b''
+                while block:
+                    block = carry + block
+                    # Hold back a trailing CR: its LF may start the next chunk.
+                    if block.endswith(b'\r'):
+                        block, carry = block[:-1], b'\r'
+                    else:
+                        carry = b''
+                    converted = block.replace(b'\r\n', b'\n')
+                    changed = changed or len(converted) != len(block)
+                    dst.write(converted)
+                    block = src.read(chunk_size)
+                dst.write(carry)
+
+        if not changed:
+            os.unlink(tmp)
+            return False
+        shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+        return True
+    except OSError:
+        if tmp is not None and os.path.exists(tmp):
+            os.unlink(tmp)
+        return False
 
 def send_file_path_to_windows_explorer_on_wsl(path: str | Path)->None:
     """
     # Locate explorer.exe (Defaulting to /mnt/c/Windows/explorer.exe)
     # This handles cases where System32 is missing from the Linux $PATH.
     """
+    spawn(_wsl_explorer_command(path), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def _wsl_explorer_command(path: str | Path) -> list[str]:
+    """[explorer.exe, <windows path>] for a Linux path inside WSL."""
     path = str(Path(path).expanduser().resolve())
     try:
-        win_path = subprocess.check_output(["wslpath", "-w", path]).decode().strip()
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        # Fallback if wslpath fails: just use the path as-is (though likely to fail explorer)
-        win_path = path
+        # In-process translation from the cached mount table; no fork per path.
+        win_path = default_translator().to_windows(path)
+    except ValueError:
+        try:
+            win_path = subprocess.check_output(["wslpath", "-w", path]).decode().strip()
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            # Fallback if wslpath fails: just use the path as-is (though likely to fail explorer)
+            win_path = path
+    return [_wsl_explorer_exe(), win_path]
+
+def _wsl_explorer_exe() -> str:
     explorer_cmd = "explorer.exe"
     if shutil.which("explorer.exe") is None:
         # Manual path injection for stripped environments
@@ -252,7 +264,7 @@ def send_file_path_to_windows_explorer_on_wsl(path: str | Path)->None:
         possible_explorer = Path("/mnt/c/Windows/explorer.exe")
         if possible_explorer.exists():
             explorer_cmd = str(possible_explorer)
-    subprocess.Popen([explorer_cmd, win_path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return explorer_cmd
 
 def show_system_explorer(path: str | Path = None) -> None: 
     """
@@ -295,7 +307,7 @@ def show_system_explorer(path: str | Path = None) -> None:
             os.startfile(path)
         elif sys.platform == "darwin":
             # macOS
-            subprocess.Popen(["open", path])
+            spawn(["open", path])
 
         #  Android (Termux)
         elif on_termux():
@@ -314,7 +326,7 @@ def show_system_explorer(path: str | Path = None) -> None:
         else:
             # Linux/Other: pyhabitat or xdg-open fallback
             # Using xdg-open is the standard for Nautilus, Dolphin, Thunar, etc.
-            subprocess.Popen(["xdg-open", path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            spawn(["xdg-open", path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     except Exception as e:
         print(f"Could not open system explorer. Path: {path}. Error: {e}")
 
@@ -337,7 +349,7 @@ def open_with_thunar(path: str | Path):
             return
 
     # Open the directory
-    subprocess.Popen(["thunar", path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    spawn(["thunar", path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
 # -----
 
@@ -364,19 +376,259 @@ def launch_file(path: Path | str) -> None:
 
     # 3. macOS Experience
     if on_macos() or sys.platform == "darwin":
-        subprocess.Popen(["open", str(path)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        spawn(["open", str(path)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         return
 
     # 4. Android (Termux)
     if on_termux():
         # Fallback to xdg-open if termux-open isn't in path for some reason
         cmd = "termux-open" if shutil.which("termux-open") else "xdg-open"
-        subprocess.Popen([cmd, str(path)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        spawn([cmd, str(path)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         return
 
     # 5. Standard Linux Desktop Fallback
     if on_linux():
         try:
-            subprocess.Popen(["xdg-open", str(path)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            handler = launcher_for(path)
+            if handler is not None and not handler.terminal:
+                spawn(handler.command([path]), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                return
+        except OSError:
+            pass
+        try:
+            spawn(["xdg-open", str(path)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         except Exception:
             print(f"[Error] No default application handler found for: {path.name}")
+
+def _default_opener(path: Path) -> Optional[list[str]]:
+    """The 'open with default app' command launch_file() uses on macOS, Termux and Linux."""
+    if on_macos() or sys.platform == "darwin":
+        return ["open", str(path)]
+    if on_termux():
+        cmd = "termux-open" if shutil.which("termux-open") else "xdg-open"
+        return [cmd, str(path)]
+    if on_linux():
+        return ["xdg-open", str(path)]
+    return None
+
+# --- BATCHED LAUNCH ---
+
+_ARG_MAX_FALLBACK = 128 * 1024
+
+def _arg_budget() -> int:
+    """Bytes available for argv on one exec: ARG_MAX less the environment and a margin."""
+    try:
+        arg_max = os.sysconf("SC_ARG_MAX")
+    except (AttributeError, ValueError, OSError):
+        arg_max = _ARG_MAX_FALLBACK
+    if arg_max <= 0:
+        arg_max = _ARG_MAX_FALLBACK
+    env_size = sum(len(k) + len(v) + 2 + 8 for k, v in os.environ.items())
+    return max(arg_max - env_size - 4096, 4096)
+
+def _chunk_args(paths: list[str], fixed: list[str], budget: int) -> list[list[str]]:
+    """Split paths into groups whose argv (fixed args + group) fits in budget bytes."""
+    # Each argument costs its bytes, the NUL terminator and an argv pointer.
+    def cost(arg: str) -> int:
+        return len(os.fsencode(arg)) + 1 + 8
+    base = sum(cost(a) for a in fixed)
+    chunks, current, used = [], [], base
+    for p in paths:
+        c = cost(p)
+        if current and used + c > budget:
+            chunks.append(current)
+            current, used = [], base
+        current.append(p)
+        used += c
+    if current:
+        chunks.append(current)
+    return chunks
+
+class _SpawnPacer:
+    """Allow `burst` launches at once, then at most `rate` per second."""
+
+    def __init__(self, rate: Optional[float], burst: int = 4):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.tokens = float(burst)
+        self.burst = burst
+        self.last = time.monotonic()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.last) / self.interval)
+        self.last = now
+        if self.tokens < 1:
+            time.sleep((1 - self.tokens) * self.interval)
+            self.last = time.monotonic()
+            self.tokens = 1.0
+        self.tokens -= 1
+
+def _launch_plan(paths: list[Path]) -> list[list[str]]:
+    """
+    The commands launch_files() will run, one per launcher invocation.
+    Launchers that take several files get as many per call as ARG_MAX allows;
+    single-file launchers (xdg-open, explorer.exe, termux-open) get one each.
+    """
+    budget = _arg_budget()
+
+    if on_wsl():
+        # explorer.exe opens one path per call, but translation is one pass.
+        try:
+            windows_paths = default_translator().to_windows_many(str(p) for p in paths)
+        except ValueError:
+            return [_wsl_explorer_command(p) for p in paths]
+        explorer = _wsl_explorer_exe()
+        return [[explorer, w] for w in windows_paths]
+
+    if on_macos() or sys.platform == "darwin":
+        # `open` takes many files and hands each to its own application.
+        return [["open"] + chunk for chunk in _chunk_args([str(p) for p in paths], ["open"], budget)]
+
+    if on_termux():
+        return [_default_opener(p) for p in paths]
+
+    if not on_linux():
+        return []
+
+    # Linux desktop: group by resolved handler, keeping first-seen order.
+    groups: dict[str, tuple] = {}
+    plan = []
+    for p in paths:
+        handler = launcher_for(p)
+        if handler is None or handler.terminal:
+            plan.append(["xdg-open", str(p)])
+        elif not handler.accepts_multiple:
+            plan.append(handler.command([p]))
+        else:
+            groups.setdefault(handler.desktop_id, (handler, []))[1].append(str(p))
+    for handler, group in groups.values():
+        fixed = handler.command([])
+        plan.extend(handler.command(chunk) for chunk in _chunk_args(group, fixed, budget))
+    return plan
+
+def launch_files(paths: Iterable[Path | str], max_per_second: Optional[float] = 4.0) -> int:
+    """
+    Open several files with their default applications, batching them into as
+    few launcher processes as possible. Files that share a handler accepting
+    multiple files (%F/%U .desktop entries, macOS `open`) go in one call,
+    split only at the ARG_MAX limit; on WSL all paths are translated in one
+    pass instead of one wslpath per file.
+
+    After a burst of four, launches are paced to max_per_second so a large
+    batch does not flood the desktop with windows. None disables the pacing.
+
+    Returns the number of launcher invocations. Raises FileNotFoundError
+    before launching anything if a path does not exist.
+    """
+    resolved = [Path(p).expanduser().resolve() for p in paths]
+    missing = [p for p in resolved if not p.exists()]
+    if missing:
+        raise FileNotFoundError(f"Cannot launch non-existent path: {missing[0]}")
+    if not resolved:
+        return 0
+
+    pacer = _SpawnPacer(max_per_second)
+    if on_windows() and not on_wsl():
+        for p in resolved:
+            pacer.wait()
+            os.startfile(os.path.normpath(str(p)))
+        return len(resolved)
+
+    launched = 0
+    for command in _launch_plan(resolved):
+        pacer.wait()
+        try:
+            spawn(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            launched += 1
+        except OSError as e:
+            print(f"[Error] Could not launch {command[0]}: {e}")
+    return launched
+
+# --- ASYNC LAUNCH ---
+# Coroutine counterparts for callers running an event loop (FastAPI, uvicorn).
+# They never block the loop: children are started with
+# asyncio.create_subprocess_exec() and returned as LaunchHandle objects the
+# caller may await (exit code) or cancel(). Blocking helpers such as
+# os.startfile and line-ending normalization run in the default executor.
+
+async def launch_file_async(path: Path | str) -> Optional[LaunchHandle]:
+    """
+    Async launch_file(). Returns a LaunchHandle for the opener process, or
+    None when no opener is known for this platform.
+    """
+    import asyncio
+
+    path = Path(path).expanduser().resolve()
+    if not path.exists():
+        raise FileNotFoundError(f"Cannot launch non-existent path: {path}")
+
+    loop = asyncio.get_running_loop()
+    if on_wsl():
+        command = await loop.run_in_executor(None, _wsl_explorer_command, path)
+    elif on_windows():
+        target = os.path.normpath(str(path))
+        await loop.run_in_executor(None, os.startfile, target)
+        return LaunchHandle([target])
+    else:
+        command = _default_opener(path)
+        if command is None:
+            return None
+        if command[0] == "xdg-open" and not on_termux():
+            handler = await loop.run_in_executor(None, launcher_for, path)
+            if handler is not None and not handler.terminal:
+                command = handler.command([path])
+    return await spawn_async(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+async def edit_textfile_async(path: Path | str | None = None) -> Optional[LaunchHandle]:
+    """
+    Async edit_textfile(). Returns a LaunchHandle for the editor; await it to
+    wait until the editor closes. Terminal editors (nano) inherit this
+    process's terminal, as in the blocking version. Returns None if no editor
+    could be started.
+    """
+    import asyncio
+
+    if path is None:
+        return None
+    path = Path(path).resolve()
+    loop = asyncio.get_running_loop()
+
+    def plan() -> list[_EditorStep]:
+        # Handler resolution may ask xdg-mime on a cold cache, so keep it off the loop.
+        if not on_windows():
+            _normalize_line_endings(path)
+        return list(_editor_steps(path, background=False))
+
+    try:
+        for step in await loop.run_in_executor(None, plan):
+            try:
+                handle = await _start_editor_async(step, loop)
+            except OSError as e:
+                print(f"{_step_name(step)} failed in pyhabitat.edit_textfile_async(): {e}")
+                continue
+            if handle is not None:
+                return handle
+        print(f"\n[Error] No suitable editor (GUI or Terminal) found. File saved at: {path}")
+    except Exception as e:
+        print(f"The file could not be opened: {e}")
+    return None
+
+async def _start_editor_async(step: _EditorStep, loop) -> Optional[LaunchHandle]:
+    """Start one step for edit_textfile_async(); None if it found no handler."""
+    if step.kind == "startfile":
+        await loop.run_in_executor(None, os.startfile, step.command[0])
+        return LaunchHandle(step.command)
+    if step.kind == "probe":
+        # Awaiting xdg-open is what the blocking version does with check=True,
+        # without stalling the loop while it resolves a handler.
+        opener = await spawn_async(step.command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return opener if await opener == 0 else None
+    try:
+        return await spawn_async(step.command)
+    except FileNotFoundError:
+        if not step.install:
+            raise
+        await (await spawn_async(step.install, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+        return await spawn_async(step.command)
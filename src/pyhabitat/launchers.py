@@ -0,0 +1,344 @@
+"""
+pyhabitat.launchers
+
+Resolve the program that opens a given MIME type on a Linux desktop, once,
+and remember it.
+
+Resolution follows the XDG MIME applications spec: mimeapps.list files in
+the config and data directories ([Default Applications], then
+[Added Associations]), the legacy defaults.list, then each applications
+directory's mimeinfo.cache. If none of those names an installed .desktop
+entry, `xdg-mime query default` is asked. The chosen entry's Exec line is
+kept, so later launches exec the program directly instead of going through
+xdg-open.
+
+Results (including "no handler") are persisted per habitat and MIME type in
+$XDG_CACHE_HOME/pyhabitat/launchers.json. Each entry records the mtimes of
+every file it was derived from, including mimeapps.list locations that did
+not exist yet, and is discarded as soon as any of them changes.
+
+Typical usage
+-------------
+
+    from pyhabitat.launchers import launcher_for
+
+    launcher = launcher_for("notes.md", default_mime="text/plain")
+    if launcher is not None and not launcher.terminal:
+        subprocess.Popen(launcher.command(["notes.md"]))
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import mimetypes
+import os
+import shlex
+import shutil
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+from .environment import on_chromeos_crostini, on_termux, on_wsl
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'Launcher',
+    'resolve_launcher',
+    'launcher_for',
+    'clear_launcher_cache',
+]
+
+_CACHE_VERSION = 1
+# Exec field codes that expand to file arguments; the uppercase forms take several.
+_FILE_CODES = {"%f", "%u"}
+_FILES_CODES = {"%F", "%U"}
+
+
+class Launcher:
+    """An installed .desktop entry that handles a MIME type."""
+
+    __slots__ = ("desktop_id", "exec_args", "terminal")
+
+    def __init__(self, desktop_id: str, exec_args: Sequence[str], terminal: bool = False):
+        self.desktop_id = desktop_id
+        self.exec_args = list(exec_args)
+        self.terminal = terminal
+
+    @property
+    def accepts_multiple(self) -> bool:
+        """True if the Exec line takes a list of files (%F or %U)."""
+        return any(arg in _FILES_CODES for arg in self.exec_args)
+
+    def command(self, paths: Iterable[str | Path]) -> list[str]:
+        """
+        Expand the Exec line for the given files. Launchers that take a single
+        file (%f/%u) use the first path only; entries without a field code get
+        the paths appended, as xdg-open would.
+        """
+        paths = [str(p) for p in paths]
+        argv = []
+        placed = False
+        for arg in self.exec_args:
+            if arg in _FILES_CODES:
+                argv.extend(paths)
+                placed = True
+            elif arg in _FILE_CODES:
+                argv.extend(paths[:1])
+                placed = True
+            elif len(arg) == 2 and arg.startswith("%"):
+                if arg == "%%":
+                    argv.append("%")
+                # %i, %c, %k and deprecated codes expand to nothing here.
+            else:
+                argv.append(arg.replace("%%", "%"))
+        if not placed:
+            argv.extend(paths)
+        return argv
+
+    def to_dict(self) -> dict:
+        return {"desktop_id": self.desktop_id, "exec": self.exec_args, "terminal": self.terminal}
+
+    def __repr__(self) -> str:
+        return f"<Launcher {self.desktop_id} exec={self.exec_args!r}>"
+
+
+# --- XDG locations ---
+
+def _config_dirs() -> list[Path]:
+    home = os.environ.get("XDG_CONFIG_HOME") or str(Path.home() / ".config")
+    dirs = os.environ.get("XDG_CONFIG_DIRS") or "/etc/xdg"
+    return [Path(home)] + [Path(d) for d in dirs.split(":") if d]
+
+
+def _data_dirs() -> list[Path]:
+    home = os.environ.get("XDG_DATA_HOME") or str(Path.home() / ".local/share")
+    dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+    return [Path(home)] + [Path(d) for d in dirs.split(":") if d]
+
+
+def _cache_path() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "pyhabitat" / "launchers.json"
+
+
+def _mimeapps_files() -> list[Path]:
+    """mimeapps.list candidates in precedence order, existing or not."""
+    desktops = [d.lower() for d in os.environ.get("XDG_CURRENT_DESKTOP", "").split(":") if d]
+    files = []
+    for base in _config_dirs() + [d / "applications" for d in _data_dirs()]:
+        files.extend(base / f"{desktop}-mimeapps.list" for desktop in desktops)
+        files.append(base / "mimeapps.list")
+    files.extend(d / "applications" / "defaults.list" for d in _data_dirs())
+    return files
+
+
+def _mimeinfo_caches() -> list[Path]:
+    return [d / "applications" / "mimeinfo.cache" for d in _data_dirs()]
+
+
+def _habitat() -> str:
+    if on_termux():
+        kind = "termux"
+    elif on_wsl():
+        kind = "wsl"
+    elif on_chromeos_crostini():
+        kind = "crostini"
+    else:
+        kind = "linux"
+    return f"{kind}:{os.environ.get('XDG_CURRENT_DESKTOP', '')}"
+
+
+# --- parsing ---
+
+def _read_ini(path: Path) -> dict[str, dict[str, str]]:
+    """
+    Minimal freedesktop key-file reader. configparser is not used: Exec lines
+    contain '%' and files may repeat keys, where the first occurrence wins.
+    """
+    sections: dict[str, dict[str, str]] = {}
+    current = None
+    try:
+        text = path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return sections
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("[") and line.endswith("]"):
+            current = sections.setdefault(line[1:-1], {})
+        elif current is not None and "=" in line:
+            key, _, value = line.partition("=")
+            current.setdefault(key.strip(), value.strip())
+    return sections
+
+
+def _desktop_file(desktop_id: str) -> Optional[Path]:
+    for base in _data_dirs():
+        candidate = base / "applications" / desktop_id
+        if candidate.is_file():
+            return candidate
+        # Desktop file IDs map '-' to subdirectories: kde4-foo.desktop -> kde4/foo.desktop
+        if "-" in desktop_id:
+            nested = base / "applications" / desktop_id.replace("-", "/", 1)
+            if nested.is_file():
+                return nested
+    return None
+
+
+def _load_launcher(desktop_id: str) -> tuple[Optional[Launcher], Optional[Path]]:
+    path = _desktop_file(desktop_id)
+    if path is None:
+        return None, None
+    entry = _read_ini(path).get("Desktop Entry", {})
+    if entry.get("Hidden", "").lower() == "true" or "Exec" not in entry:
+        return None, path
+    try:
+        exec_args = shlex.split(entry["Exec"])
+    except ValueError:
+        return None, path
+    try_exec = entry.get("TryExec")
+    if not exec_args or (try_exec and shutil.which(try_exec) is None) or shutil.which(exec_args[0]) is None:
+        return None, path
+    return Launcher(desktop_id, exec_args, entry.get("Terminal", "").lower() == "true"), path
+
+
+def _candidates(mime_type: str) -> list[str]:
+    """Desktop IDs associated with mime_type, most preferred first."""
+    defaults: list[str] = []
+    added: list[str] = []
+    for path in _mimeapps_files():
+        sections = _read_ini(path)
+        for group, bucket in (("Default Applications", defaults), ("Added Associations", added)):
+            value = sections.get(group, {}).get(mime_type)
+            if value:
+                bucket.extend(item for item in value.split(";") if item)
+    ordered = defaults + added
+    for path in _mimeinfo_caches():
+        value = _read_ini(path).get("MIME Cache", {}).get(mime_type)
+        if value:
+            ordered.extend(item for item in value.split(";") if item)
+    seen = set()
+    return [d for d in ordered if not (d in seen or seen.add(d))]
+
+
+def _query_xdg_mime(mime_type: str) -> Optional[str]:
+    if shutil.which("xdg-mime") is None:
+        return None
+    try:
+        result = subprocess.run(
+            ["xdg-mime", "query", "default", mime_type],
+            capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    desktop_id = result.stdout.strip()
+    return desktop_id or None
+
+
+def _resolve_uncached(mime_type: str) -> tuple[Optional[Launcher], list[Path]]:
+    sources = _mimeapps_files() + _mimeinfo_caches()
+    desktop_ids = _candidates(mime_type)
+    if not desktop_ids:
+        queried = _query_xdg_mime(mime_type)
+        desktop_ids = [queried] if queried else []
+    for desktop_id in desktop_ids:
+        launcher, path = _load_launcher(desktop_id)
+        if path is not None:
+            sources.append(path)
+        if launcher is not None:
+            return launcher, sources
+    return None, sources
+
+
+# --- persistent cache ---
+
+_cache_lock = threading.Lock()
+_cache: Optional[dict] = None
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _load_cache() -> dict:
+    global _cache
+    if _cache is None:
+        try:
+            data = json.loads(_cache_path().read_text())
+            _cache = data["entries"] if data.get("version") == _CACHE_VERSION else {}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            _cache = {}
+    return _cache
+
+
+def _save_cache(entries: dict) -> None:
+    path = _cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".launchers.", suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"version": _CACHE_VERSION, "entries": entries}, f, indent=1)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.debug("Could not write launcher cache %s: %s", path, e)
+
+
+def clear_launcher_cache() -> None:
+    """Forget resolved launchers, in memory and on disk."""
+    global _cache
+    with _cache_lock:
+        _cache = {}
+        try:
+            _cache_path().unlink()
+        except OSError:
+            pass
+
+
+def resolve_launcher(mime_type: str, *, refresh: bool = False) -> Optional[Launcher]:
+    """
+    The launcher for mime_type in this habitat, or None if nothing handles it.
+    Served from the persistent cache unless one of the files it was resolved
+    from has changed since (or refresh=True).
+    """
+    key = f"{_habitat()}|{mime_type}"
+    with _cache_lock:
+        entries = _load_cache()
+        entry = entries.get(key)
+        if not refresh and entry is not None:
+            if all(_mtime(p) == m for p, m in entry["sources"].items()):
+                found = entry["launcher"]
+                if found is None:
+                    return None
+                return Launcher(found["desktop_id"], found["exec"], found["terminal"])
+
+        launcher, sources = _resolve_uncached(mime_type)
+        entries[key] = {
+            "launcher": launcher.to_dict() if launcher is not None else None,
+            "sources": {str(p): _mtime(str(p)) for p in sources},
+        }
+        _save_cache(entries)
+        return launcher
+
+
+def launcher_for(path: str | Path, *, default_mime: Optional[str] = None) -> Optional[Launcher]:
+    """
+    Resolve the launcher for a file by its guessed MIME type. Directories map
+    to inode/directory; files with no guessable type use default_mime, or
+    resolve to None.
+    """
+    path = Path(path)
+    if path.is_dir():
+        mime_type = "inode/directory"
+    else:
+        mime_type = mimetypes.guess_type(path.name)[0] or default_mime
+    if mime_type is None:
+        return None
+    return resolve_launcher(mime_type)
@@ -0,0 +1,225 @@
+"""
+pyhabitat.profiling
+
+Measure what each detector costs on this machine. Some checks take 100x
+longer on Termux or iSH than on a desktop; `pyhabitat profile` shows which.
+
+Every public detector that can be called without arguments is run N times
+cold (its cache cleared first) and N times warm. For each one the profile
+reports mean, p95 and max latency, the files opened and subprocesses spawned
+per cold call (counted with a sys audit hook), and the tracemalloc peak of
+one extra cold call, which is not timed.
+
+Setting PYHABITAT_PROFILE runs any CLI command under cProfile:
+
+    PYHABITAT_PROFILE=1 pyhabitat on_wsl              # top functions to stderr
+    PYHABITAT_PROFILE=/tmp/on_wsl.prof pyhabitat on_wsl  # pstats dump file
+"""
+
+from __future__ import annotations
+
+import inspect
+import math
+import os
+import sys
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+__all__ = [
+    'profile_detectors',
+    'render_profile',
+    'run_profiled',
+    'DETECTOR_MODULES',
+]
+
+# Modules whose exports are side-effect-free detectors. launch and web
+# open windows or bind servers, so they are never profiled.
+DETECTOR_MODULES = (
+    "pyhabitat.environment",
+    "pyhabitat.console",
+    "pyhabitat.gui_elements",
+    "pyhabitat.file_character",
+    "pyhabitat.system_info",
+)
+
+_SPAWN_EVENTS = {"subprocess.Popen", "os.system", "os.posix_spawn", "os.spawn", "os.exec", "os.fork"}
+
+_counts = {"open": 0, "spawn": 0}
+_counting = threading.Event()
+_hook_installed = False
+
+
+def _audit(event: str, args) -> None:
+    if not _counting.is_set():
+        return
+    if event == "open":
+        _counts["open"] += 1
+    elif event in _SPAWN_EVENTS:
+        _counts["spawn"] += 1
+
+
+def _install_hook() -> None:
+    # Audit hooks cannot be removed, so one hook is installed per process
+    # and only counts while a measurement is running.
+    global _hook_installed
+    if not _hook_installed and hasattr(sys, "addaudithook"):
+        sys.addaudithook(_audit)
+        _hook_installed = True
+
+
+def _detectors(names: Optional[Iterable[str]] = None) -> list[tuple[str, Callable]]:
+    import importlib
+
+    from ._cli_manifest import MANIFEST
+
+    selected = []
+    for name, (module, _, _) in MANIFEST.items():
+        if module not in DETECTOR_MODULES or (names and name not in names):
+            continue
+        func = getattr(importlib.import_module(module), name)
+        try:
+            params = inspect.signature(func).parameters.values()
+        except (TypeError, ValueError):
+            continue
+        if all(p.default is not p.empty or p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD) for p in params):
+            selected.append((name, func))
+    return selected
+
+
+def _stats(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    p95 = ordered[max(math.ceil(0.95 * len(ordered)) - 1, 0)]
+    return {
+        "mean": sum(ordered) / len(ordered),
+        "p95": p95,
+        "max": ordered[-1],
+    }
+
+
+def _call(func: Callable) -> tuple[float, Optional[str]]:
+    started = time.perf_counter()
+    try:
+        func()
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return time.perf_counter() - started, error
+
+
+def profile_detectors(names: Optional[Iterable[str]] = None, runs: int = 5) -> list[dict]:
+    """
+    Profile each zero-argument detector (optionally only those in names).
+
+    Returns one dict per detector with "cold" and "warm" latency stats
+    (mean/p95/max seconds), "opens" and "spawns" per cold call,
+    "peak_bytes" from tracemalloc, and "error" if a call raised. The timed
+    runs are not traced (unless the caller is already tracing); the peak
+    comes from one extra, untimed cold call.
+    """
+    import tracemalloc
+
+    names = set(names) if names else None
+    runs = max(int(runs), 1)
+    _install_hook()
+    results = []
+    for name, func in _detectors(names):
+        clear = getattr(func, "cache_clear", None)
+        cold, warm = [], []
+        error = None
+        _counts.update(open=0, spawn=0)
+
+        # Cold runs are timed untraced: tracemalloc slows allocation-heavy
+        # probes several times over, which would skew cold against warm.
+        for _ in range(runs):
+            if clear is not None:
+                clear()
+            _counting.set()
+            try:
+                seconds, error = _call(func)
+            finally:
+                _counting.clear()
+            cold.append(seconds)
+
+        opens, spawns = _counts["open"] / runs, _counts["spawn"] / runs
+        for _ in range(runs):
+            warm.append(_call(func)[0])
+
+        # One more cold call, untimed, for the allocation peak.
+        if clear is not None:
+            clear()
+        # Leave a caller's own tracemalloc session running.
+        owned = not tracemalloc.is_tracing()
+        if owned:
+            tracemalloc.start()
+        elif hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        try:
+            _call(func)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            if owned:
+                tracemalloc.stop()
+
+        results.append({
+            "name": name,
+            "cached": clear is not None,
+            "cold": _stats(cold),
+            "warm": _stats(warm),
+            "opens": opens,
+            "spawns": spawns,
+            "peak_bytes": peak,
+            "error": error,
+        })
+    return results
+
+
+def render_profile(results: list[dict], fmt: str = "text") -> str:
+    """Render profile_detectors() output as an aligned table ("text") or "json"."""
+    if fmt == "json":
+        import json
+        return json.dumps(results, indent=2) + "\n"
+
+    def ms(seconds: float) -> str:
+        return f"{seconds * 1000:.3f}"
+
+    header = ("detector", "cold mean", "cold p95", "cold max", "warm mean", "opens", "spawns", "peak KiB")
+    rows = [header]
+    for r in sorted(results, key=lambda r: r["cold"]["mean"], reverse=True):
+        rows.append((
+            r["name"] + (" !" if r["error"] else ""),
+            ms(r["cold"]["mean"]), ms(r["cold"]["p95"]), ms(r["cold"]["max"]),
+            ms(r["warm"]["mean"]),
+            f"{r['opens']:.1f}", f"{r['spawns']:.1f}", f"{r['peak_bytes'] / 1024:.1f}",
+        ))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    lines = [
+        "  ".join(cell.ljust(w) if i == 0 else cell.rjust(w) for i, (cell, w) in enumerate(zip(row, widths)))
+        for row in rows
+    ]
+    lines.insert(1, "-" * len(lines[0]))
+    lines.append("")
+    lines.append("Latencies in ms. opens/spawns are per cold call; '!' marks a detector that raised.")
+    return "\n".join(lines) + "\n"
+
+
+def run_profiled(func: Callable, *args, **kwargs):
+    """
+    Run func under cProfile as directed by PYHABITAT_PROFILE: "1"/"true"
+    prints the top 30 functions by cumulative time to stderr; any other value
+    is taken as a path for a pstats dump.
+    """
+    import cProfile
+    import pstats
+
+    target = os.environ.get("PYHABITAT_PROFILE", "1")
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args, **kwargs)
+    finally:
+        if target.lower() in ("1", "true", "yes", "on"):
+            stats = pstats.Stats(profiler, stream=sys.stderr)
+            stats.sort_stats("cumulative").print_stats(30)
+        else:
+            profiler.dump_stats(target)
+            print(f"pyhabitat: profile written to {target}", file=sys.stderr)
@@ -0,0 +1,478 @@
+"""
+pyhabitat.readiness
+
+Readiness checks for local services, in sync and asyncio flavours.
+
+Each attempt runs up to two stages:
+
+1. A TCP connect to the URL's host and port. Once a server is listening,
+   the kernel completes the handshake even if the app is still busy, so
+   this is enough to know a browser will not get "connection refused".
+2. Optionally, a HEAD request to a health path. Any HTTP status counts as
+   ready: the server answered.
+
+Failed attempts are retried with jittered exponential backoff until the
+overall timeout expires.
+
+watch_until_ready() runs the TCP stage for any number of endpoints on one
+shared, selector-based thread and returns a concurrent.futures.Future per
+endpoint, firing an optional callback as each one comes up.
+
+Typical usage
+-------------
+
+    from pyhabitat.readiness import wait_until_ready, wait_until_all_ready_async
+
+    wait_until_ready("http://127.0.0.1:8000/", timeout=10)
+
+    results = asyncio.run(wait_until_all_ready_async(
+        ["http://127.0.0.1:8000/", "http://127.0.0.1:8001/"],
+        health_path="/healthz",
+    ))
+"""
+
+from __future__ import annotations
+
+import errno
+import logging
+import os
+import random
+import selectors
+import socket
+import threading
+import time
+from concurrent.futures import Future
+from typing import Iterable, Iterator, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'Endpoint',
+    'parse_endpoint',
+    'backoff_delays',
+    'tcp_connect_ready',
+    'head_ready',
+    'wait_until_ready',
+    'wait_until_ready_async',
+    'wait_until_all_ready_async',
+    'ReadinessWatcher',
+    'watch_until_ready',
+]
+
+
+class Endpoint(NamedTuple):
+    scheme: str
+    host: str
+    port: int
+    path: str
+
+
+def parse_endpoint(url: str) -> Endpoint:
+    """Split 'http://host:port/path' (or 'host:port') into an Endpoint."""
+    url = url.strip()
+    if "://" not in url:
+        url = f"http://{url}"
+    parts = urlsplit(url)
+    scheme = parts.scheme or "http"
+    if not parts.hostname:
+        raise ValueError(f"URL has no host: {url!r}")
+    port = parts.port or (443 if scheme == "https" else 80)
+    return Endpoint(scheme, parts.hostname, port, parts.path or "/")
+
+
+def backoff_delays(
+    initial: float = 0.05,
+    maximum: float = 1.0,
+    factor: float = 2.0,
+) -> Iterator[float]:
+    """
+    Yield exponentially growing delays with "equal jitter": each delay is
+    between half and all of the current step, so many pollers started at the
+    same moment drift apart instead of retrying in lockstep.
+    """
+    step = initial
+    while True:
+        yield step / 2 + random.uniform(0, step / 2)
+        step = min(maximum, step * factor)
+
+
+# ----------------------------------------------------------------------
+# Single attempts
+# ----------------------------------------------------------------------
+
+def tcp_connect_ready(host: str, port: int, timeout: float = 1.0) -> bool:
+    """Return True if a TCP connection to host:port completes within timeout."""
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def head_ready(endpoint: Endpoint, path: str, timeout: float = 1.0) -> bool:
+    """Return True if a HEAD request to path gets any HTTP response."""
+    import http.client
+
+    connection_class = (
+        http.client.HTTPSConnection if endpoint.scheme == "https" else http.client.HTTPConnection
+    )
+    connection = connection_class(endpoint.host, endpoint.port, timeout=timeout)
+    try:
+        connection.request("HEAD", path)
+        connection.getresponse()
+        return True
+    except (OSError, http.client.HTTPException):
+        return False
+    finally:
+        connection.close()
+
+
+# ----------------------------------------------------------------------
+# Sync API
+# ----------------------------------------------------------------------
+
+def wait_until_ready(
+    url: str,
+    *,
+    timeout: float = 5.0,
+    health_path: Optional[str] = None,
+    initial_delay: float = 0.05,
+    max_delay: float = 1.0,
+    attempt_timeout: float = 1.0,
+) -> bool:
+    """
+    Wait until a local service accepts TCP connections (and, if health_path
+    is given, answers a HEAD request there).
+
+    Returns True if the service became ready before timeout.
+    """
+    endpoint = parse_endpoint(url)
+    deadline = time.monotonic() + timeout
+    delays = backoff_delays(initial_delay, max_delay)
+
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        per_attempt = min(attempt_timeout, remaining)
+
+        if tcp_connect_ready(endpoint.host, endpoint.port, per_attempt):
+            if health_path is None or head_ready(endpoint, health_path, per_attempt):
+                return True
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(next(delays), remaining))
+
+
+# ----------------------------------------------------------------------
+# Async API
+# ----------------------------------------------------------------------
+
+async def _tcp_connect_ready_async(host: str, port: int, timeout: float) -> bool:
+    import asyncio
+
+    try:
+        _reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    return True
+
+
+async def _head_ready_async(endpoint: Endpoint, path: str, timeout: float) -> bool:
+    import asyncio
+
+    ssl_context = None
+    if endpoint.scheme == "https":
+        import ssl
+        ssl_context = ssl.create_default_context()
+
+    async def probe() -> bool:
+        reader, writer = await asyncio.open_connection(endpoint.host, endpoint.port, ssl=ssl_context)
+        try:
+            writer.write(
+                f"HEAD {path} HTTP/1.1\r\n"
+                f"Host: {endpoint.host}:{endpoint.port}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1")
+            )
+            await writer.drain()
+            return (await reader.readline()).startswith(b"HTTP/")
+        finally:
+            writer.close()
+
+    try:
+        return await asyncio.wait_for(probe(), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+
+
+async def wait_until_ready_async(
+    url: str,
+    *,
+    timeout: float = 5.0,
+    health_path: Optional[str] = None,
+    initial_delay: float = 0.05,
+    max_delay: float = 1.0,
+    attempt_timeout: float = 1.0,
+) -> bool:
+    """Awaitable counterpart of wait_until_ready(); never blocks the event loop."""
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    endpoint = parse_endpoint(url)
+    deadline = loop.time() + timeout
+    delays = backoff_delays(initial_delay, max_delay)
+
+    while True:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return False
+        per_attempt = min(attempt_timeout, remaining)
+
+        if await _tcp_connect_ready_async(endpoint.host, endpoint.port, per_attempt):
+            if health_path is None or await _head_ready_async(endpoint, health_path, per_attempt):
+                return True
+
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(next(delays), remaining))
+
+
+async def wait_until_all_ready_async(urls: Iterable[str], **kwargs) -> dict[str, bool]:
+    """Wait for many services concurrently; returns {url: ready}."""
+    import asyncio
+
+    urls = list(urls)
+    results = await asyncio.gather(*(wait_until_ready_async(url, **kwargs) for url in urls))
+    return dict(zip(urls, results))
+
+
+# ----------------------------------------------------------------------
+# Shared watcher
+# ----------------------------------------------------------------------
+
+_CONNECT_IN_PROGRESS = {
+    errno.EINPROGRESS,
+    errno.EWOULDBLOCK,
+    errno.EALREADY,
+    getattr(errno, "WSAEWOULDBLOCK", 10035),
+}
+
+
+class _PendingCheck:
+    __slots__ = ("url", "address", "family", "deadline", "callback", "future", "delays", "next_attempt", "sock")
+
+    def __init__(self, url, address, family, deadline, callback, future, delays):
+        self.url = url
+        self.address = address
+        self.family = family
+        self.deadline = deadline
+        self.callback = callback
+        self.future = future
+        self.delays = delays
+        self.next_attempt = 0.0
+        self.sock = None
+
+
+class ReadinessWatcher:
+    """
+    Multiplex many TCP readiness checks over non-blocking sockets on a single
+    daemon thread, instead of one sleeping poller thread per endpoint.
+
+    Callbacks run on the watcher thread, so they should be quick (spawning a
+    browser with Popen is fine). Cancelling a returned future drops its check.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._incoming = []
+        self._checks = []
+        self._thread = None
+        self._selector = None
+        self._wake_r = None
+        self._wake_w = None
+
+    def watch(
+        self,
+        url: str,
+        *,
+        timeout: float = 5.0,
+        callback=None,
+        initial_delay: float = 0.05,
+        max_delay: float = 1.0,
+    ) -> Future:
+        """
+        Start watching url. The returned Future resolves to True once the
+        endpoint accepts a TCP connection (after callback(url) has run), or
+        False when timeout expires. Errors raised by callback are set on the future.
+        """
+        future = Future()
+        endpoint = parse_endpoint(url)
+        try:
+            family, _type, _proto, _name, address = socket.getaddrinfo(
+                endpoint.host, endpoint.port, type=socket.SOCK_STREAM
+            )[0]
+        except OSError as e:
+            logger.warning("Cannot resolve %s: %s", url, e)
+            future.set_result(False)
+            return future
+
+        check = _PendingCheck(
+            url,
+            address,
+            family,
+            time.monotonic() + timeout,
+            callback,
+            future,
+            backoff_delays(initial_delay, max_delay),
+        )
+        with self._lock:
+            self._incoming.append(check)
+            self._start()
+        future.add_done_callback(lambda _f: self._wake())
+        self._wake()
+        return future
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._incoming) + len(self._checks)
+
+    # --- watcher thread ---
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+        self._thread = threading.Thread(target=self._run, daemon=True, name="pyhabitat-readiness-watcher")
+        self._thread.start()
+
+    def _wake(self) -> None:
+        try:
+            self._wake_w.send(b"\0")
+        except (OSError, AttributeError):
+            pass # already awake (buffer full) or not started
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                self._checks.extend(self._incoming)
+                self._incoming.clear()
+
+            now = time.monotonic()
+            timeout = None
+            for check in list(self._checks):
+                if check.future.done():
+                    self._drop(check) # cancelled by the caller
+                elif now >= check.deadline:
+                    self._finish(check, False)
+                elif check.sock is None and now >= check.next_attempt:
+                    self._connect(check, now)
+
+                if check in self._checks:
+                    wake_at = check.deadline if check.sock is not None else min(check.deadline, check.next_attempt)
+                    delay = max(0.0, wake_at - now)
+                    timeout = delay if timeout is None else min(timeout, delay)
+
+            for key, _mask in self._selector.select(timeout):
+                if key.data is None:
+                    try:
+                        while self._wake_r.recv(4096):
+                            pass
+                    except OSError:
+                        pass
+                    continue
+                check = key.data
+                error = check.sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                self._close_socket(check)
+                if error == 0:
+                    self._finish(check, True)
+                else:
+                    self._retry(check)
+
+    def _connect(self, check: _PendingCheck, now: float) -> None:
+        sock = socket.socket(check.family, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        error = sock.connect_ex(check.address)
+        if error == 0:
+            sock.close()
+            self._finish(check, True)
+        elif error in _CONNECT_IN_PROGRESS:
+            check.sock = sock
+            self._selector.register(sock, selectors.EVENT_WRITE, check)
+        else:
+            sock.close()
+            self._retry(check)
+
+    def _retry(self, check: _PendingCheck) -> None:
+        check.next_attempt = time.monotonic() + next(check.delays)
+
+    def _close_socket(self, check: _PendingCheck) -> None:
+        if check.sock is not None:
+            self._selector.unregister(check.sock)
+            check.sock.close()
+            check.sock = None
+
+    def _drop(self, check: _PendingCheck) -> None:
+        self._close_socket(check)
+        self._checks.remove(check)
+
+    def _finish(self, check: _PendingCheck, ready: bool) -> None:
+        self._drop(check)
+        if not check.future.set_running_or_notify_cancel():
+            return
+        if ready and check.callback is not None:
+            try:
+                check.callback(check.url)
+            except Exception as e:
+                logger.exception("Readiness callback failed for %s", check.url)
+                check.future.set_exception(e)
+                return
+        check.future.set_result(ready)
+
+
+_watcher: Optional[ReadinessWatcher] = None
+_watcher_lock = threading.Lock()
+
+
+def _after_fork_in_child() -> None:
+    # The watcher thread does not survive fork; a child builds its own.
+    global _watcher, _watcher_lock
+    _watcher = None
+    _watcher_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def watch_until_ready(
+    url: str,
+    *,
+    timeout: float = 5.0,
+    callback=None,
+    initial_delay: float = 0.05,
+    max_delay: float = 1.0,
+) -> Future:
+    """
+    Watch url on the process-wide ReadinessWatcher and return a Future[bool].
+    callback(url) fires on the watcher thread as soon as the endpoint is ready.
+    """
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = ReadinessWatcher()
+    return _watcher.watch(
+        url,
+        timeout=timeout,
+        callback=callback,
+        initial_delay=initial_delay,
+        max_delay=max_delay,
+    )
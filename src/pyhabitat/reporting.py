@@ -1,6 +1,7 @@
 # src/pyhabitat/report.py 
 from __future__ import annotations  
 import sys
+import time
 import logging
 from pathlib import Path
 
@@ -22,113 +23,218 @@ def should_pause():
 
     return True
     
-def report(path=None, debug=False):
+# Probes that touch Tk or matplotlib backends stay on the calling thread:
+# Tk must not be driven from a worker thread, and backend selection is global.
+MAIN_THREAD_CHECKS = {
+    "tkinter_is_available",
+    "matplotlib_is_available_for_gui_plotting",
+    "matplotlib_is_available_for_headless_image_export",
+}
+
+# (title, note, check names); the text rendering reproduces report()'s layout.
+_SECTIONS = (
+    ("Current Build Checks ", "# // Based on hasattr(sys,..) and getattr(sys,..)", 30,
+     ("in_repl", "as_frozen", "as_pyinstaller")),
+    ("Operating System Checks", "# // Based on platform.system()", 30,
+     ("on_windows", "on_macos", "on_linux", "on_wsl", "on_android", "on_termux",
+      "on_pydroid", "on_ish_alpine", "on_freebsd", "on_chromeos_crostini")),
+    ("Capability Checks", None, 25,
+     ("tkinter_is_available", "matplotlib_is_available_for_gui_plotting",
+      "matplotlib_is_available_for_headless_image_export", "web_browser_is_available",
+      "interactive_terminal_is_available")),
+)
+
+
+def _timed(func, *args, **kwargs) -> dict:
+    started = time.perf_counter()
+    try:
+        value, error = func(*args, **kwargs), None
+    except Exception as e:
+        value, error = None, f"{type(e).__name__}: {e}"
+    return {"value": value, "seconds": time.perf_counter() - started, "error": error}
+
+
+def _inspect_path(path, debug: bool) -> dict:
+    from .file_character import classify_executable
+    return classify_executable(path, debug)
+
+
+def collect_report(path=None, debug: bool = False, max_workers: int = 8) -> dict:
+    """Evaluate every report check and return the results as a dict.
+
+    Independent probes run on a thread pool; the Tk and matplotlib probes
+    run on the calling thread meanwhile. Each executable path is resolved and
+    its header read once for all of its binary checks. Every check records
+    its wall-clock time in seconds.
+
+    Args:
+        path (Path | str | None): Path to inspect (defaults to sys.argv[0]).
+        debug (bool): Enable verbose debug logging in the path checks.
+        max_workers (int): Thread pool size.
+
+    Raises:
+        FileNotFoundError: If path is given but is not a file.
+    """
+    import pyhabitat as ph
+    from concurrent.futures import ThreadPoolExecutor
+    from .file_character import CLASSIFY_CHECKS
+
+    if path is not None and not Path(path).is_file():
+        raise FileNotFoundError(f"'{path}' is not a valid file or does not exist.")
+    script_path = None
+    if path or (sys.argv[0] and sys.argv[0] != '-c'):
+        script_path = Path(path or sys.argv[0]).resolve()
+    logging.debug(f"Inspecting path: {script_path}")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pyhabitat-report") as pool:
+        pending = {}
+        for _, _, _, names in _SECTIONS:
+            for name in names:
+                if name not in MAIN_THREAD_CHECKS:
+                    pending[name] = pool.submit(_timed, getattr(ph, name))
+        interp = ph.interp_path()
+        interp_future = pool.submit(_timed, _inspect_path, interp, debug)
+        script_future = pool.submit(_timed, _inspect_path, script_path, debug) if script_path else None
+
+        results = {name: _timed(getattr(ph, name)) for name in sorted(MAIN_THREAD_CHECKS)}
+        results.update({name: future.result() for name, future in pending.items()})
+        interp_result = interp_future.result()
+        script_result = script_future.result() if script_future else None
+
+    sections = []
+    for title, note, _, names in _SECTIONS:
+        sections.append({
+            "title": title.strip(),
+            "note": note,
+            "checks": [dict(name=name, label=f"{name}()", **results[name]) for name in names],
+        })
+
+    def path_checks(result, label):
+        inspected = result["value"] or {}
+        return [
+            {"name": name, "label": label.format(name), "value": inspected.get(name),
+             # One shared inspection; its time is on the section.
+             "seconds": None, "error": result["error"]}
+            for name in CLASSIFY_CHECKS
+        ]
+
+    sections.append({
+        "title": "Interpreter Checks",
+        "note": "# // Based on sys.executable()",
+        "interp_path": interp,
+        "seconds": interp_result["seconds"],
+        "checks": path_checks(interp_result, "{}(ph.interp_path())"),
+    })
+    sections.append({
+        "title": "Current Environment Check",
+        "note": "# // Based on sys.argv[0]",
+        "sys_argv0": str(sys.argv[0]),
+        "script_path": str(script_path) if script_path else None,
+        "seconds": script_result["seconds"] if script_result else None,
+        "checks": path_checks(script_result, "{}()") if script_result else [],
+        "skipped": [] if script_result else [{"name": name} for name in CLASSIFY_CHECKS],
+    })
+
+    from ._version import __version__
+    return {
+        "pyhabitat_version": __version__,
+        "sections": sections,
+        "elapsed": time.perf_counter() - started,
+    }
+
+
+def _render_text(data: dict) -> str:
+    lines = [
+        "================================",
+        "======= PyHabitat Report =======",
+        "================================",
+    ]
+    rules = {title.strip(): (title, rule) for title, _, rule, _ in _SECTIONS}
+    rules["Interpreter Checks"] = ("Interpreter Checks", 29)
+    rules["Current Environment Check"] = ("Current Environment Check", 29)
+    for section in data["sections"]:
+        heading, rule = rules[section["title"]]
+        lines.append(f"\n{heading}")
+        if section["note"]:
+            lines.append(section["note"])
+        lines.append("-" * rule)
+        if "interp_path" in section:
+            lines.append(f"interp_path(): {section['interp_path']}")
+        if "sys_argv0" in section:
+            lines.append(f"sys.argv[0] = {section['sys_argv0']}")
+            if section["script_path"] is None:
+                lines.append("Skipping: ")
+                lines.extend(f"    {check['name']}(), " for check in section["skipped"])
+                lines.append("All False, script_path is None.")
+                continue
+            lines.append(f"script_path = {section['script_path']}")
+        for check in section["checks"]:
+            value = check["value"] if check["error"] is None else f"Error ({check['error']})"
+            lines.append(f"{check['label']}: {value}")
+    lines += [
+        "",
+        "=================================",
+        "=== PyHabitat Report Complete ===",
+        "=================================",
+        "",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _render_markdown(data: dict) -> str:
+    lines = ["# PyHabitat Report", "", f"pyhabitat {data['pyhabitat_version']}, collected in {data['elapsed'] * 1000:.1f} ms"]
+    for section in data["sections"]:
+        lines += ["", f"## {section['title']}", ""]
+        if section.get("interp_path"):
+            lines += [f"Interpreter: `{section['interp_path']}`", ""]
+        if "sys_argv0" in section:
+            lines += [f"sys.argv[0]: `{section['sys_argv0']}`", ""]
+            if section["script_path"] is None:
+                lines.append("Skipped: script_path is None.")
+                continue
+        lines += ["| Check | Value | Time (ms) |", "| --- | --- | ---: |"]
+        for check in section["checks"]:
+            value = f"error: {check['error']}" if check["error"] else f"`{check['value']}`"
+            seconds = check["seconds"] if check["seconds"] is not None else section.get("seconds")
+            ms = f"{seconds * 1000:.2f}" if seconds is not None else ""
+            lines.append(f"| `{check['label']}` | {value} | {ms} |")
+    return "\n".join(lines) + "\n"
+
+
+def render_report(data: dict, fmt: str = "text") -> str:
+    """Render collect_report() output as "text" (report()'s layout), "json" or "markdown"."""
+    if fmt == "json":
+        import json
+        return json.dumps(data, indent=2, default=str) + "\n"
+    if fmt == "markdown":
+        return _render_markdown(data)
+    if fmt == "text":
+        return _render_text(data)
+    raise ValueError(f"Unknown report format: {fmt!r}")
+
+
+def report(path=None, debug=False, fmt="text"):
     """Print a comprehensive environment report.
 
     Args:
         path (Path | str | None): Path to inspect (defaults to sys.argv[0]).
         debug (bool): Enable verbose debug output.
+        fmt (str): "text" (default), "json" or "markdown".
     """
-    import pyhabitat as ph
     if debug:
         logging.basicConfig(level=logging.DEBUG)
         logging.getLogger('matplotlib').setLevel(logging.WARNING)  # Suppress matplotlib debug logs
-    print("================================")
-    print("======= PyHabitat Report =======")
-    print("================================")
-    print("\nCurrent Build Checks ")
-    print("# // Based on hasattr(sys,..) and getattr(sys,..)")
-    print("------------------------------")
-    print(f"in_repl(): {ph.in_repl()}")
-    print(f"as_frozen(): {ph.as_frozen()}")
-    print(f"as_pyinstaller(): {ph.as_pyinstaller()}")
-    print("\nOperating System Checks")
-    print("# // Based on platform.system()")
-    print("------------------------------")
-    print(f"on_windows(): {ph.on_windows()}")
-    print(f"on_macos(): {ph.on_macos()}")
-    print(f"on_linux(): {ph.on_linux()}")
-    print(f"on_wsl(): {ph.on_wsl()}")
-    print(f"on_android(): {ph.on_android()}")
-    print(f"on_termux(): {ph.on_termux()}")
-    print(f"on_pydroid(): {ph.on_pydroid()}")
-    print(f"on_ish_alpine(): {ph.on_ish_alpine()}")
-    print(f"on_freebsd(): {ph.on_freebsd()}")
-    print(f"on_chromeos_crostini(): {ph.on_chromeos_crostini()}")
-    print("\nCapability Checks")
-    print("-------------------------")
-    print(f"tkinter_is_available(): {ph.tkinter_is_available()}")
-    print(f"matplotlib_is_available_for_gui_plotting(): {ph.matplotlib_is_available_for_gui_plotting()}")
-    print(f"matplotlib_is_available_for_headless_image_export(): {ph.matplotlib_is_available_for_headless_image_export()}")
-    print(f"web_browser_is_available(): {ph.web_browser_is_available()}")
-    print(f"interactive_terminal_is_available(): {ph.interactive_terminal_is_available()}")
-    print("\nInterpreter Checks")
-    print("# // Based on sys.executable()")
-    print("-----------------------------")
-    print(f"interp_path(): {ph.interp_path()}")
-    if debug:
-        # Do these debug prints once to avoid redundant prints
-        # Supress redundant prints explicity using suppress_debug=True, 
-        # so that only unique information gets printed for each check, 
-        # even when more than one use the same functions which include debugging logs.
-        #print(f"ph.check_executable_path(ph.interp_path(), debug=True)")
-        ph.check_executable_path(ph.interp_path(), debug=debug)    
-        #print(f"read_magic_bites(ph.interp_path(), debug=True)")
-        ph.read_magic_bytes(ph.interp_path(), debug=debug)
-    print(f"is_elf(ph.interp_path()): {ph.is_elf(ph.interp_path(), debug=debug, suppress_debug=True)}")
-    print(f"is_windows_portable_executable(ph.interp_path()): {ph.is_windows_portable_executable(ph.interp_path(), debug=debug, suppress_debug=True)}")
-    print(f"is_macos_executable(ph.interp_path()): {ph.is_macos_executable(ph.interp_path(), debug=debug, suppress_debug=True)}")
-    print(f"is_pyz(ph.interp_path()): {ph.is_pyz(ph.interp_path(), debug=debug, suppress_debug=True)}")
-    print(f"is_pipx(ph.interp_path()): {ph.is_pipx(ph.interp_path(), debug=debug, suppress_debug=True)}")
-    print(f"is_python_script(ph.interp_path()): {ph.is_python_script(ph.interp_path(), debug=debug, suppress_debug=True)}")
-    print("\nCurrent Environment Check")
-    print("# // Based on sys.argv[0]")
-    print("-----------------------------")
-    inspect_path = path if path is not None else (None if sys.argv[0] == '-c' else sys.argv[0])
-    logging.debug(f"Inspecting path: {inspect_path}")
-    # Early validation of path
-    if path is not None:
-        path_obj = Path(path)
-        if not path_obj.is_file():
-            print(f"Error: '{path}' is not a valid file or does not exist.")
-            if debug:
-                logging.error(f"Invalid path: '{path}' is not a file or does not exist.")
-            raise SystemExit(1)
-    script_path = None
-    if path or (sys.argv[0] and sys.argv[0] != '-c'):
-        script_path = Path(path or sys.argv[0]).resolve()
-    print(f"sys.argv[0] = {str(sys.argv[0])}")
-    if script_path is not None:
-        print(f"script_path = {script_path}")
+    try:
+        data = collect_report(path, debug)
+    except FileNotFoundError:
+        print(f"Error: '{path}' is not a valid file or does not exist.")
         if debug:
-            # Do these debug prints once to avoid redundant prints
-            # Supress redundant prints explicity using suppress_debug=True, 
-            # so that only unique information gets printed for each check, 
-            # even when more than one use the same functions which include debugging logs.
-            #print(f"check_executable_path(script_path, debug=True)")
-            ph.check_executable_path(script_path, debug=debug)
-            #print(f"read_magic_bites(script_path, debug=True)")
-            ph.read_magic_bytes(script_path, debug=debug)
-        print(f"is_elf(): {ph.is_elf(script_path, debug=debug, suppress_debug=True)}")
-        print(f"is_windows_portable_executable(): {ph.is_windows_portable_executable(script_path, debug=debug, suppress_debug=True)}")
-        print(f"is_macos_executable(): {ph.is_macos_executable(script_path, debug=debug, suppress_debug=True)}")
-        print(f"is_pyz(): {ph.is_pyz(script_path, debug=debug, suppress_debug=True)}")
-        print(f"is_pipx(): {ph.is_pipx(script_path, debug=debug, suppress_debug=True)}")
-        print(f"is_python_script(): {ph.is_python_script(script_path, debug=debug, suppress_debug=True)}")
-    else:
-        print("Skipping: ") 
-        print("    is_elf(), ")
-        print("    is_windows_portable_executable(), ")
-        print("    is_macos_executable(), ")
-        print("    is_pyz(), ")
-        print("    is_pipx(), ") 
-        print("    is_python_script(), ")
-        print("All False, script_path is None.")
-    print("")
-    print("=================================")
-    print("=== PyHabitat Report Complete ===")
-    print("=================================")
-    print("")
+            logging.error(f"Invalid path: '{path}' is not a file or does not exist.")
+        raise SystemExit(1)
+    # One buffered write for the whole report.
+    sys.stdout.write(render_report(data, fmt))
+    sys.stdout.flush()
     if should_pause():
         print("Press Return to Continue...", file=sys.stderr)
         sys.stdin.readline()
@@ -6,13 +6,24 @@ servedirs.py - tiny directory server with UI + shutdown button
 from __future__ import annotations
 
 import os
+import re
+import hmac
+import json
+import secrets
+import socket
 import threading
+import time
+import queue
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
-from urllib.parse import quote
+from urllib.parse import quote, urlsplit, parse_qs
 from string import Template
 from html import escape
 
+from .file_character import fingerprint
+
 # ----------------------------
 # HTML template
 # ----------------------------
@@ -63,6 +74,11 @@ HTML_PAGE = Template("""<!doctype html>
       text-decoration: none;
       color: #0d6efd;
     }
+    .du {
+      float: right;
+      color: #666;
+      font-size: 13px;
+    }
   </style>
 </head>
 <body>
@@ -77,24 +93,768 @@ HTML_PAGE = Template("""<!doctype html>
   <ul>
     $items
   </ul>
+  <script>
+    // Fill in recursive directory sizes; re-poll while the server is still walking.
+    function fmt(n) {
+      const units = ["B", "KB", "MB", "GB", "TB"];
+      let i = 0;
+      while (n >= 1024 && i < units.length - 1) { n /= 1024; i++; }
+      return n.toFixed(i ? 1 : 0) + " " + units[i];
+    }
+    function poll(el) {
+      fetch("/api/dirsize?path=" + encodeURIComponent(el.dataset.path))
+        .then(r => r.json())
+        .then(d => {
+          el.textContent = fmt(d.size) + ", " + d.files + " files" + (d.computing ? " …" : "");
+          if (d.computing) setTimeout(() => poll(el), 1000);
+        })
+        .catch(() => { el.textContent = ""; });
+    }
+    document.querySelectorAll(".du").forEach(poll);
+  </script>
 </body>
 </html>
 """)
 
 
+# ----------------------------
+# Recursive directory sizes
+# ----------------------------
+
+class DirSizeCache:
+    """
+    Memoized, parallel `du` for directory listings.
+
+    Each directory is scanned one level deep by a worker in a thread pool,
+    and the result (own file bytes, own file count, child directories) is
+    stored under its (st_dev, st_ino, st_mtime_ns) key. A directory's mtime
+    changes whenever an entry is added, removed or renamed in it, so a
+    subtree whose keys still match is never scanned again.
+
+    Files rewritten in place do not touch their parent's mtime; their new
+    size is picked up on the next change to that directory.
+
+    Lookups never block on the walk: usage() sums whatever is known and
+    reports computing=True until every directory below the root is cached.
+    """
+
+    def __init__(self, max_workers: int = 4, revalidate_after: float = 2.0):
+        self._entries = {}   # path -> (key, own_size, own_files, subdirs)
+        self._pending = set()
+        self._checked = {}   # path -> monotonic time of last key check
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="servedirs-du",
+        )
+        self.revalidate_after = revalidate_after
+
+    @staticmethod
+    def _key(path: str):
+        st = os.stat(path, follow_symlinks=False)
+        return (st.st_dev, st.st_ino, st.st_mtime_ns)
+
+    def _scan(self, path: str, key) -> None:
+        """Scan one directory level in a worker thread, then fan out to children."""
+        own_size = 0
+        own_files = 0
+        subdirs = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            own_size += entry.stat(follow_symlinks=False).st_size
+                            own_files += 1
+                    except OSError:
+                        continue
+        except OSError:
+            pass # unreadable directories count as empty
+
+        with self._lock:
+            self._entries[path] = (key, own_size, own_files, tuple(subdirs))
+            self._checked[path] = time.monotonic()
+            self._pending.discard(path)
+
+        for child in subdirs:
+            self._ensure(child)
+
+    def _ensure(self, path: str):
+        """
+        Return (entry, fresh) for path, scheduling a scan (once) when the
+        cached entry is missing or its key no longer matches. A stale entry
+        is still returned so totals do not dip while a subtree is re-walked.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and now - self._checked.get(path, 0) < self.revalidate_after:
+                return entry, True
+            if path in self._pending:
+                return entry, False
+
+        try:
+            key = self._key(path)
+        except OSError:
+            with self._lock:
+                self._entries.pop(path, None)
+                self._checked.pop(path, None)
+            return None, True
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == key:
+                self._checked[path] = now
+                return entry, True
+            if path in self._pending:
+                return entry, False
+            self._pending.add(path)
+
+        try:
+            self._executor.submit(self._scan, path, key)
+        except RuntimeError:
+            # Executor already shut down with the server.
+            with self._lock:
+                self._pending.discard(path)
+        return entry, False
+
+    def prefetch(self, path: str | Path) -> None:
+        """Start walking path in the background without summing anything."""
+        self._ensure(os.path.abspath(path))
+
+    def usage(self, path: str | Path) -> dict:
+        """Return {"size", "files", "computing"} for the tree rooted at path."""
+        size = 0
+        files = 0
+        computing = False
+        stack = [os.path.abspath(path)]
+        while stack:
+            entry, fresh = self._ensure(stack.pop())
+            if not fresh:
+                computing = True
+            if entry is None:
+                continue
+            _key, own_size, own_files, subdirs = entry
+            size += own_size
+            files += own_files
+            stack.extend(subdirs)
+        return {"size": size, "files": files, "computing": computing}
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+# ----------------------------
+# Bandwidth shaping
+# ----------------------------
+
+_SIZE_SUFFIXES = {"": 1, "B": 1, "K": 1024, "KB": 1024, "M": 1024 ** 2, "MB": 1024 ** 2, "G": 1024 ** 3, "GB": 1024 ** 3}
+
+def parse_byte_size(value: str | int | float | None) -> int | None:
+    """Parse '512K', '2M', '1.5MB' or a plain number into bytes. None/'' / 0 mean unlimited."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value) or None
+    match = re.fullmatch(r"\s*([0-9.]+)\s*([KMG]?B?)\s*(/S)?\s*", str(value).upper())
+    if not match:
+        raise ValueError(f"Invalid byte size: {value!r}")
+    return int(float(match.group(1)) * _SIZE_SUFFIXES[match.group(2)]) or None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket in bytes per second.
+
+    consume() reserves tokens first and then sleeps off any deficit outside
+    the lock, so concurrent writers queue up roughly in arrival order
+    instead of spinning on the lock.
+    """
+
+    def __init__(self, rate: int, burst: int | None = None):
+        self.rate = float(rate)
+        self.burst = int(burst or max(rate // 8, 4096))
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount: int) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= amount
+            deficit = -self._tokens
+        if deficit > 0:
+            time.sleep(deficit / self.rate)
+
+
+# ----------------------------
+# Request metrics
+# ----------------------------
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = tuple(256 * 4 ** i for i in range(12)) # 256 B .. 1 GiB
+
+
+class Histogram:
+    """Fixed-bucket histogram; the last count is the +Inf bucket."""
+
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self):
+        """Yield (upper bound, cumulative count) pairs, Prometheus style."""
+        running = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            running += count
+            yield bound, running
+
+
+class RequestMetrics:
+    """
+    Per-route request counters plus latency and response size histograms.
+
+    Each observation is a handful of integer updates under one short lock,
+    so request threads never wait on formatting or I/O; rendering happens
+    only when /metrics or /api/metrics is scraped.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}  # route -> [status counts, latency Histogram, size Histogram]
+        self.started = time.time()
+
+    def observe(self, route: str, status: int, seconds: float, size: int) -> None:
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = [{}, Histogram(LATENCY_BUCKETS), Histogram(SIZE_BUCKETS)]
+            stats[0][status] = stats[0].get(status, 0) + 1
+            stats[1].observe(seconds)
+            stats[2].observe(size)
+
+    def _snapshot(self):
+        with self._lock:
+            return {
+                route: (dict(codes), _copy_histogram(latency), _copy_histogram(size))
+                for route, (codes, latency, size) in self._routes.items()
+            }
+
+    def to_dict(self) -> dict:
+        routes = {}
+        for route, (codes, latency, size) in sorted(self._snapshot().items()):
+            routes[route] = {
+                "requests": {str(code): n for code, n in sorted(codes.items())},
+                "latency_seconds": _histogram_dict(latency),
+                "response_bytes": _histogram_dict(size),
+            }
+        return {"uptime_seconds": round(time.time() - self.started, 3), "routes": routes}
+
+    def to_prometheus(self) -> str:
+        lines = [
+            "# HELP servedirs_requests_total Requests handled, by route and status code.",
+            "# TYPE servedirs_requests_total counter",
+        ]
+        snapshot = sorted(self._snapshot().items())
+        for route, (codes, _latency, _size) in snapshot:
+            for code, n in sorted(codes.items()):
+                lines.append(f'servedirs_requests_total{{route="{route}",code="{code}"}} {n}')
+        for metric, index, help_text in (
+            ("servedirs_request_duration_seconds", 1, "Time from parsed request line to finished response."),
+            ("servedirs_response_size_bytes", 2, "Response body size from Content-Length."),
+        ):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for route, stats in snapshot:
+                histogram = stats[index]
+                for bound, running in histogram.cumulative():
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{metric}_bucket{{route="{route}",le="{le}"}} {running}')
+                lines.append(f'{metric}_sum{{route="{route}"}} {histogram.total}')
+                lines.append(f'{metric}_count{{route="{route}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+
+def _copy_histogram(histogram: Histogram) -> Histogram:
+    copy = Histogram(histogram.bounds)
+    copy.counts = list(histogram.counts)
+    copy.total = histogram.total
+    copy.count = histogram.count
+    return copy
+
+
+def _histogram_dict(histogram: Histogram) -> dict:
+    return {
+        "count": histogram.count,
+        "sum": histogram.total,
+        "buckets": {
+            ("+Inf" if bound == float("inf") else repr(bound)): running
+            for bound, running in histogram.cumulative()
+        },
+    }
+
+
+# ----------------------------
+# Access log
+# ----------------------------
+
+_STOP = object()
+
+
+class AccessLog:
+    """
+    Non-blocking access log.
+
+    Request threads only build a small dict and put it on a bounded queue.
+    A single writer thread formats records in batches (common log format or
+    JSON lines) and writes each batch with one call, rotating the file by
+    size. When the queue is full the record is dropped and counted instead
+    of making the request thread wait on a slow terminal or disk.
+    """
+
+    FORMATS = ("common", "json")
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        fmt: str = "common",
+        *,
+        max_bytes: int | None = 10 * 1024 * 1024,
+        backup_count: int = 3,
+        queue_size: int = 10000,
+        batch_size: int = 512,
+    ):
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unknown access log format {fmt!r}; choose from {self.FORMATS}")
+        self.path = None if path in (None, "-") else Path(path)
+        self.fmt = fmt
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stream = None
+        self._size = 0
+        self._open()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="servedirs-access-log")
+        self._thread.start()
+
+    def submit(self, record: dict) -> None:
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Flush what is queued and stop the writer thread."""
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        if self.path is not None and self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    # --- writer thread ---
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(record is _STOP for record in batch)
+            text = "".join(self.format(record) + "\n" for record in batch if record is not _STOP)
+            if text:
+                try:
+                    self._write(text)
+                except (OSError, ValueError):
+                    pass # a broken log target must not take the server down
+            if stop:
+                return
+
+    def format(self, record: dict) -> str:
+        if self.fmt == "json":
+            record = dict(record)
+            record["time"] = time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(record["time"]))
+            return json.dumps(record, separators=(",", ":"))
+        stamp = time.strftime("%d/%b/%Y:%H:%M:%S %z", time.localtime(record["time"]))
+        if "message" in record:
+            return f'{record["client"]} - - [{stamp}] {record["message"]}'
+        size = "-" if record.get("bytes") is None else record["bytes"]
+        return f'{record["client"]} - - [{stamp}] "{record["request"]}" {record["status"]} {size}'
+
+    def _open(self) -> None:
+        if self.path is None:
+            import sys
+            self._stream = sys.stdout
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._stream = open(self.path, "a", encoding="utf-8")
+        self._size = self._stream.tell()
+
+    def _rotate(self) -> None:
+        self._stream.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{index}")
+            if older.exists():
+                os.replace(older, self.path.with_name(f"{self.path.name}.{index + 1}"))
+        if self.backup_count > 0:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+        self._open()
+
+    def _write(self, text: str) -> None:
+        if self.path is not None and self.max_bytes and self._size and self._size + len(text) > self.max_bytes:
+            self._rotate()
+        self._stream.write(text)
+        self._stream.flush()
+        self._size += len(text)
+
+
 # ----------------------------
 # Handler
 # ----------------------------
 
+MOUNT_PREFIX = "/m/"
+MOUNT_NAME_RE = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+# The mount-control API needs this header to carry the server's control token.
+TOKEN_HEADER = "X-Servedirs-Token"
+# A parent process can hand servedirs its token through this variable.
+TOKEN_ENV_VAR = "PYHABITAT_SERVEDIRS_TOKEN"
+_LOOPBACK_HOSTS = {"127.0.0.1", "::1", "localhost"}
+
 class ServedirsHandler(SimpleHTTPRequestHandler):
     def __init__(self, *args, directory=None, **kwargs):
         self.base_directory = Path(directory or os.getcwd()).resolve()
         super().__init__(*args, directory=str(self.base_directory), **kwargs)
 
+    def translate_path(self, path):
+        """Resolve /m/<name>/... against that mount's root, anything else against the base root."""
+        mounts = getattr(self.server, "mounts", None)
+        self.directory = str(self.base_directory)
+        if mounts and path.startswith(MOUNT_PREFIX):
+            name, _, rest = path[len(MOUNT_PREFIX):].partition("/")
+            root = mounts.get(name)
+            if root is not None:
+                self.directory = str(root)
+                path = "/" + rest
+        return super().translate_path(path)
+
+    def is_local_client(self) -> bool:
+        host = self.client_address[0]
+        return host.startswith("127.") or host in ("::1", "::ffff:127.0.0.1")
+
+    def is_same_origin(self) -> bool:
+        """True without an Origin header (non-browser clients) or when it names this server."""
+        origin = self.headers.get("Origin")
+        if origin is None:
+            return True
+        try:
+            parts = urlsplit(origin)
+            port = parts.port
+        except ValueError:
+            return False
+        bound_host = str(self.server.server_address[0])
+        return (
+            parts.scheme == "http"
+            and port == self.server.server_address[1]
+            and (parts.hostname in _LOOPBACK_HOSTS or parts.hostname == bound_host)
+        )
+
+    def authorize_mount_control(self, needs_json: bool = False) -> bool:
+        """
+        Mount control needs a loopback client, the server's control token and
+        no foreign Origin. needs_json also requires an application/json body,
+        which a browser cannot send cross-site without a CORS preflight.
+        Sends the error response and returns False otherwise.
+        """
+        if not self.is_local_client():
+            self.send_error(403, "Mount control is only available from localhost")
+            return False
+        if not self.is_same_origin():
+            self.send_error(403, "Cross-origin mount control is not allowed")
+            return False
+        token = self.headers.get(TOKEN_HEADER) or ""
+        if not hmac.compare_digest(token.encode("utf-8"), self.server.control_token.encode("utf-8")):
+            self.send_error(403, "Missing or wrong mount control token")
+            return False
+        if needs_json:
+            content_type = (self.headers.get("Content-Type") or "").split(";", 1)[0].strip().lower()
+            if content_type != "application/json":
+                self.send_error(415, "Mount control requests must be application/json")
+                return False
+        return True
+
+    # --- Request accounting ---
+
+    ROUTES = {
+        "/api/dirsize": "api_dirsize",
+        "/api/hash": "api_hash",
+        "/api/mounts": "api_mounts",
+        "/api/metrics": "metrics",
+        "/metrics": "metrics",
+        "/shutdown": "shutdown",
+    }
+
+    def handle_one_request(self):
+        self.request_started = None
+        self.response_status = None
+        self.response_length = None
+        self.route = None
+        super().handle_one_request()
+        if self.request_started is not None and self.response_status is not None:
+            self.account_request()
+
+    def parse_request(self):
+        self.request_started = time.perf_counter()
+        return super().parse_request()
+
+    def route_label(self) -> str:
+        """Metrics label: a known endpoint, 'listing' when list_directory() ran, else 'file'."""
+        if self.route:
+            return self.route
+        path = urlsplit(self.path).path
+        if path.startswith("/api/mounts/"):
+            return "api_mounts"
+        return self.ROUTES.get(path, "file" if self.command in ("GET", "HEAD") else "other")
+
+    def account_request(self) -> None:
+        """Runs once per request after the response has been written."""
+        elapsed = time.perf_counter() - self.request_started
+        route = self.route_label()
+        metrics = getattr(self.server, "metrics", None)
+        if metrics is not None:
+            metrics.observe(route, self.response_status, elapsed, self.response_length or 0)
+        access_log = getattr(self.server, "access_log", None)
+        if access_log is not None:
+            access_log.submit({
+                "time": time.time(),
+                "client": self.client_address[0],
+                "request": self.requestline,
+                "method": self.command,
+                "path": self.path,
+                "status": self.response_status,
+                "bytes": self.response_length,
+                "duration_ms": round(elapsed * 1000, 3),
+                "route": route,
+            })
+
+    # --- Response body path (bandwidth shaping) ---
+
+    def send_response(self, code, message=None):
+        self.response_status = code
+        self.response_length = None
+        super().send_response(code, message)
+
+    def send_header(self, keyword, value):
+        if keyword.lower() == "content-length":
+            self.response_length = int(value)
+        super().send_header(keyword, value)
+
+    def write_body(self, data) -> None:
+        """
+        Write response bytes through the per-connection and global token buckets.
+        Responses no larger than the server's priority threshold bypass both, so
+        listings and API calls stay snappy while bulk downloads are shaped.
+        """
+        server = self.server
+        length = getattr(self, "response_length", None)
+        threshold = getattr(server, "priority_threshold", 0)
+        global_bucket = getattr(server, "global_bucket", None)
+        connection_rate = getattr(server, "connection_rate", None)
+
+        if (not global_bucket and not connection_rate) or (length is not None and length <= threshold):
+            self.wfile.write(data)
+            return
+
+        bucket = getattr(self, "connection_bucket", None)
+        if bucket is None and connection_rate:
+            bucket = self.connection_bucket = TokenBucket(connection_rate)
+
+        step = min(b.burst for b in (bucket, global_bucket) if b is not None)
+        view = memoryview(data)
+        for offset in range(0, len(view), step):
+            piece = view[offset:offset + step]
+            if bucket is not None:
+                bucket.consume(len(piece))
+            if global_bucket is not None:
+                global_bucket.consume(len(piece))
+            self.wfile.write(piece)
+
+    def copyfile(self, source, outputfile):
+        """Stream file bodies through write_body() instead of shutil.copyfileobj()."""
+        while True:
+            chunk = source.read(64 * 1024)
+            if not chunk:
+                break
+            self.write_body(chunk)
+
+    def log_request(self, code="-", size="-"):
+        """Requests are logged once, with final status and size, by account_request()."""
+
     def log_message(self, format, *args):
-        print(f"[servedirs] {self.address_string()} - {format % args}")
+        access_log = getattr(self.server, "access_log", None)
+        if access_log is None:
+            self.log_to_stderr(format, *args)
+            return
+        access_log.submit({
+            "time": time.time(),
+            "client": self.client_address[0],
+            "message": format % args,
+        })
+
+    def log_error(self, format, *args):
+        """send_error() reasons always reach stderr, even with the access log off."""
+        self.log_to_stderr(format, *args)
+
+    def log_to_stderr(self, format, *args):
+        import sys
+        print(f"[servedirs] {self.address_string()} - {format % args}", file=sys.stderr)
+
+    def do_GET(self):
+        route = urlsplit(self.path).path
+        if route == "/api/dirsize":
+            self.send_dirsize()
+            return
+        if route == "/api/hash":
+            self.send_hash()
+            return
+        if route == "/metrics":
+            self.send_text(self.server.render_metrics(), "text/plain; version=0.0.4; charset=utf-8")
+            return
+        if route == "/api/metrics":
+            self.send_json(self.server.render_metrics(as_json=True))
+            return
+        if route == "/api/mounts":
+            if not self.authorize_mount_control():
+                return
+            self.send_json(self.server.mounts.describe())
+            return
+        super().do_GET()
+
+    def send_text(self, text: str, content_type: str, status: int = 200) -> None:
+        encoded = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(encoded)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.write_body(encoded)
+
+    def send_json(self, payload, status: int = 200) -> None:
+        self.send_text(json.dumps(payload), "application/json", status)
+
+    def query_param(self, name: str, default: str | None = None) -> str | None:
+        values = parse_qs(urlsplit(self.path).query).get(name)
+        return values[0] if values else default
+
+    def send_dirsize(self) -> None:
+        """GET /api/dirsize?path=/some/dir/ -> recursive size, file count, computing flag."""
+        url_path = self.query_param("path")
+        # translate_path() confines the lookup to the served root, like a normal GET.
+        target = self.translate_path(url_path) if url_path else None
+        if target is None or not os.path.isdir(target):
+            self.send_json({"error": "not a directory"}, status=404)
+            return
+        dirsizes = getattr(self.server, "dirsizes", None)
+        if dirsizes is None:
+            self.send_json({"error": "directory sizes disabled"}, status=404)
+            return
+        result = dirsizes.usage(target)
+        result["path"] = url_path
+        self.send_json(result)
+
+    def send_hash(self) -> None:
+        """GET /api/hash?path=/some/file[&algo=sha256] -> content digest of a served file."""
+        url_path = self.query_param("path")
+        algo = self.query_param("algo", "blake2b")
+        target = self.translate_path(url_path) if url_path else None
+        if target is None or not os.path.isfile(target):
+            self.send_json({"error": "not a file"}, status=404)
+            return
+        try:
+            digest = fingerprint(target, algo=algo)
+        except ValueError as e:
+            self.send_json({"error": str(e)}, status=400)
+            return
+        except OSError as e:
+            self.send_json({"error": e.strerror or str(e)}, status=403)
+            return
+        self.send_json({
+            "path": url_path,
+            "algo": algo.lower(),
+            "size": os.path.getsize(target),
+            "digest": digest,
+        })
+
+    def read_json_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return None
+
+    def add_mount(self) -> None:
+        """POST /api/mounts {"name": ..., "path": ...} -> mount a directory at /m/<name>/."""
+        body = self.read_json_body()
+        if not isinstance(body, dict) or not body.get("path"):
+            self.send_json({"error": "expected a JSON object with 'path'"}, status=400)
+            return
+        try:
+            name = self.server.mounts.add(body.get("name"), body["path"])
+        except PermissionError as e:
+            self.send_json({"error": str(e)}, status=403)
+            return
+        except (ValueError, NotADirectoryError) as e:
+            self.send_json({"error": str(e)}, status=400)
+            return
+        self.send_json({"name": name, "url": f"{MOUNT_PREFIX}{quote(name)}/"}, status=201)
+
+    def do_DELETE(self):
+        route = urlsplit(self.path).path
+        if not route.startswith("/api/mounts/"):
+            self.send_error(404)
+            return
+        if not self.authorize_mount_control():
+            return
+        name = route[len("/api/mounts/"):]
+        if not self.server.mounts.remove(name):
+            self.send_error(404, "No such mount")
+            return
+        self.send_response(204)
+        self.end_headers()
 
     def do_POST(self):
+        if urlsplit(self.path).path == "/api/mounts":
+            if not self.authorize_mount_control(needs_json=True):
+                return
+            self.add_mount()
+            return
+
         if self.path == "/shutdown":
             self.send_response(204)
             self.end_headers()
@@ -110,6 +870,7 @@ class ServedirsHandler(SimpleHTTPRequestHandler):
 
     def list_directory(self, path):
         """Override directory listing with custom HTML."""
+        self.route = "listing"
         try:
             entries = sorted(os.listdir(path))
         except OSError:
@@ -117,10 +878,19 @@ class ServedirsHandler(SimpleHTTPRequestHandler):
             return None
 
         items = []
+        url_dir = urlsplit(self.path).path
+        if not url_dir.endswith("/"):
+            url_dir += "/"
+        dirsizes = getattr(self.server, "dirsizes", None)
 
         # parent link
-        if os.path.abspath(path) != str(self.base_directory):
+        if os.path.abspath(path) != self.directory:
             items.append('<li><a href="../">../ (parent)</a></li>')
+        elif self.directory == str(self.base_directory) and url_dir == "/":
+            for name in self.server.mounts.names():
+                items.append(
+                    f'<li><a href="{MOUNT_PREFIX}{quote(name)}/">{escape(name)}/ (mount)</a></li>'
+                )
 
         for name in entries:
             full = os.path.join(path, name)
@@ -128,10 +898,15 @@ class ServedirsHandler(SimpleHTTPRequestHandler):
             display = escape(name) + ("/" if os.path.isdir(full) else "")
             link = quote(name)
 
+            size = ""
             if os.path.isdir(full):
                 link += "/"
+                if dirsizes is not None:
+                    # Kick off the walk now; the page script polls for the totals.
+                    dirsizes.prefetch(full)
+                    size = f'<span class="du" data-path="{escape(url_dir + link)}"></span>'
 
-            items.append(f'<li><a href="{link}">{display}</a></li>')
+            items.append(f'<li><a href="{link}">{display}</a>{size}</li>')
 
         html = HTML_PAGE.substitute(items="\n".join(items)) # Template()
         #html = HTML_PAGE.replace("{items}", "\n".join(items)) # no CSS
@@ -141,7 +916,7 @@ class ServedirsHandler(SimpleHTTPRequestHandler):
         self.send_header("Content-Type", "text/html; charset=utf-8")
         self.send_header("Content-Length", str(len(encoded)))
         self.end_headers()
-        self.wfile.write(encoded)
+        self.write_body(encoded)
         return None
 
 
@@ -149,19 +924,203 @@ class ServedirsHandler(SimpleHTTPRequestHandler):
 # Server runner
 # ----------------------------
 
-def serve_directory_custom(path: str | Path, host="127.0.0.1", port=8000):
+class MountTable:
+    """
+    Thread-safe name -> root directory table behind the /m/<name>/ URL prefix.
+
+    With allowed, only those directories (and their subdirectories) can be
+    mounted; None allows any directory.
+    """
+
+    def __init__(self, allowed=None):
+        self._roots = {}
+        self._lock = threading.Lock()
+        self.allowed = None if allowed is None else [Path(p).expanduser().resolve() for p in allowed]
+
+    def is_allowed(self, root: Path) -> bool:
+        return self.allowed is None or any(root == a or a in root.parents for a in self.allowed)
+
+    def __bool__(self):
+        return bool(self._roots)
+
+    def get(self, name: str):
+        return self._roots.get(name)
+
+    def names(self) -> list[str]:
+        with self._lock:
+            return sorted(self._roots)
+
+    def describe(self) -> dict:
+        with self._lock:
+            return {name: str(root) for name, root in sorted(self._roots.items())}
+
+    def add(self, name: str | None, path: str | Path) -> str:
+        """Mount path under name (defaults to the directory name). Re-adding a name replaces it."""
+        root = Path(path).expanduser().resolve()
+        if not root.is_dir():
+            raise NotADirectoryError(f"Not a directory: {root}")
+        if not self.is_allowed(root):
+            raise PermissionError(f"Not an allowed mount: {root}")
+        name = name or root.name or "root"
+        if not MOUNT_NAME_RE.match(name):
+            raise ValueError(f"Invalid mount name: {name!r}")
+        with self._lock:
+            self._roots[name] = root
+        return name
+
+    def remove(self, name: str) -> bool:
+        with self._lock:
+            return self._roots.pop(name, None) is not None
+
+
+class ServedirsServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer carrying the state shared by every ServedirsHandler."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        server_address,
+        handler_class,
+        *,
+        dir_sizes: bool = True,
+        rate_limit: int | None = None,
+        global_rate_limit: int | None = None,
+        priority_threshold: int = 64 * 1024,
+        access_log: AccessLog | None = None,
+        sock: socket.socket | None = None,
+        control_token: str | None = None,
+        allowed_mounts=None,
+    ):
+        """
+        Pass sock (bound, not listening; e.g. from web.reserve_port().detach())
+        to adopt an already-reserved port instead of binding server_address.
+
+        control_token is the secret the mount-control API requires in the
+        X-Servedirs-Token header; a random one is generated when omitted.
+        allowed_mounts limits which directories can be mounted (see MountTable).
+        """
+        self.access_log = access_log
+        self.control_token = control_token or secrets.token_urlsafe(32)
+        self.dirsizes = DirSizeCache() if dir_sizes else None
+        self.mounts = MountTable(allowed_mounts)
+        self.metrics = RequestMetrics()
+        # Bytes per second for each connection, and across all connections.
+        self.connection_rate = rate_limit or None
+        self.global_bucket = TokenBucket(global_rate_limit) if global_rate_limit else None
+        self.priority_threshold = priority_threshold
+        if sock is None:
+            super().__init__(server_address, handler_class)
+            return
+        self.address_family = sock.family
+        super().__init__(sock.getsockname(), handler_class, bind_and_activate=False)
+        self.socket.close()
+        self.socket = sock
+        self.server_address = sock.getsockname()
+        host, port = self.server_address[:2]
+        self.server_name = socket.getfqdn(host)
+        self.server_port = port
+        try:
+            self.server_activate()
+        except BaseException:
+            self.server_close()
+            raise
+
+    def render_metrics(self, as_json: bool = False):
+        access_log = self.access_log
+        if as_json:
+            data = self.metrics.to_dict()
+            if access_log is not None:
+                data["access_log"] = {"dropped": access_log.dropped, "queued": access_log.queued()}
+            return data
+        text = self.metrics.to_prometheus()
+        if access_log is not None:
+            text += (
+                "# HELP servedirs_access_log_dropped_total Access log records dropped on a full queue.\n"
+                "# TYPE servedirs_access_log_dropped_total counter\n"
+                f"servedirs_access_log_dropped_total {access_log.dropped}\n"
+            )
+        return text
+
+    def server_close(self):
+        super().server_close()
+        if self.dirsizes is not None:
+            self.dirsizes.shutdown()
+        if self.access_log is not None:
+            self.access_log.close()
+
+
+def serve_directory_custom(
+    path: str | Path,
+    host="127.0.0.1",
+    port=8000,
+    dir_sizes=True,
+    mounts=None,
+    rate_limit=None,
+    global_rate_limit=None,
+    priority_threshold=64 * 1024,
+    access_log="-",
+    access_log_format="common",
+    access_log_max_bytes="10M",
+    access_log_backups=3,
+    sock=None,
+    control_token=None,
+    allowed_mounts=None,
+):
+    """
+    Serve path at / and each (name, directory) in mounts at /m/<name>/.
+
+    rate_limit and global_rate_limit cap bytes per second for each connection
+    and for the whole server ('512K', '2M', ... or an int). Responses up to
+    priority_threshold bytes are never throttled.
+
+    access_log is a file path, "-" for stdout, or None to disable it; log files
+    rotate at access_log_max_bytes, keeping access_log_backups old files.
+
+    sock is an optional pre-bound socket to serve on instead of host:port.
+    More mounts can be added or removed at runtime from localhost, with the
+    control token in an X-Servedirs-Token header and a JSON body for POST:
+
+        GET    /api/mounts                      -> {name: directory}
+        POST   /api/mounts  {"name", "path"}    -> mount a directory
+        DELETE /api/mounts/<name>               -> unmount it
+
+    control_token is generated when omitted and printed at startup.
+    allowed_mounts, if given, lists the only directories (with their
+    subdirectories) that can be mounted at runtime.
+    """
     path = Path(path).resolve()
 
     if not path.exists():
         raise FileNotFoundError(path)
 
-    httpd = ThreadingHTTPServer(
+    httpd = ServedirsServer(
         (host, port),
         lambda *args, **kwargs: ServedirsHandler(*args, directory=path, **kwargs),
+        dir_sizes=dir_sizes,
+        rate_limit=parse_byte_size(rate_limit),
+        global_rate_limit=parse_byte_size(global_rate_limit),
+        priority_threshold=parse_byte_size(priority_threshold) or 0,
+        access_log=None if access_log is None else AccessLog(
+            access_log,
+            access_log_format,
+            max_bytes=parse_byte_size(access_log_max_bytes),
+            backup_count=access_log_backups,
+        ),
+        sock=sock,
+        control_token=control_token,
+        allowed_mounts=allowed_mounts,
     )
+    host, port = httpd.server_address[:2]
+    if isinstance(mounts, dict):
+        mounts = mounts.items()
+    for name, root in mounts or ():
+        httpd.mounts.add(name, root)
 
     print(f"Serving: {path}")
     print(f"URL: http://{host}:{port}/")
+    if control_token is None:
+        print(f"Mount control token: {httpd.control_token}")
     print("Press Ctrl+C or use /shutdown")
 
     try:
@@ -179,7 +1138,57 @@ if __name__ == "__main__":
     parser.add_argument("--path", default=".")
     parser.add_argument("--host", default="127.0.0.1")
     parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--fd", type=int, default=None,
+                        help="Serve on this inherited, already-bound socket instead of --host/--port")
+    parser.add_argument("--no-dir-sizes", action="store_true",
+                        help="Do not compute recursive sizes of subdirectories")
+    parser.add_argument("--mount", action="append", default=[], metavar="NAME=PATH",
+                        help="Also serve PATH under /m/NAME/ (repeatable)")
+    parser.add_argument("--allow-mount", action="append", default=None, metavar="PATH",
+                        help="Only allow runtime mounts of PATH and its subdirectories (repeatable)")
+    parser.add_argument("--token-fd", type=int, default=None,
+                        help="Write the mount control token to this inherited file descriptor and close it")
+    parser.add_argument("--rate-limit", default=None, metavar="BYTES",
+                        help="Per-connection bandwidth cap per second, e.g. 512K or 2M")
+    parser.add_argument("--global-rate-limit", default=None, metavar="BYTES",
+                        help="Total bandwidth cap per second across all connections")
+    parser.add_argument("--priority-threshold", default="64K", metavar="BYTES",
+                        help="Responses up to this size skip the bandwidth caps (default: 64K)")
+    parser.add_argument("--access-log", default="-", metavar="PATH",
+                        help="Access log file, or - for stdout (default)")
+    parser.add_argument("--no-access-log", action="store_true",
+                        help="Disable access logging")
+    parser.add_argument("--access-log-format", choices=AccessLog.FORMATS, default="common")
+    parser.add_argument("--access-log-max-bytes", default="10M", metavar="BYTES",
+                        help="Rotate the access log file at this size (default: 10M)")
+    parser.add_argument("--access-log-backups", type=int, default=3,
+                        help="Rotated access log files to keep (default: 3)")
 
     args = parser.parse_args()
 
-    serve_directory_custom(args.path, args.host, args.port)
+    mounts = [spec.split("=", 1) if "=" in spec else (None, spec) for spec in args.mount]
+    sock = socket.socket(fileno=args.fd) if args.fd is not None else None
+
+    control_token = os.environ.pop(TOKEN_ENV_VAR, None)
+    if args.token_fd is not None:
+        control_token = control_token or secrets.token_urlsafe(32)
+        with os.fdopen(args.token_fd, "w") as token_pipe:
+            token_pipe.write(control_token + "\n")
+
+    serve_directory_custom(
+        args.path,
+        args.host,
+        args.port,
+        dir_sizes=not args.no_dir_sizes,
+        mounts=mounts,
+        rate_limit=args.rate_limit,
+        global_rate_limit=args.global_rate_limit,
+        priority_threshold=args.priority_threshold,
+        access_log=None if args.no_access_log else args.access_log,
+        access_log_format=args.access_log_format,
+        access_log_max_bytes=args.access_log_max_bytes,
+        access_log_backups=args.access_log_backups,
+        sock=sock,
+        control_token=control_token,
+        allowed_mounts=args.allow_mount,
+    )
@@ -0,0 +1,372 @@
+"""
+pyhabitat.snapshot
+
+A HabitatSnapshot evaluates pyhabitat's exported facts (on_wsl, is_elf, ...)
+on first use and keeps the results, so a process that asks many questions
+pays for each answer once. Facts are looked up through pyhabitat's lazy
+exports, so only the modules that define the requested facts are imported.
+
+    from pyhabitat.snapshot import default_snapshot
+
+    snap = default_snapshot()
+    snap.fact("on_wsl")                           # computed
+    snap.fact("on_wsl")                           # cached
+    snap.fact("is_elf", exec_path="/usr/bin/env") # cached per argument set
+
+HOST_FACTS names the facts that describe the machine rather than the
+calling process, with the environment variables each one reads. Only these
+may be shared between processes (see pyhabitat.daemon), and env_digest()
+tells whether two processes would see the same inputs for them.
+
+PROCESS_FACTS are the ones a forked child must not inherit (TTY state, the
+REPL, a server worker's identity); every snapshot forgets them in the child
+after os.fork(). Everything else survives a fork, so a prefork server's
+master can call prewarm() once and let its workers share the results:
+
+    # gunicorn.conf.py
+    def on_starting(server):
+        from pyhabitat.snapshot import prewarm
+        prewarm()
+
+Processes that are spawned rather than forked (subprocess tools, the
+multiprocessing "spawn" start method) can receive the facts through the
+PYHABITAT_FACTS environment variable. default_snapshot() adopts them when
+their fingerprint (boot id, interpreter, pyhabitat version, relevant
+environment variables) matches its own, and ignores them otherwise:
+
+    export_facts(prewarm())                   # into os.environ, for every child
+    subprocess.run(cmd, env=export_facts(env=dict(os.environ)))
+
+export_facts_fd() passes them through an inherited descriptor instead.
+
+Adopted facts live in the child's default_snapshot(), so only lookups made
+through it skip detection: snapshot.fact(), `pyhabitat query` and
+daemon.facts(). Calling a probe directly, such as pyhabitat.on_wsl() or
+can_spawn_shell(), still runs detection. Worker code that wants the
+handed-down answers should ask the snapshot:
+
+    default_snapshot().fact("on_wsl")
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import weakref
+from typing import Any, Iterable, Optional
+
+from ._compat import cache
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'HabitatSnapshot',
+    'default_snapshot',
+    'HOST_FACTS',
+    'PROCESS_FACTS',
+    'PREWARM_FACTS',
+    'env_digest',
+    'prewarm',
+    'fingerprint',
+    'export_facts',
+    'export_facts_fd',
+    'FACTS_ENV_VAR',
+]
+
+FACTS_ENV_VAR = "PYHABITAT_FACTS"
+_FORMAT_VERSION = 1
+
+# Zero-argument facts that are the same for every process on the host, given
+# the same values of the listed environment variables. The rest (TTYs, the
+# interpreter, frozen/pipx state, importable packages, DISPLAY-dependent GUI
+# probes) may differ between unrelated processes.
+HOST_FACTS: dict[str, tuple[str, ...]] = {
+    "on_linux": (),
+    "on_windows": (),
+    "on_macos": (),
+    "on_freebsd": (),
+    "on_android": (),
+    "on_ish_alpine": (),
+    "in_container": ("container",),
+    "on_termux": ("PREFIX", "HOME", "TERMUX_VERSION"),
+    "on_wsl": ("WSL_DISTRO_NAME", "WSL_INTEROP"),
+    "on_chromeos_crostini": ("SOMMELIER_VERSION", "SOMMELIER_VM_IDENTIFIER", "GTK_IM_MODULE"),
+    "can_spawn_shell_lite": ("PATH",),
+    "user_darrin_deyoung": ("USER_DARRIN_DEYOUNG", "LOGNAME", "USER", "LNAME", "USERNAME"),
+}
+
+
+# Facts about this particular process, which a forked child may not share.
+PROCESS_FACTS = frozenset({
+    "in_repl",
+    "interactive_terminal_is_available",
+    "is_likely_ci_or_non_interactive",
+    "is_running_in_uvicorn",
+})
+
+# Facts about the running program (sys.argv[0]); a child running another
+# program must not adopt them from its parent.
+PROGRAM_FACTS = frozenset({
+    "is_elf",
+    "is_pyz",
+    "is_windows_portable_executable",
+    "is_macos_executable",
+    "is_pipx",
+    "is_python_script",
+})
+
+# Variables read by facts outside HOST_FACTS, folded into fingerprint().
+_FINGERPRINT_ENV = ("DISPLAY", "WAYLAND_DISPLAY", "BROWSER", "MPLBACKEND", "PYTHONPATH", "PIPX_HOME", "PIPX_BIN_DIR")
+
+# What prewarm() computes: host facts plus the fork-safe interpreter and
+# build facts. tkinter_is_available and matplotlib_is_available_for_gui_plotting
+# are left out on purpose: they open a display connection (and start Tcl),
+# which a forked child must not inherit, so each worker probes them itself.
+PREWARM_FACTS = tuple(HOST_FACTS) + (
+    "on_pydroid",
+    "as_pyinstaller",
+    "as_frozen",
+    "is_msix",
+    "get_interp_shebang",
+    "can_spawn_shell",
+    "matplotlib_is_available_for_headless_image_export",
+    "web_browser_is_available",
+    "is_elf",
+    "is_pyz",
+    "is_windows_portable_executable",
+    "is_macos_executable",
+    "is_pipx",
+    "is_python_script",
+)
+
+
+def env_digest(names: Iterable[str], environ=None) -> str:
+    """
+    Hash of the environment variables the given host facts read. Two
+    processes with the same digest get the same answers for those facts.
+    """
+    import hashlib
+
+    environ = os.environ if environ is None else environ
+    keys = sorted({key for name in names for key in HOST_FACTS.get(name, ())})
+    text = "\0".join(f"{key}={environ.get(key, '')}" if key in environ else key for key in keys)
+    return hashlib.sha1(text.encode("utf-8", "surrogateescape")).hexdigest()[:16]
+
+
+# Every live snapshot, so a forked child can drop their per-process facts.
+_snapshots: "weakref.WeakSet[HabitatSnapshot]" = weakref.WeakSet()
+
+
+def fingerprint(environ=None) -> str:
+    """
+    Identity of the context facts were computed in: the boot (Linux boot_id),
+    the interpreter, the pyhabitat version, and every environment variable
+    a handed-off fact depends on. Differs across reboots, venvs and shells
+    with a different DISPLAY, PATH and so on.
+    """
+    import hashlib
+    import sys
+
+    from ._version import __version__
+
+    environ = os.environ if environ is None else environ
+    try:
+        with open("/proc/sys/kernel/random/boot_id") as f:
+            boot_id = f.read().strip()
+    except OSError:
+        boot_id = ""
+    keys = sorted({key for keys in HOST_FACTS.values() for key in keys} | set(_FINGERPRINT_ENV))
+    parts = [boot_id, sys.executable or "", sys.version, sys.prefix, __version__]
+    parts += [f"{key}={environ[key]}" if key in environ else key for key in keys]
+    return hashlib.sha1("\0".join(parts).encode("utf-8", "surrogateescape")).hexdigest()[:16]
+
+
+class HabitatSnapshot:
+    """Memoized results of pyhabitat facts, keyed by name and arguments."""
+
+    def __init__(self):
+        self._values: dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+        _snapshots.add(self)
+
+    @staticmethod
+    def _key(name: str, kwargs: dict) -> tuple:
+        return (name, tuple(sorted(kwargs.items())))
+
+    @staticmethod
+    def _resolve(name: str):
+        import pyhabitat
+
+        if name not in pyhabitat.__all__ or name.startswith("_"):
+            raise KeyError(f"pyhabitat has no fact named {name!r}")
+        func = getattr(pyhabitat, name)
+        if not callable(func):
+            raise KeyError(f"pyhabitat.{name} is not callable")
+        return func
+
+    def fact(self, name: str, **kwargs) -> Any:
+        """Value of pyhabitat.<name>(**kwargs), computed once per argument set."""
+        key = self._key(name, kwargs)
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+        value = self._resolve(name)(**kwargs)
+        with self._lock:
+            return self._values.setdefault(key, value)
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return (name, ()) in self._values
+
+    def invalidate(self, *names: str) -> None:
+        """Forget the given facts (all argument sets), or everything if none are named."""
+        with self._lock:
+            if not names:
+                self._values.clear()
+                return
+            for key in [k for k in self._values if k[0] in names]:
+                del self._values[key]
+
+    def _after_fork(self) -> None:
+        # Another thread may have held the lock at fork time; it no longer exists.
+        self._lock = threading.Lock()
+        for key in [k for k in self._values if k[0] in PROCESS_FACTS]:
+            del self._values[key]
+
+    def dumps(self, environ=None) -> str:
+        """
+        Compact JSON of the zero-argument facts a child process may adopt
+        (not PROCESS_FACTS or PROGRAM_FACTS), stamped with the fingerprint()
+        of environ: the environment the child will run with (default: ours).
+        """
+        import json
+
+        shareable = {
+            name: value for name, value in self.to_dict().items()
+            if name not in PROCESS_FACTS and name not in PROGRAM_FACTS
+            and (value is None or isinstance(value, (bool, int, float, str)))
+        }
+        return json.dumps(
+            {"v": _FORMAT_VERSION, "fp": fingerprint(environ), "facts": shareable},
+            separators=(",", ":"), sort_keys=True,
+        )
+
+    def adopt(self, data: str) -> int:
+        """
+        Take the facts from dumps() output if its fingerprint matches this
+        process; return how many were adopted (0 if stale or unreadable).
+        Facts already computed here are kept.
+        """
+        import json
+
+        try:
+            payload = json.loads(data)
+            if payload.get("v") != _FORMAT_VERSION or payload.get("fp") != fingerprint():
+                return 0
+            facts = dict(payload["facts"])
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return 0
+        adopted = 0
+        with self._lock:
+            for name, value in facts.items():
+                if name in PROCESS_FACTS or name in PROGRAM_FACTS or (name, ()) in self._values:
+                    continue
+                self._values[(name, ())] = value
+                adopted += 1
+        return adopted
+
+    def to_dict(self) -> dict[str, Any]:
+        """The zero-argument facts evaluated so far."""
+        with self._lock:
+            return {name: value for (name, args), value in self._values.items() if not args}
+
+    def __repr__(self) -> str:
+        with self._lock:
+            return f"<HabitatSnapshot {len(self._values)} facts>"
+
+
+@cache
+def default_snapshot() -> HabitatSnapshot:
+    """The process-wide snapshot used by the CLI, seeded from PYHABITAT_FACTS if valid."""
+    snapshot = HabitatSnapshot()
+    data = _inherited_facts()
+    if data:
+        adopted = snapshot.adopt(data)
+        if adopted:
+            logger.debug("Adopted %d facts from %s", adopted, FACTS_ENV_VAR)
+        else:
+            logger.debug("Ignoring stale or empty %s", FACTS_ENV_VAR)
+    return snapshot
+
+
+def prewarm(names: Optional[Iterable[str]] = None, snapshot: Optional[HabitatSnapshot] = None) -> HabitatSnapshot:
+    """
+    Compute PREWARM_FACTS (or names) now, typically in a prefork server's
+    master before it forks workers. Facts that raise are skipped.
+    """
+    snapshot = snapshot if snapshot is not None else default_snapshot()
+    for name in PREWARM_FACTS if names is None else names:
+        try:
+            snapshot.fact(name)
+        except Exception as e:
+            logger.debug("prewarm: %s failed: %s", name, e)
+    return snapshot
+
+
+def _inherited_facts() -> Optional[str]:
+    """PYHABITAT_FACTS: the JSON itself, or "fd:<n>" naming an inherited descriptor."""
+    value = os.environ.get(FACTS_ENV_VAR)
+    if not value or not value.startswith("fd:"):
+        return value
+    try:
+        fd = int(value[3:])
+        # pread: children share the descriptor's offset, so never move it.
+        return os.pread(fd, os.fstat(fd).st_size, 0).decode("utf-8")
+    except (ValueError, OSError, AttributeError, UnicodeDecodeError):
+        return None
+
+
+def export_facts(snapshot: Optional[HabitatSnapshot] = None, env: Optional[dict] = None) -> dict:
+    """
+    Put snapshot.dumps() (default: default_snapshot()) into env[PYHABITAT_FACTS]
+    and return env. The default env is os.environ, so every child started
+    afterwards inherits the facts.
+    """
+    snapshot = snapshot if snapshot is not None else default_snapshot()
+    env = os.environ if env is None else env
+    env[FACTS_ENV_VAR] = snapshot.dumps(env)
+    return env
+
+
+def export_facts_fd(snapshot: Optional[HabitatSnapshot] = None, env: Optional[dict] = None) -> int:
+    """
+    Like export_facts(), but write the facts to an unlinked, inheritable
+    temporary file and set PYHABITAT_FACTS to "fd:<n>". Returns n, which the
+    caller passes on (e.g. Popen(pass_fds=(n,))) and closes when done.
+    Useful when the facts are too large for comfort in an environment block.
+    POSIX only.
+    """
+    import tempfile
+
+    snapshot = snapshot if snapshot is not None else default_snapshot()
+    env = os.environ if env is None else env
+    descriptor, path = tempfile.mkstemp(prefix="pyhabitat-facts-")
+    try:
+        os.unlink(path)
+        os.write(descriptor, snapshot.dumps(env).encode("utf-8"))
+        os.set_inheritable(descriptor, True)
+    except OSError:
+        os.close(descriptor)
+        raise
+    env[FACTS_ENV_VAR] = f"fd:{descriptor}"
+    return descriptor
+
+
+def _after_fork_in_child() -> None:
+    for snapshot in list(_snapshots):
+        snapshot._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,338 @@
+"""
+pyhabitat.supervisor
+
+Track the child processes pyhabitat spawns (editors, file managers,
+browsers, the servedirs server) and reap them in the background, so
+long-running services that call launch helpers do not collect zombies.
+
+A helper thread waits on Linux pidfds where available (exit is noticed
+immediately) and otherwise polls each tracked child with Popen.poll(),
+i.e. waitpid(pid, WNOHANG). It never calls waitpid(-1) and installs no
+SIGCHLD handler, so children started elsewhere with subprocess.run() are
+left alone. The thread exits when nothing is left to watch.
+
+Typical usage
+-------------
+
+    from pyhabitat import supervisor
+
+    proc = supervisor.spawn(["xdg-open", "report.pdf"])
+
+    for child in supervisor.records():
+        print(child.pid, child.returncode, child.duration)
+
+From a coroutine, spawn_async() starts the child with
+asyncio.create_subprocess_exec() and returns a LaunchHandle that can be
+awaited for the exit code or cancelled to terminate the child.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    'ChildRecord',
+    'ProcessSupervisor',
+    'get_supervisor',
+    'spawn',
+    'children',
+    'records',
+    'LaunchHandle',
+    'spawn_async',
+]
+
+
+class ChildRecord:
+    """A spawned child: its Popen handle, command, exit code and timings."""
+
+    __slots__ = ("process", "args", "started", "ended", "terminate_on_exit", "pidfd")
+
+    def __init__(self, process: subprocess.Popen, args, terminate_on_exit: bool = False):
+        self.process = process
+        self.args = args
+        self.started = time.monotonic()
+        self.ended: Optional[float] = None
+        self.terminate_on_exit = terminate_on_exit
+        self.pidfd: Optional[int] = None
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    @property
+    def returncode(self) -> Optional[int]:
+        return self.process.returncode
+
+    @property
+    def running(self) -> bool:
+        return self.ended is None
+
+    @property
+    def duration(self) -> float:
+        """Seconds from spawn until exit (or until now, while running)."""
+        return (self.ended if self.ended is not None else time.monotonic()) - self.started
+
+    def to_dict(self) -> dict:
+        return {
+            "pid": self.pid,
+            "args": [str(arg) for arg in self.args] if isinstance(self.args, (list, tuple)) else str(self.args),
+            "running": self.running,
+            "returncode": self.returncode,
+            "duration": round(self.duration, 3),
+        }
+
+    def __repr__(self) -> str:
+        state = "running" if self.running else f"exited {self.returncode}"
+        return f"<ChildRecord pid={self.pid} {state} {self.duration:.2f}s>"
+
+
+class ProcessSupervisor:
+    """Spawn, track and reap child processes without blocking the caller."""
+
+    def __init__(self, poll_interval: float = 0.5, history: int = 256):
+        self.poll_interval = poll_interval
+        self._live: list[ChildRecord] = []
+        self._finished: deque[ChildRecord] = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._pid = os.getpid()
+
+    # --- tracking ---
+
+    def spawn(self, args: Sequence[str] | str, *, terminate_on_exit: bool = False, **popen_kwargs) -> subprocess.Popen:
+        """subprocess.Popen(args, **popen_kwargs), tracked until it exits."""
+        process = subprocess.Popen(args, **popen_kwargs)
+        self.adopt(process, args, terminate_on_exit=terminate_on_exit)
+        return process
+
+    def adopt(self, process: subprocess.Popen, args=None, *, terminate_on_exit: bool = False) -> ChildRecord:
+        """Track a Popen created elsewhere."""
+        record = ChildRecord(process, process.args if args is None else args, terminate_on_exit)
+        if hasattr(os, "pidfd_open"):
+            try:
+                record.pidfd = os.pidfd_open(process.pid)
+            except OSError:
+                pass # kernel < 5.3, or the child already exited
+        with self._lock:
+            self._live.append(record)
+            self._ensure_thread()
+        return record
+
+    def children(self) -> list[ChildRecord]:
+        """Records of children that are still running."""
+        with self._lock:
+            return list(self._live)
+
+    def records(self) -> list[ChildRecord]:
+        """Running children followed by the most recently exited ones."""
+        with self._lock:
+            return list(self._live) + list(self._finished)
+
+    def reap(self) -> int:
+        """Collect every tracked child that has exited; return how many were reaped."""
+        with self._lock:
+            live = list(self._live)
+        reaped = []
+        for record in live:
+            if record.process.poll() is None:
+                continue
+            # The helper thread, callers and atexit may all reap at once: the
+            # thread that removes the record from _live owns it and closes its
+            # pidfd, exactly once.
+            with self._lock:
+                if record not in self._live:
+                    continue
+                self._live.remove(record)
+                record.ended = time.monotonic()
+                if record.pidfd is not None:
+                    os.close(record.pidfd)
+                    record.pidfd = None
+                self._finished.append(record)
+            reaped.append(record)
+        for record in reaped:
+            logger.debug("Reaped pid %s (exit %s) after %.2fs", record.pid, record.returncode, record.duration)
+        return len(reaped)
+
+    # --- helper thread ---
+
+    def _ensure_thread(self) -> None:
+        # Called with self._lock held.
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True, name="pyhabitat-supervisor")
+            self._thread.start()
+
+    def _wait_for_exit(self, pidfds: list[int]) -> None:
+        if pidfds:
+            import select
+            poller = select.poll()
+            for fd in pidfds:
+                poller.register(fd, select.POLLIN)
+            poller.poll(self.poll_interval * 1000)
+        else:
+            self._stopping.wait(self.poll_interval)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            with self._lock:
+                live = list(self._live)
+                if not live:
+                    self._thread = None
+                    return
+                # Poll duplicates: a concurrent reap() may close a record's
+                # pidfd, and its number may then be reused for another file.
+                pidfds = []
+                if all(record.pidfd is not None for record in live):
+                    pidfds = [os.dup(record.pidfd) for record in live]
+            try:
+                self._wait_for_exit(pidfds)
+            finally:
+                for fd in pidfds:
+                    os.close(fd)
+            self.reap()
+
+    def shutdown(self, timeout: float = 2.0) -> None:
+        """
+        Stop the helper thread, terminate children spawned with
+        terminate_on_exit=True, and reap whatever has exited. Other children
+        (editors, file managers) are left running. Registered with atexit.
+        Does nothing in a forked child, whose parent still owns the children.
+        """
+        if os.getpid() != self._pid:
+            return
+        self._stopping.set()
+        for record in self.children():
+            if record.terminate_on_exit and record.process.poll() is None:
+                record.process.terminate()
+                try:
+                    record.process.wait(timeout)
+                except subprocess.TimeoutExpired:
+                    record.process.kill()
+        self.reap()
+
+
+_supervisor: Optional[ProcessSupervisor] = None
+_supervisor_lock = threading.Lock()
+
+
+def get_supervisor() -> ProcessSupervisor:
+    """The process-wide supervisor used by pyhabitat's launch helpers."""
+    global _supervisor
+    with _supervisor_lock:
+        if _supervisor is None:
+            _supervisor = ProcessSupervisor()
+            atexit.register(_supervisor.shutdown)
+        return _supervisor
+
+
+def _after_fork_in_child() -> None:
+    # The parent's children are not ours to wait for, and its helper thread
+    # did not survive the fork; start over with a fresh supervisor on demand.
+    global _supervisor, _supervisor_lock
+    _supervisor = None
+    _supervisor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def spawn(args: Sequence[str] | str, *, terminate_on_exit: bool = False, **popen_kwargs) -> subprocess.Popen:
+    """Start a tracked child process on the process-wide supervisor."""
+    return get_supervisor().spawn(args, terminate_on_exit=terminate_on_exit, **popen_kwargs)
+
+
+def children() -> list[ChildRecord]:
+    """Tracked children that are still running."""
+    return get_supervisor().children()
+
+
+def records() -> list[ChildRecord]:
+    """Tracked children, running and recently exited, with exit codes and durations."""
+    return get_supervisor().records()
+
+
+class LaunchHandle:
+    """
+    Awaitable handle for a child started by the async launch helpers.
+
+    ``await handle`` waits for the child to exit and returns its exit code.
+    cancel() terminates a child that is still running. Cancelling the task
+    that awaits the handle does not touch the child, so wrapping it in
+    asyncio.wait_for() never kills an editor the user is still typing in.
+
+    Launches handed straight to the OS (os.startfile, webbrowser) have no
+    process to follow; for those, await returns None immediately.
+    """
+
+    __slots__ = ("args", "process", "started", "ended")
+
+    def __init__(self, args, process=None):
+        self.args = args
+        self.process = process
+        self.started = time.monotonic()
+        self.ended: Optional[float] = None if process is not None else self.started
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.process is not None else None
+
+    @property
+    def returncode(self) -> Optional[int]:
+        return self.process.returncode if self.process is not None else None
+
+    @property
+    def running(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    @property
+    def duration(self) -> float:
+        return (self.ended if self.ended is not None else time.monotonic()) - self.started
+
+    async def wait(self) -> Optional[int]:
+        if self.process is None:
+            return None
+        returncode = await self.process.wait()
+        if self.ended is None:
+            self.ended = time.monotonic()
+        return returncode
+
+    def __await__(self):
+        return self.wait().__await__()
+
+    def cancel(self) -> bool:
+        """Terminate the child if it is still running; True if it was signalled."""
+        if not self.running:
+            return False
+        try:
+            self.process.terminate()
+        except ProcessLookupError:
+            return False
+        return True
+
+    def __repr__(self) -> str:
+        if self.process is None:
+            return f"<LaunchHandle {self.args!r} handed off>"
+        state = "running" if self.running else f"exited {self.returncode}"
+        return f"<LaunchHandle pid={self.pid} {state}>"
+
+
+async def spawn_async(args: Sequence[str], **kwargs) -> LaunchHandle:
+    """
+    asyncio.create_subprocess_exec(*args, **kwargs) wrapped in a LaunchHandle.
+    The event loop's child watcher reaps the process.
+    """
+    import asyncio
+
+    process = await asyncio.create_subprocess_exec(*[str(arg) for arg in args], **kwargs)
+    return LaunchHandle(list(args), process)
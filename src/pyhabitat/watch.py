@@ -0,0 +1,315 @@
+"""
+pyhabitat.watch
+
+Follow the facts that change while a process runs (a display attached after
+boot, a terminal detached, a network share mounted, a branch checked out)
+and report only what changed.
+
+Each fact has a cheap signature (a stat, an isatty) and a value that is
+recomputed only when the signature moves. On Linux the mount table is
+watched by polling /proc/self/mountinfo, which the kernel wakes on every
+mount and unmount; between wakeups the loop sleeps for `interval`.
+
+    from pyhabitat.watch import watch
+
+    def changed(diff):
+        if "display" in diff:
+            print("display is now", diff["display"]["new"])
+
+    watch(changed, interval=2.0)        # blocks; pass stop=threading.Event()
+
+`pyhabitat watch` prints the same diffs as JSON lines. The first line holds
+every fact with "old": null.
+
+Facts
+-----
+
+display  X11 sockets in /tmp/.X11-unix and Wayland sockets in $XDG_RUNTIME_DIR
+tty      whether stdin, stdout and stderr are terminals
+mounts   network filesystems (NFS, CIFS/SMB, sshfs, ...) by mount point
+git      branch and HEAD commit of the repository containing the working
+         directory, read from .git without running git. Uncommitted
+         working-tree edits are not tracked, as that would need a full scan.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Optional
+
+__all__ = [
+    'watch',
+    'run_watch',
+    'Watcher',
+    'FACTS',
+    'NETWORK_FS_TYPES',
+]
+
+FACTS = ("display", "tty", "mounts", "git")
+
+NETWORK_FS_TYPES = frozenset({
+    "nfs", "nfs4", "cifs", "smb3", "smbfs", "afs", "ceph", "glusterfs",
+    "9p", "fuse.sshfs", "fuse.davfs", "fuse.rclone", "fuse.s3fs", "fuse.glusterfs",
+})
+
+_MOUNTINFO = "/proc/self/mountinfo"
+_X11_DIR = "/tmp/.X11-unix"
+
+
+def _stat_key(path: str) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+# --- display ---
+
+def _display_signature() -> tuple:
+    return (_stat_key(_X11_DIR), _stat_key(os.environ.get("XDG_RUNTIME_DIR") or "/nonexistent"))
+
+
+def _display_value() -> dict:
+    try:
+        x11 = sorted(":" + name[1:] for name in os.listdir(_X11_DIR) if name.startswith("X"))
+    except OSError:
+        x11 = []
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    try:
+        wayland = sorted(
+            name for name in os.listdir(runtime_dir)
+            if name.startswith("wayland-") and not name.endswith(".lock")
+        ) if runtime_dir else []
+    except OSError:
+        wayland = []
+    return {"x11": x11, "wayland": wayland}
+
+
+# --- tty ---
+
+def _tty_value() -> dict:
+    def isatty(stream) -> bool:
+        try:
+            return stream is not None and stream.isatty()
+        except (ValueError, OSError):  # closed or detached
+            return False
+    return {"stdin": isatty(sys.stdin), "stdout": isatty(sys.stdout), "stderr": isatty(sys.stderr)}
+
+
+# --- network mounts ---
+
+def _mounts_value() -> dict:
+    from .wslpath import _unescape
+
+    mounts = {}
+    try:
+        with open(_MOUNTINFO, encoding="utf-8", errors="replace") as f:
+            text = f.read()
+    except OSError:
+        return mounts
+    for line in text.splitlines():
+        fields = line.split()
+        if "-" not in fields:
+            continue
+        sep = fields.index("-")
+        if sep < 5 or len(fields) < sep + 3:
+            continue
+        fstype = fields[sep + 1]
+        if fstype in NETWORK_FS_TYPES and not (fstype == "9p" and "aname=drvfs" in line):
+            mounts[_unescape(fields[4])] = {"type": fstype, "source": _unescape(fields[sep + 2])}
+    return mounts
+
+
+# --- git ---
+
+def _git_dir(start: str) -> Optional[str]:
+    path = os.path.abspath(start)
+    while True:
+        candidate = os.path.join(path, ".git")
+        if os.path.isdir(candidate):
+            return candidate
+        if os.path.isfile(candidate):  # worktrees and submodules: "gitdir: <path>"
+            try:
+                with open(candidate, encoding="utf-8") as f:
+                    text = f.read().strip()
+            except OSError:
+                return None
+            if text.startswith("gitdir:"):
+                return os.path.normpath(os.path.join(path, text[len("gitdir:"):].strip()))
+            return None
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _common_dir(git_dir: str) -> str:
+    common = _read(os.path.join(git_dir, "commondir"))
+    return os.path.normpath(os.path.join(git_dir, common)) if common else git_dir
+
+
+def _git_signature() -> tuple:
+    git_dir = _git_dir(os.getcwd())
+    if git_dir is None:
+        return (None,)
+    head = _read(os.path.join(git_dir, "HEAD")) or ""
+    common = _common_dir(git_dir)
+    ref_path = os.path.join(common, head[5:].strip()) if head.startswith("ref:") else None
+    return (
+        git_dir, head,
+        _stat_key(ref_path) if ref_path else None,
+        _stat_key(os.path.join(common, "packed-refs")),
+    )
+
+
+def _git_value() -> Optional[dict]:
+    git_dir = _git_dir(os.getcwd())
+    if git_dir is None:
+        return None
+    head = _read(os.path.join(git_dir, "HEAD")) or ""
+    if not head.startswith("ref:"):
+        return {"branch": None, "head": head or None}
+    ref = head[4:].strip()
+    common = _common_dir(git_dir)
+    commit = _read(os.path.join(common, ref))
+    if commit is None:
+        for line in (_read(os.path.join(common, "packed-refs")) or "").splitlines():
+            sha, _, name = line.partition(" ")
+            if name == ref:
+                commit = sha
+                break
+    branch = ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ref
+    return {"branch": branch, "head": commit}
+
+
+# fact -> (signature or None to recompute every tick, value)
+_PROBES: dict[str, tuple[Optional[Callable[[], Any]], Callable[[], Any]]] = {
+    "display": (_display_signature, _display_value),
+    "tty": (None, _tty_value),
+    "mounts": (None, _mounts_value),  # signature comes from the mountinfo poller
+    "git": (_git_signature, _git_value),
+}
+
+
+class Watcher:
+    """
+    Holds the last signature and value of each fact. poll() returns the
+    facts whose values changed since the previous call, as
+    {fact: {"old": ..., "new": ...}}.
+    """
+
+    def __init__(self, facts=FACTS):
+        unknown = set(facts) - set(_PROBES)
+        if unknown:
+            raise ValueError(f"unknown facts: {', '.join(sorted(unknown))}")
+        self.facts = tuple(facts)
+        self._signatures: dict[str, Any] = {}
+        self._values: dict[str, Any] = {}
+        self._mount_generation = 0
+        self._mountinfo = None
+        self._poller = None
+        if "mounts" in self.facts:
+            self._open_mountinfo()
+
+    def _open_mountinfo(self) -> None:
+        import select
+
+        if not hasattr(select, "poll"):
+            return
+        try:
+            self._mountinfo = open(_MOUNTINFO, "rb")
+        except OSError:
+            return
+        self._poller = select.poll()
+        self._poller.register(self._mountinfo.fileno(), select.POLLPRI | select.POLLERR)
+
+    def close(self) -> None:
+        if self._mountinfo is not None:
+            self._mountinfo.close()
+            self._mountinfo = self._poller = None
+
+    def wait(self, timeout: float) -> None:
+        """Sleep up to timeout seconds, waking early if the mount table changes."""
+        if self._poller is None:
+            time.sleep(timeout)
+            return
+        # The kernel reports POLLPRI once per change of the mount namespace.
+        if self._poller.poll(timeout * 1000):
+            self._mount_generation += 1
+
+    def _signature(self, fact: str):
+        signature_fn, _ = _PROBES[fact]
+        if fact == "mounts" and self._poller is not None:
+            return self._mount_generation
+        return signature_fn() if signature_fn is not None else object()
+
+    def poll(self) -> dict[str, dict]:
+        changes = {}
+        for fact in self.facts:
+            signature = self._signature(fact)
+            if fact in self._signatures and signature == self._signatures[fact]:
+                continue
+            self._signatures[fact] = signature
+            value = _PROBES[fact][1]()
+            old = self._values.get(fact)
+            if fact not in self._values or value != old:
+                self._values[fact] = value
+                changes[fact] = {"old": old, "new": value}
+        return changes
+
+    @property
+    def values(self) -> dict[str, Any]:
+        return dict(self._values)
+
+
+def watch(
+    callback: Callable[[dict], Any],
+    interval: float = 2.0,
+    facts=FACTS,
+    stop: Optional[threading.Event] = None,
+) -> None:
+    """
+    Call callback(diff) with the initial values and then with every change,
+    until stop is set (checked once per interval) or callback raises.
+    """
+    watcher = Watcher(facts)
+    try:
+        while stop is None or not stop.is_set():
+            changes = watcher.poll()
+            if changes:
+                callback(changes)
+            watcher.wait(interval)
+    finally:
+        watcher.close()
+
+
+def run_watch(facts=FACTS, interval: float = 2.0) -> int:
+    """`pyhabitat watch`: print each diff as one JSON line until interrupted."""
+    def emit(changes: dict) -> None:
+        sys.stdout.write(json.dumps({"time": round(time.time(), 3), "changes": changes}) + "\n")
+        sys.stdout.flush()
+
+    try:
+        watch(emit, interval=interval, facts=facts or FACTS)
+    except ValueError as e:
+        print(f"pyhabitat watch: {e}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        pass
+    except BrokenPipeError:
+        # Reader went away (e.g. `pyhabitat watch | head`).
+        return 0
+    return 0
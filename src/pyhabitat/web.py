@@ -18,7 +18,7 @@ Typical usage
 
         url = f"http://127.0.0.1:{port}/"
 
-        launch_browser_after_http_poll(url)
+        launch_browser_after_http_poll(url)  # returns a Future immediately
 
         httpd.serve_forever()
 
@@ -31,29 +31,34 @@ from __future__ import annotations
 import logging
 import os
 import shutil
-import socket
 import subprocess
 import threading
-import time
-import urllib.request
-import webbrowser
-import urllib.error
 from urllib.parse import urlparse, quote
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from .environment import on_wsl, on_termux, on_linux
+from .supervisor import LaunchHandle, spawn, spawn_async
+
+if TYPE_CHECKING:
+    import socket
+    from concurrent.futures import Future
 
 logger = logging.getLogger(__name__)
 
 __all__ = [
     'launch_browser_after_http_poll',
     'launch_browser_now',
+    'launch_browser_now_async',
     'find_open_port',
+    'reserve_port',
+    'reserve_ports',
+    'PortReservation',
     'browse_directory',
     'serve_file',
     'serve_directory',
+    'unmount_directory',
     'shutdown_server',
     'wait_for_server_shutdown',
 ]
@@ -61,6 +66,137 @@ __all__ = [
 # ----------------------------------------------------------------------
 # Port utilities
 # ----------------------------------------------------------------------
+# In-process reservation table: (host, port) pairs held by a PortReservation.
+# Consulted by every allocator here, so concurrent threads never hand out
+# the same port even before anything is listening on it.
+_reserved_ports: set[tuple[str, int]] = set()
+_reserved_lock = threading.Lock()
+
+
+class PortReservation:
+    """
+    A TCP port held open by a bound, not-yet-listening socket.
+
+    Keep it until the server starts, then hand the socket itself over with
+    detach() (e.g. to servedirs.ServedirsServer(sock=...)), so nothing can
+    grab the port between "found" and "listening". release() gives it back.
+    """
+
+    __slots__ = ("host", "port", "_sock")
+
+    def __init__(self, sock: socket.socket, host: str, port: int):
+        self._sock = sock
+        self.host = host
+        self.port = port
+
+    @property
+    def socket(self) -> socket.socket | None:
+        return self._sock
+
+    def fileno(self) -> int:
+        return self._sock.fileno()
+
+    def detach(self) -> socket.socket:
+        """Hand the bound socket to its new owner and drop it from the table."""
+        sock, self._sock = self._sock, None
+        if sock is None:
+            raise RuntimeError(f"Reservation for port {self.port} was already released.")
+        with _reserved_lock:
+            _reserved_ports.discard((self.host, self.port))
+        return sock
+
+    def release(self) -> None:
+        """Close the socket (if still held) and free the port."""
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            sock.close()
+            with _reserved_lock:
+                _reserved_ports.discard((self.host, self.port))
+
+    def __enter__(self) -> PortReservation:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+    def __repr__(self) -> str:
+        state = "held" if self._sock is not None else "released"
+        return f"PortReservation(host={self.host!r}, port={self.port}, {state})"
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    import socket
+
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    # No SO_REUSEADDR: on Linux two SO_REUSEADDR sockets may share a port
+    # until one listens, which would defeat the reservation.
+    try:
+        sock.bind((host, port))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def reserve_port(
+    start_port: int = 0,
+    host: str = "127.0.0.1",
+    max_attempts: int = 100,
+) -> PortReservation:
+    """
+    Reserve a TCP port by keeping a socket bound to it.
+
+    If start_port==0, the operating system chooses an ephemeral port.
+    Otherwise search upward from start_port, skipping ports already
+    reserved in this process without even trying to bind them.
+    """
+    with _reserved_lock:
+        if start_port == 0:
+            sock = _bind(host, 0)
+            port = sock.getsockname()[1]
+            _reserved_ports.add((host, port))
+            return PortReservation(sock, host, port)
+
+        for attempt in range(max_attempts):
+            port = start_port + attempt
+            if (host, port) in _reserved_ports:
+                continue
+            try:
+                sock = _bind(host, port)
+            except OSError:
+                continue
+            _reserved_ports.add((host, port))
+            return PortReservation(sock, host, port)
+
+    raise RuntimeError(f"Could not reserve a port starting from {start_port} within {max_attempts} tries.")
+
+
+def reserve_ports(
+    count: int,
+    start_port: int = 0,
+    host: str = "127.0.0.1",
+    max_attempts: int = 100,
+) -> list[PortReservation]:
+    """
+    Reserve count ports in one call, e.g. for a multi-service launch.
+    All-or-nothing: on failure every port reserved so far is released.
+    """
+    reservations = []
+    try:
+        next_port = start_port
+        for _ in range(count):
+            reservation = reserve_port(next_port, host, max_attempts)
+            reservations.append(reservation)
+            if start_port:
+                next_port = reservation.port + 1
+    except Exception:
+        for reservation in reservations:
+            reservation.release()
+        raise
+    return reservations
+
+
 def find_open_port(
     start_port: int = 0,
     host: str = "127.0.0.1",
@@ -71,23 +207,13 @@ def find_open_port(
 
     If start_port==0, let the operating system choose an ephemeral port.
     Otherwise search upward from start.
-    """
 
-    if start_port == 0:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-            sock.bind((host, 0))
-            return sock.getsockname()[1]
-
-    #while True:
-    for attempt in range(max_attempts):
-        port = start_port + attempt
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-            try:
-                sock.bind((host, port))
-                return port
-            except OSError:
-                continue
-    raise RuntimeError(f"Could not find an open port starting from {start_port} within {max_attempts} tries.")
+    The port is free when this returns but is not held; prefer reserve_port()
+    when the server runs in-process or can inherit the bound socket.
+    """
+    reservation = reserve_port(start_port, host, max_attempts)
+    reservation.release()
+    return reservation.port
 
 
 # ----------------------------------------------------------------------
@@ -99,37 +225,31 @@ def wait_until_http_ready(
     *,
     timeout: float = 5.0,
     poll_interval: float = 0.1,
+    health_path: Optional[str] = None,
 ) -> bool:
     """
-    Wait until an HTTP endpoint responds.
+    Wait until an HTTP endpoint is ready to take a browser.
+
+    Readiness means the port accepts TCP connections. Pass health_path to also
+    require an HTTP answer to a HEAD request there. A server that is up but
+    slow to render "/" no longer holds the caller until the timeout.
+    Retries back off exponentially (with jitter) from poll_interval.
+
+    See pyhabitat.readiness for the asyncio variant.
 
     Returns
     -------
     bool
         True if the endpoint became responsive before timeout.
     """
+    from .readiness import wait_until_ready
 
-    deadline = time.monotonic() + timeout
-
-    while time.monotonic() < deadline:
-
-        try:
-            with urllib.request.urlopen(url, timeout=1):
-                return True
-
-        except urllib.error.HTTPError:
-            # Server answered.
-            return True
-
-
-        except (
-            urllib.error.URLError,
-            TimeoutError,
-            ConnectionError,
-        ):
-            time.sleep(poll_interval)
-
-    return False
+    return wait_until_ready(
+        url,
+        timeout=timeout,
+        health_path=health_path,
+        initial_delay=poll_interval,
+    )
 
 
 # -----------------
@@ -203,72 +323,80 @@ def launch_browser_now(url: str) -> bool:
     """
     url = _prepare_url(url)
 
-    # --- Termux ---
-    termux_launcher = shutil.which("termux-open-url")
-    if on_termux() and termux_launcher:
-
+    for name, command, popen_kwargs in _browser_launchers(url):
         try:
-            subprocess.Popen(
-                ["termux-open-url", url],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
-
+            spawn(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **popen_kwargs)
             return True
-
         except Exception:
-            logger.exception("termux-open-url failed")
+            logger.exception("%s failed", name)
+
+    # --- Generic Python fallback ---
+    import webbrowser
+
+    try:
+        webbrowser.open_new_tab(url)
+        return True
+
+    except Exception:
+        logger.exception("webbrowser failed")
+        return False
+
+def _browser_launchers(url: str):
+    """Yield (name, argv, extra Popen kwargs) for each launcher that applies here, best first."""
+    # --- Termux ---
+    if on_termux() and shutil.which("termux-open-url"):
+        yield "termux-open-url", ["termux-open-url", url], {}
 
     # --- WSL / Windows Edge ---
     edge = shutil.which("microsoft-edge")
-    if on_wsl() and edge: #edge:
+    if on_wsl() and edge:
         env = os.environ.copy()
         env["CHROME_LOG_LEVEL"] = "3"
-        try:
-            subprocess.Popen(
-                [
-                    edge,
-                    url,
-                    "--no-first-run",
-                    "--quiet",
-                    "--disable-gpu",
-                    "--disable-software-rasterizer",
-                    "--disable-sync",
-                ],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                env=env,
-                start_new_session=True,
-            )
-            return True
-
-        except Exception:
-            logger.exception("microsoft-edge failed")
+        yield "microsoft-edge", [
+            edge,
+            url,
+            "--no-first-run",
+            "--quiet",
+            "--disable-gpu",
+            "--disable-software-rasterizer",
+            "--disable-sync",
+        ], {"env": env, "start_new_session": True}
 
     # --- Linux desktop ---
-    linux_launcher = shutil.which("xdg-open")
-    if on_linux() and linux_launcher:
+    if on_linux() and shutil.which("xdg-open"):
+        yield "xdg-open", ["xdg-open", url], {}
 
-        try:
-            subprocess.Popen(
-                ["xdg-open", url],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
+async def launch_browser_now_async(url: str) -> Optional[LaunchHandle]:
+    """
+    Async launch_browser_now(), for code running on an event loop.
 
-            return True
+    Returns
+    -------
+    LaunchHandle or None
+        Handle for the launcher process (await it for the exit code, or
+        cancel() it). The webbrowser-module fallback runs in the default
+        executor and yields a handle with no process. None if every
+        launcher failed.
+    """
+    import asyncio
+
+    url = _prepare_url(url)
 
+    for name, command, popen_kwargs in _browser_launchers(url):
+        try:
+            return await spawn_async(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **popen_kwargs)
         except Exception:
-            logger.exception("xdg-open failed")
+            logger.exception("%s failed", name)
 
-    # --- Generic Python fallback ---
-    try:
-        webbrowser.open_new_tab(url)
-        return True
+    import webbrowser
 
+    loop = asyncio.get_running_loop()
+    try:
+        if await loop.run_in_executor(None, webbrowser.open_new_tab, url):
+            return LaunchHandle(["webbrowser", url])
     except Exception:
         logger.exception("webbrowser failed")
-        return False
+    return None
 
 # ----------------------------------------------------------------------
 # Combined helper
@@ -279,19 +407,20 @@ def launch_browser_after_http_poll(
     *,
     timeout: float = 5.0,
     poll_interval: float = 0.1,
-) -> threading.Thread:
+) -> Future:
     """
-    Launch a daemon thread which waits for an HTTP server to become
-    responsive before opening the user's browser.
+    Open the user's browser as soon as a local HTTP server accepts connections.
 
-    Use case: Spinning up a local web app with consideration for thread management and polling.
+    Use case: Spinning up a local web app without arbitrary sleep() delays.
 
     Hypothetical alias names:
     - open_local_server_url(url)
     - launch_browser_after_http_poll(url)
     - launch_browser_when_ready(url)
     
-    This function returns immediately.
+    This function returns immediately. All pending calls share a single
+    selector-based watcher thread (see pyhabitat.readiness), so opening a
+    dozen local apps does not start a dozen polling threads.
 
     Parameters
     ----------
@@ -302,43 +431,36 @@ def launch_browser_after_http_poll(
         Maximum time to wait.
 
     poll_interval
-        Delay between connection attempts.
+        Initial delay between connection attempts (backs off from there).
 
     Returns
     -------
-    threading.Thread
-        The daemon thread performing the wait.
+    concurrent.futures.Future
+        Resolves to True once the browser was launched, or False on timeout.
     """
+    from .readiness import watch_until_ready
 
-    def worker():
-
-        if wait_until_http_ready(
-            url,
-            timeout=timeout,
-            poll_interval=poll_interval,
-        ):
-
-            logger.debug("Server ready: %s", url)
-
-            launch_browser_now(url)
-
-        else:
+    def on_ready(ready_url: str) -> None:
+        logger.debug("Server ready: %s", ready_url)
+        launch_browser_now(ready_url)
 
+    def on_done(future: Future) -> None:
+        if not future.cancelled() and future.exception() is None and not future.result():
             logger.warning(
                 "Timed out after %.1fs waiting for %s",
                 timeout,
                 url,
             )
 
-    thread = threading.Thread(
-        target=worker,
-        daemon=True,
-        name=f"launch-browser-when-ready: {url}",
+    future = watch_until_ready(
+        url,
+        timeout=timeout,
+        callback=on_ready,
+        initial_delay=poll_interval,
     )
+    future.add_done_callback(on_done)
 
-    thread.start()
-
-    return thread
+    return future
 
 def browse_directory(path, **kwargs):
 
@@ -351,21 +473,104 @@ def browse_directory(path, **kwargs):
 
 
 # Cache the active server so repeated calls don't spawn duplicates.
+# A single servedirs process serves the first directory at / and mounts every
+# later directory under /m/<name>/ through its local control API.
 _server: Optional[subprocess.Popen] = None
 _server_port: Optional[int] = None
 _server_root: Optional[Path] = None
-                                                   
+_server_host: Optional[str] = None
+_server_mounts: dict[Path, str] = {}
+# The mount control token servedirs generated, and until it is read, the
+# pipe it is written to (POSIX).
+_server_token: Optional[str] = None
+_server_token_fd: Optional[int] = None
+
+_TOKEN_HEADER = "X-Servedirs-Token"
+
+
+def _forget_token() -> None:
+    global _server_token, _server_token_fd
+    if _server_token_fd is not None:
+        try:
+            os.close(_server_token_fd)
+        except OSError:
+            pass
+    _server_token = _server_token_fd = None
+
+
+def _after_fork_in_child() -> None:
+    # The servedirs child belongs to the parent; from here Popen.poll() fails
+    # with ECHILD and reports it exited. Forget it, and any held lock.
+    global _server, _server_port, _server_root, _server_host, _server_mounts, _reserved_lock
+    _server = _server_port = _server_root = _server_host = None
+    _server_mounts = {}
+    _forget_token()
+    _reserved_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def _mount_name(directory: Path) -> str:
+    """Stable, URL-safe mount name for a directory, e.g. 'reports-1a2b3c4d'."""
+    import hashlib
+    import re
+    slug = re.sub(r"[^A-Za-z0-9._-]+", "-", directory.name).strip("-")[:40] or "root"
+    digest = hashlib.sha1(str(directory).encode("utf-8")).hexdigest()[:8]
+    return f"{slug}-{digest}"
+
+def _control_token(timeout: float = 5.0) -> str:
+    """The running servedirs process's mount control token, read once from its pipe."""
+    global _server_token, _server_token_fd
+    if _server_token is None and _server_token_fd is not None:
+        import select
+        fd, _server_token_fd = _server_token_fd, None
+        data = b""
+        try:
+            # servedirs writes the token before it starts listening.
+            while not data.endswith(b"\n") and select.select([fd], [], [], timeout)[0]:
+                chunk = os.read(fd, 256)
+                if not chunk:
+                    break
+                data += chunk
+        finally:
+            os.close(fd)
+        _server_token = data.decode("ascii", "replace").strip() or None
+    if not _server_token:
+        raise ConnectionError("servedirs did not report its mount control token")
+    return _server_token
+
+def _request_mount(base_url: str, name: str, directory: Path) -> str:
+    """Ask the running servedirs process to mount directory; return its URL."""
+    import json
+    import urllib.request
+    if not wait_until_http_ready(base_url, timeout=5.0):
+        raise ConnectionError(f"servedirs at {base_url} is not responding")
+    request = urllib.request.Request(
+        base_url + "api/mounts",
+        data=json.dumps({"name": name, "path": str(directory)}).encode("utf-8"),
+        headers={"Content-Type": "application/json", _TOKEN_HEADER: _control_token()},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=5) as response:
+        mounted = json.loads(response.read())
+    return base_url + mounted["url"].lstrip("/")
+
 def serve_directory(
     path: str | Path,                              
     *,
     host: str = "127.0.0.1",                       
     port: Optional[int] = None,
+    rate_limit: Optional[str] = None,
+    global_rate_limit: Optional[str] = None,
 ) -> str:                                          
     """
-    Serve a directory using Python's built-in HTTP server.
+    Serve a directory using pyhabitat's servedirs HTTP server.
 
-    Reuses an existing server if it is already serving the requested
-    directory.
+    One server process is shared by every call: the first directory is
+    served at the root URL and later directories are mounted at runtime
+    under /m/<name>/, so switching directories never respawns the server.
 
     Parameters
     ----------
@@ -375,6 +580,11 @@ def serve_directory(
         Interface to bind.
     port
         Optional fixed port. If omitted, a free port is chosen.
+    rate_limit
+        Optional per-connection bandwidth cap, e.g. "512K" or "2M" per second.
+    global_rate_limit
+        Optional bandwidth cap shared by all connections.
+        Both limits apply when the server is spawned, not to a reused server.
 
     Returns
     -------
@@ -382,7 +592,7 @@ def serve_directory(
         URL of the directory browser.
     """
 
-    global _server, _server_port, _server_root
+    global _server, _server_port, _server_root, _server_host, _server_token, _server_token_fd
 
     directory = path
     directory = Path(directory).expanduser().resolve()
@@ -394,42 +604,114 @@ def serve_directory(
     if (
         _server is not None
         and _server.poll() is None
-        and _server_root == directory
         and _server_port is not None
+        and _server_host == host
     ):
-        return f"http://{host}:{_server_port}/"
+        base_url = f"http://{host}:{_server_port}/"
+        if _server_root == directory:
+            return base_url
+        if directory in _server_mounts:
+            return base_url + f"m/{_server_mounts[directory]}/"
+        name = _mount_name(directory)
+        try:
+            url = _request_mount(base_url, name, directory)
+            _server_mounts[directory] = name
+            return url
+        except (OSError, ValueError, KeyError):  # URLError is an OSError
+            logger.warning("Could not mount %s on the running server; restarting it.", directory)
 
     # Stop previous server.
-    if _server is not None and _server.poll() is None:
-        _server.terminate()
-        try:
-            _server.wait(timeout=2)
-        except Exception:
-            _server.kill()
+    shutdown_server()
 
+    # Hand the spawned server an already-bound socket where the platform
+    # allows it, so the port cannot be taken between choosing and listening.
+    reservation = None
+    pass_fds = ()
     if port is None:
-        port = find_open_port(8000, host)
-    _server = subprocess.Popen(
-        [
-            sys.executable,
-            "-m",
-            "http.server",
-            str(port),
-            "--bind",
-            host,
-            "--directory",
-            str(directory),
-        ],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL,
-        start_new_session=True,
-    )
+        reservation = reserve_port(8000, host)
+        port = reservation.port
+        if os.name == "posix":
+            pass_fds = (reservation.fileno(),)
+        else:
+            reservation.release()
+    command = [
+        sys.executable,
+        "-m",
+        "pyhabitat.servedirs",
+        "--path",
+        str(directory),
+        "--host",
+        host,
+        "--port",
+        str(port),
+    ]
+    if rate_limit:
+        command += ["--rate-limit", str(rate_limit)]
+    if global_rate_limit:
+        command += ["--global-rate-limit", str(global_rate_limit)]
+    if pass_fds:
+        command += ["--fd", str(pass_fds[0])]
+
+    # servedirs guards its mount-control API with a random token. On POSIX it
+    # generates the token and writes it to a pipe; elsewhere we choose it and
+    # pass it in the environment.
+    env = None
+    token_fd = None
+    if os.name == "posix":
+        token_fd, token_write_fd = os.pipe()
+        pass_fds += (token_write_fd,)
+        command += ["--token-fd", str(token_write_fd)]
+    else:
+        import secrets
+        _server_token = secrets.token_urlsafe(32)
+        env = dict(os.environ, PYHABITAT_SERVEDIRS_TOKEN=_server_token)
+    try:
+        _server = spawn(
+            command,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            pass_fds=pass_fds,
+            env=env,
+        )
+    except BaseException:
+        if token_fd is not None:
+            os.close(token_fd)
+        _server_token = None
+        raise
+    finally:
+        if reservation is not None:
+            reservation.release() # the child holds its own copy of the socket
+        if token_fd is not None:
+            os.close(token_write_fd)
+    _server_token_fd = token_fd
 
     _server_root = directory
     _server_port = port
+    _server_host = host
 
     return f"http://{host}:{port}/"
 
+def unmount_directory(path: str | Path) -> bool:
+    """Remove a directory mounted by serve_directory() from the shared server."""
+    directory = Path(path).expanduser().resolve()
+    name = _server_mounts.get(directory)
+    if name is None or _server is None or _server.poll() is not None:
+        return False
+    import urllib.request
+    try:
+        request = urllib.request.Request(
+            f"http://{_server_host}:{_server_port}/api/mounts/{name}",
+            headers={_TOKEN_HEADER: _control_token()},
+            method="DELETE",
+        )
+        with urllib.request.urlopen(request, timeout=5):
+            pass
+    except OSError:  # includes urllib.error.URLError
+        return False
+    del _server_mounts[directory]
+    return True
+
 def serve_file(path:str | Path, *, host="127.0.0.1", port=None):
     path = Path(path).expanduser().resolve()
 
@@ -448,7 +730,7 @@ def serve_file(path:str | Path, *, host="127.0.0.1", port=None):
     return url
 
 def shutdown_server():
-    global _server, _server_port, _server_root
+    global _server, _server_port, _server_root, _server_host
 
     if _server is not None and _server.poll() is None:
         _server.terminate()
@@ -460,6 +742,9 @@ def shutdown_server():
     _server = None
     _server_port = None
     _server_root = None
+    _server_host = None
+    _server_mounts.clear()
+    _forget_token()
     
 
 def wait_for_server_shutdown():
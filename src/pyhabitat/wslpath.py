@@ -0,0 +1,192 @@
+"""
+pyhabitat.wslpath
+
+Translate paths between WSL and Windows in-process, instead of running
+`wslpath` once per path.
+
+The Windows drives mounted into the distro are read once from
+/proc/self/mountinfo: WSL1 `drvfs` mounts (source `C:\\`) and WSL2 9p mounts
+(`aname=drvfs;path=C:\\`). The automount root comes from the [automount]
+section of /etc/wsl.conf (default /mnt/) and covers drives that are not
+mounted yet. Linux paths outside any drive are exposed to Windows as
+\\\\wsl.localhost\\<distro>\\..., and both that and the older \\\\wsl$\\<distro>
+form are accepted on the way back.
+
+Everything takes its inputs as text, so translation can be tested anywhere
+with fixture mount tables:
+
+    translator = WslPathTranslator(mountinfo_text, wsl_conf_text, distro="Ubuntu")
+    translator.to_windows("/mnt/c/Users/me")   # 'C:\\Users\\me'
+    translator.to_linux("\\\\wsl$\\Ubuntu\\home")  # '/home'
+
+default_translator() builds one from the running system and caches it.
+"""
+
+from __future__ import annotations
+
+import configparser
+import ntpath
+import os
+import posixpath
+import re
+from typing import Iterable, Optional
+
+from ._compat import cache
+
+__all__ = [
+    'WslPathTranslator',
+    'default_translator',
+    'parse_mountinfo',
+]
+
+DEFAULT_AUTOMOUNT_ROOT = "/mnt/"
+UNC_HOSTS = ("wsl.localhost", "wsl$")
+
+_OCTAL_ESCAPE = re.compile(r"\\([0-7]{3})")
+_DRIVE_PATH = re.compile(r"^([A-Za-z]):(?:[\\/]|$)")
+
+
+def _unescape(field: str) -> str:
+    """mountinfo octal-escapes space, tab, newline and backslash (\\040, \\134 ...)."""
+    return _OCTAL_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), field)
+
+
+def parse_mountinfo(text: str) -> list[tuple[str, str]]:
+    """
+    (linux mount point, windows root) for every drvfs/9p-drvfs mount in a
+    /proc/self/mountinfo table, e.g. ('/mnt/c', 'C:\\').
+    """
+    mounts = []
+    for line in text.splitlines():
+        fields = line.split()
+        if "-" not in fields:
+            continue
+        sep = fields.index("-")
+        if sep < 5 or len(fields) < sep + 3:
+            continue
+        root, mount_point = _unescape(fields[3]), _unescape(fields[4])
+        fstype, source = fields[sep + 1], _unescape(fields[sep + 2])
+        options = _unescape(fields[sep + 3]) if len(fields) > sep + 3 else ""
+
+        windows = None
+        if fstype == "drvfs":
+            windows = source
+        elif fstype == "9p" and "aname=drvfs" in options:
+            for option in re.split(r"[,;]", options):
+                if option.startswith("path="):
+                    windows = option[len("path="):]
+                    break
+        if not windows or not _DRIVE_PATH.match(windows):
+            continue
+
+        windows = windows.replace("/", "\\")
+        if not windows.endswith("\\"):
+            windows += "\\"
+        if root not in ("", "/"):
+            windows += root.strip("/").replace("/", "\\") + "\\"
+        mounts.append((mount_point, windows))
+    return mounts
+
+
+def _automount_root(wsl_conf: str) -> str:
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    try:
+        parser.read_string(wsl_conf)
+        root = parser.get("automount", "root", fallback=DEFAULT_AUTOMOUNT_ROOT)
+    except configparser.Error:
+        root = DEFAULT_AUTOMOUNT_ROOT
+    root = root.strip().strip('"').strip("'") or DEFAULT_AUTOMOUNT_ROOT
+    return root if root.endswith("/") else root + "/"
+
+
+class WslPathTranslator:
+    """Pure-Python equivalent of `wslpath -w` / `wslpath -u` for one distro."""
+
+    def __init__(self, mountinfo: str = "", wsl_conf: str = "", distro: Optional[str] = None, unc_host: str = "wsl.localhost"):
+        self.automount_root = _automount_root(wsl_conf)
+        self.distro = distro
+        self.unc_host = unc_host
+        # Longest prefix first so nested mounts win over the drive they sit on.
+        self.mounts = sorted(parse_mountinfo(mountinfo), key=lambda m: len(m[0]), reverse=True)
+
+    @classmethod
+    def from_system(cls, mountinfo_path: str = "/proc/self/mountinfo", wsl_conf_path: str = "/etc/wsl.conf") -> "WslPathTranslator":
+        def read(path):
+            try:
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    return f.read()
+            except OSError:
+                return ""
+        return cls(read(mountinfo_path), read(wsl_conf_path), os.environ.get("WSL_DISTRO_NAME"))
+
+    # --- Linux -> Windows ---
+
+    def to_windows(self, path: str | os.PathLike) -> str:
+        """Absolute Linux path -> Windows path (drive path or \\\\wsl.localhost UNC path)."""
+        path = posixpath.normpath(os.fspath(path))
+        if not path.startswith("/"):
+            raise ValueError(f"Not an absolute Linux path: {path}")
+        for mount_point, windows in self.mounts:
+            if path == mount_point or path.startswith(mount_point.rstrip("/") + "/"):
+                return self._join_windows(windows, path[len(mount_point):])
+
+        # A drive under the automount root that is not mounted (yet).
+        root = self.automount_root
+        if path.startswith(root):
+            letter, _, rest = path[len(root):].partition("/")
+            if len(letter) == 1 and letter.isalpha():
+                return self._join_windows(f"{letter.upper()}:\\", rest)
+
+        if not self.distro:
+            raise ValueError(f"{path} is not on a Windows drive and the distro name is unknown")
+        return self._join_windows(f"\\\\{self.unc_host}\\{self.distro}\\", path)
+
+    @staticmethod
+    def _join_windows(prefix: str, rest: str) -> str:
+        # Every prefix built here ends with a backslash.
+        return prefix + rest.strip("/").replace("/", "\\")
+
+    # --- Windows -> Linux ---
+
+    def to_linux(self, path: str) -> str:
+        """Windows drive path or \\\\wsl$ / \\\\wsl.localhost UNC path -> Linux path."""
+        path = path.replace("/", "\\")
+        if path.startswith("\\\\"):
+            parts = path[2:].split("\\", 2)
+            if len(parts) < 2 or parts[0].lower() not in UNC_HOSTS:
+                raise ValueError(f"Not a WSL UNC path: {path}")
+            if self.distro and parts[1].lower() != self.distro.lower():
+                raise ValueError(f"{path} belongs to distro {parts[1]!r}, not {self.distro!r}")
+            rest = parts[2] if len(parts) > 2 else ""
+            return "/" + rest.replace("\\", "/").strip("/")
+
+        if not _DRIVE_PATH.match(path):
+            raise ValueError(f"Not an absolute Windows path: {path}")
+        path = ntpath.normpath(path)
+        folded = path.lower()
+        best = None
+        for mount_point, windows in self.mounts:
+            prefix = windows.lower()
+            if (folded + "\\").startswith(prefix) and (best is None or len(prefix) > len(best[1])):
+                best = (mount_point, windows)
+        if best is not None:
+            mount_point, windows = best
+            rest = path[len(windows):] if len(path) >= len(windows) else ""
+        else:
+            mount_point, rest = self.automount_root + path[0].lower(), path[3:]
+        rest = rest.replace("\\", "/").strip("/")
+        return posixpath.join(mount_point, rest) if rest else mount_point
+
+    # --- batches ---
+
+    def to_windows_many(self, paths: Iterable[str | os.PathLike]) -> list[str]:
+        return [self.to_windows(p) for p in paths]
+
+    def to_linux_many(self, paths: Iterable[str]) -> list[str]:
+        return [self.to_linux(p) for p in paths]
+
+
+@cache
+def default_translator() -> WslPathTranslator:
+    """Translator for the running distro, built once from mountinfo and wsl.conf."""
+    return WslPathTranslator.from_system()
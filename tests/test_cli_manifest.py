@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from pyhabitat.cli_manifest import MANIFEST_PATH, build_manifest, render_manifest
+
+SRC = str(Path(__file__).resolve().parents[1] / "src")
+
+
+def test_committed_manifest_matches_source():
+    # If this fails, run: python -m pyhabitat.cli_manifest
+    assert MANIFEST_PATH.read_text() == render_manifest(build_manifest())
+
+
+def test_cli_imports_only_the_command_module():
+    code = (
+        "import sys; sys.argv = ['pyhabitat', 'on_linux'];"
+        "from pyhabitat.cli_rising import run_cli; run_cli();"
+        "print(sorted(m for m in sys.modules if m.startswith('pyhabitat.')))"
+    )
+    env = dict(os.environ, PYTHONPATH=SRC)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True).stdout
+    loaded = out.strip().splitlines()[-1]
+    assert "pyhabitat.environment" in loaded
+    for heavy in ("pyhabitat.web", "pyhabitat.launch", "pyhabitat.file_character", "pyhabitat.gui_elements"):
+        assert heavy not in loaded
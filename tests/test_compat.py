@@ -0,0 +1,111 @@
+import threading
+import time
+
+from pyhabitat._compat import single_flight
+
+
+def test_concurrent_callers_share_one_call():
+    calls = []
+    release = threading.Event()
+
+    @single_flight
+    def probe(x):
+        calls.append(x)
+        release.wait(5)
+        return x * 2
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(probe(21))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert results == [42] * 8
+    assert calls == [21]
+    assert probe(21) == 42 and calls == [21]
+    assert probe(1) == 2 and calls == [21, 1]
+
+    probe.cache_clear()
+    probe(21)
+    assert calls == [21, 1, 21]
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    attempts = []
+    release = threading.Event()
+
+    @single_flight
+    def probe():
+        attempts.append(1)
+        release.wait(5)
+        if len(attempts) == 1:
+            raise OSError("no display")
+        return True
+
+    errors = []
+
+    def call():
+        try:
+            probe()
+        except OSError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert errors == ["no display"] * 4
+    assert len(attempts) == 1
+    assert probe() is True
+    assert len(attempts) == 2
+
+
+def test_result_is_not_cached_when_cleared_mid_call():
+    started, release = threading.Event(), threading.Event()
+    values = iter(["stale", "fresh"])
+
+    @single_flight
+    def probe():
+        started.set()
+        release.wait(5)
+        return next(values)
+
+    t = threading.Thread(target=probe)
+    t.start()
+    assert started.wait(5)
+    probe.cache_clear()
+    release.set()
+    t.join(5)
+    assert probe() == "fresh"
+
+
+
+def test_store_false_only_merges_overlapping_calls():
+    calls = []
+    release = threading.Event()
+
+    @single_flight(store=False)
+    def probe():
+        calls.append(1)
+        release.wait(5)
+        return len(calls)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(probe())) for _ in range(4)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert results == [1] * 4
+    assert probe() == 2
+    assert probe() == 3
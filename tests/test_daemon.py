@@ -0,0 +1,87 @@
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+
+import pytest
+
+from pyhabitat.daemon import DaemonClient, FactsDaemon, facts
+from pyhabitat.snapshot import HabitatSnapshot, env_digest
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+@pytest.fixture
+def short_dir():
+    # AF_UNIX paths are limited to ~100 bytes; pytest's tmp_path can exceed that.
+    path = tempfile.mkdtemp(prefix="phd")
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture
+def running(short_dir):
+    daemon = FactsDaemon(os.path.join(short_dir, "s.sock"), watch_interval=0.05, snapshot=HabitatSnapshot())
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    client = DaemonClient(daemon.socket_path, timeout=2)
+    deadline = time.monotonic() + 5
+    while not client.ping():
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.01)
+    yield daemon, client
+    client.shutdown()
+    thread.join(5)
+
+
+def test_client_gets_host_facts(running):
+    daemon, client = running
+    from pyhabitat import on_linux, on_wsl
+
+    assert client.get(["on_linux", "on_wsl"]) == {"on_linux": on_linux(), "on_wsl": on_wsl()}
+    # Per-process facts are never served.
+    assert client.get(["in_repl"]) is None
+
+
+def test_environment_mismatch_is_stale(running):
+    daemon, _ = running
+    assert daemon.respond(f"GET {env_digest(['on_wsl'])} on_wsl").startswith("OK ")
+    assert daemon.respond("GET 0000 on_wsl") == "STALE"
+
+
+def test_watched_file_invalidates(short_dir):
+    marker = os.path.join(short_dir, "marker")
+    snapshot = HabitatSnapshot()
+    daemon = FactsDaemon(os.path.join(short_dir, "s.sock"), watch_interval=0, snapshot=snapshot, watched_paths=[marker])
+    snapshot.fact("on_linux")
+    assert not daemon.check_watched()
+    open(marker, "w").close()
+    assert daemon.check_watched()
+    assert "on_linux" not in snapshot
+
+
+def test_facts_without_daemon_detects_locally(short_dir):
+    from pyhabitat import on_linux
+
+    assert facts(["on_linux", "in_repl"], socket_path=os.path.join(short_dir, "none.sock")) == {
+        "on_linux": on_linux(),
+        "in_repl": False,
+    }
+
+
+def test_socket_in_a_shared_directory_is_refused(short_dir):
+    shared = os.path.join(short_dir, "shared")
+    os.mkdir(shared)
+    os.chmod(shared, 0o777)
+    path = os.path.join(shared, "s.sock")
+
+    with pytest.raises(OSError, match="unsafe socket directory"):
+        FactsDaemon(path, snapshot=HabitatSnapshot()).serve_forever(warm=False)
+
+    # A socket someone else planted there is not trusted either.
+    with socket.socket(socket.AF_UNIX) as planted:
+        planted.bind(path)
+        planted.listen()
+        assert not DaemonClient(path, timeout=0.2).ping()
@@ -0,0 +1,29 @@
+import io
+
+from pyhabitat import environment
+
+
+def test_in_container_markers(monkeypatch):
+    files = {}
+    cgroup = {"text": "0::/\n"}
+
+    def fake_open(path, *args, **kwargs):
+        assert path == "/proc/1/cgroup"
+        return io.StringIO(cgroup["text"])
+
+    monkeypatch.setattr(environment.platform, "system", lambda: "Linux")
+    monkeypatch.setattr(environment.os.path, "exists", lambda path: files.get(path, False))
+    monkeypatch.setattr(environment, "open", fake_open, raising=False)
+    monkeypatch.delenv("container", raising=False)
+    assert not environment.in_container()
+
+    cgroup["text"] = "12:memory:/docker/3f2a\n"
+    assert environment.in_container()
+
+    cgroup["text"] = "0::/\n"
+    files["/.dockerenv"] = True
+    assert environment.in_container()
+
+    files.clear()
+    monkeypatch.setenv("container", "podman")
+    assert environment.in_container()
@@ -0,0 +1,22 @@
+import hashlib
+
+
+def test_fingerprint_matches_hashlib_and_tracks_changes(tmp_path):
+    from pyhabitat.file_character import fingerprint, clear_fingerprint_cache
+
+    clear_fingerprint_cache()
+    target = tmp_path / "release.pyz"
+    target.write_bytes(b"first build")
+    assert fingerprint(target) == hashlib.blake2b(b"first build").hexdigest()
+    assert fingerprint(target, algo="sha256") == hashlib.sha256(b"first build").hexdigest()
+
+    target.write_bytes(b"second build, longer")
+    assert fingerprint(target) == hashlib.blake2b(b"second build, longer").hexdigest()
+
+
+def test_fingerprint_empty_file(tmp_path):
+    from pyhabitat.file_character import fingerprint
+
+    target = tmp_path / "empty"
+    target.write_bytes(b"")
+    assert fingerprint(target, algo="md5") == hashlib.md5(b"").hexdigest()
@@ -0,0 +1,56 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = ROOT / "scripts" / "import_budget.py"
+
+# Heavy stdlib modules that the fast detection paths must not pull in.
+LAZY = {
+    "pyhabitat": {"pathlib", "logging", "subprocess"},
+    "pyhabitat.environment": {"logging", "subprocess", "urllib.request", "socket", "threading"},
+    "pyhabitat.file_character": {"subprocess", "zipfile", "hashlib", "webbrowser"},
+    "pyhabitat.console": {"subprocess", "getpass"},
+    "pyhabitat.gui_elements": {"webbrowser", "matplotlib"},
+    "pyhabitat.web": {"urllib.request", "webbrowser", "concurrent.futures"},
+}
+
+
+@pytest.mark.parametrize("module", sorted(LAZY))
+def test_heavy_imports_are_deferred(module):
+    probe = f"import json, sys, {module}; print(json.dumps(sorted(sys.modules)))"
+    out = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True,
+        env=dict(os.environ, PYTHONPATH=str(ROOT / "src")),
+    ).stdout
+    loaded = set(json.loads(out))
+    assert not LAZY[module] & loaded
+
+
+def test_every_module_has_a_budget():
+    sys.path.insert(0, str(SCRIPT.parent))
+    try:
+        import import_budget
+    finally:
+        sys.path.remove(str(SCRIPT.parent))
+    budgets = json.loads(import_budget.BUDGETS_PATH.read_text())
+    assert set(import_budget.discover_modules()) <= set(budgets)
+
+
+# Timing depends on the machine and its load, and costs over a hundred
+# interpreter launches, so it only runs when asked for:
+#     PYHABITAT_IMPORT_BUDGETS=1 python -m pytest tests/test_import_budget.py
+@pytest.mark.skipif(
+    not os.environ.get("PYHABITAT_IMPORT_BUDGETS"),
+    reason="set PYHABITAT_IMPORT_BUDGETS=1 to check import timings",
+)
+def test_import_budgets_hold():
+    result = subprocess.run(
+        [sys.executable, str(SCRIPT), "--check", "--runs", "3"],
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
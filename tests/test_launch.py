@@ -0,0 +1,115 @@
+from pyhabitat.launch import _normalize_line_endings
+
+
+def test_crlf_pairs_split_across_chunks(tmp_path):
+    target = tmp_path / "notes.txt"
+    # chunk_size=3 puts the CR of the first CRLF at a chunk's end
+    target.write_bytes(b"ab\r\ncd\r\nlone\rcr\r\n")
+    target.chmod(0o640)
+
+    assert _normalize_line_endings(target, chunk_size=3)
+    assert target.read_bytes() == b"ab\ncd\nlone\rcr\n"
+    assert target.stat().st_mode & 0o777 == 0o640
+    assert [p.name for p in tmp_path.iterdir()] == ["notes.txt"]
+
+
+def test_lf_and_binary_files_are_left_alone(tmp_path):
+    unix = tmp_path / "unix.txt"
+    unix.write_bytes(b"one\ntwo\n")
+    binary = tmp_path / "blob.bin"
+    binary.write_bytes(b"\0\r\n\0")
+    before = unix.stat().st_mtime_ns
+
+    assert not _normalize_line_endings(unix)
+    assert not _normalize_line_endings(binary)
+    assert unix.stat().st_mtime_ns == before
+    assert binary.read_bytes() == b"\0\r\n\0"
+
+
+def test_chunk_args_respects_budget():
+    from pyhabitat.launch import _chunk_args
+
+    paths = [f"/tmp/report-{i:02}.pdf" for i in range(10)]
+    # each path costs 18 bytes + NUL + pointer = 27; "open" costs 13
+    chunks = _chunk_args(paths, ["open"], budget=13 + 3 * 27)
+    assert [len(c) for c in chunks] == [3, 3, 3, 1]
+    assert sum(chunks, []) == paths
+
+
+def test_launch_plan_groups_multi_file_handlers(tmp_path, monkeypatch):
+    from pyhabitat import launch
+    from pyhabitat.launchers import Launcher
+
+    viewer = Launcher("viewer.desktop", ["viewer", "--new", "%F"])
+    single = Launcher("single.desktop", ["single", "%f"])
+    handlers = {".pdf": viewer, ".png": single}
+    files = []
+    for name in ["a.pdf", "b.png", "c.pdf", "d.txt", "e.pdf"]:
+        (tmp_path / name).write_text("x")
+        files.append(tmp_path / name)
+
+    for probe in ("on_wsl", "on_macos", "on_termux"):
+        monkeypatch.setattr(launch, probe, lambda: False)
+    monkeypatch.setattr(launch, "on_linux", lambda: True)
+    monkeypatch.setattr(launch.sys, "platform", "linux")
+    monkeypatch.setattr(launch, "launcher_for", lambda p: handlers.get(p.suffix))
+
+    plan = launch._launch_plan(files)
+    assert plan == [
+        ["single", str(tmp_path / "b.png")],
+        ["xdg-open", str(tmp_path / "d.txt")],
+        ["viewer", "--new"] + [str(tmp_path / n) for n in ("a.pdf", "c.pdf", "e.pdf")],
+    ]
+
+
+def test_sync_and_async_editors_share_one_ladder(tmp_path, monkeypatch):
+    import asyncio
+    import subprocess
+
+    from pyhabitat import launch
+
+    target = tmp_path / "notes.txt"
+    target.write_text("x")
+    for probe in ("on_windows", "on_wsl", "on_macos", "on_termux", "on_ish_alpine"):
+        monkeypatch.setattr(launch, probe, lambda: False)
+    monkeypatch.setattr(launch, "on_linux", lambda: True)
+    monkeypatch.setattr(launch, "launcher_for", lambda path, default_mime=None: None)
+    monkeypatch.setattr(launch.shutil, "which", lambda name: name if name in ("mousepad", "nano") else None)
+
+    steps = list(launch._editor_steps(target, background=True))
+    assert [(s.command[0], s.kind) for s in steps] == [
+        ("xdg-open", "probe"), ("mousepad", "gui"), ("nano", "terminal"),
+    ]
+
+    # Blocking version: xdg-open finds no handler, mousepad is spawned.
+    started = []
+
+    def run(command, check=False, **kwargs):
+        if check:
+            raise subprocess.CalledProcessError(3, command)
+        started.append(("run", command[0]))
+
+    monkeypatch.setattr(launch.subprocess, "run", run)
+    monkeypatch.setattr(launch, "spawn", lambda command, **kwargs: started.append(("spawn", command[0])))
+    launch.edit_textfile(target, background=True)
+    assert started == [("spawn", "mousepad")]
+
+    # Async version: same choice, started with spawn_async.
+    async def fake_spawn_async(command, **kwargs):
+        return _Finished(command, 3 if command[0] == "xdg-open" else 0)
+
+    monkeypatch.setattr(launch, "spawn_async", fake_spawn_async)
+    handle = asyncio.run(launch.edit_textfile_async(target))
+    assert handle.command[0] == "mousepad"
+
+
+class _Finished:
+    """Stand-in LaunchHandle for a child that has already exited."""
+
+    def __init__(self, command, code):
+        self.command, self.code = command, code
+
+    def __await__(self):
+        if False:
+            yield
+        return self.code
@@ -0,0 +1,66 @@
+import json
+import os
+import sys
+
+import pytest
+
+from pyhabitat import launchers
+
+
+@pytest.fixture
+def xdg(tmp_path, monkeypatch):
+    dirs = {name: tmp_path / name for name in ("config", "data", "cache")}
+    (dirs["data"] / "applications").mkdir(parents=True)
+    dirs["config"].mkdir()
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(dirs["config"]))
+    monkeypatch.setenv("XDG_DATA_HOME", str(dirs["data"]))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(dirs["cache"]))
+    monkeypatch.setenv("XDG_CONFIG_DIRS", str(tmp_path / "none"))
+    monkeypatch.setenv("XDG_DATA_DIRS", str(tmp_path / "none"))
+    monkeypatch.delenv("XDG_CURRENT_DESKTOP", raising=False)
+    monkeypatch.setattr(launchers, "_cache", None)
+    monkeypatch.setattr(launchers, "_query_xdg_mime", lambda mime: None)
+    return dirs
+
+
+def _desktop(xdg, name, exec_line):
+    path = xdg["data"] / "applications" / name
+    path.write_text(f"[Desktop Entry]\nType=Application\nName={name}\nExec={exec_line}\n")
+
+
+def test_resolves_from_mimeapps_and_invalidates_on_change(xdg, monkeypatch):
+    _desktop(xdg, "first.desktop", f"{sys.executable} -m first %F")
+    _desktop(xdg, "second.desktop", f"{sys.executable} -m second %f")
+    mimeapps = xdg["config"] / "mimeapps.list"
+    mimeapps.write_text("[Default Applications]\ntext/plain=first.desktop;\n")
+
+    launcher = launchers.resolve_launcher("text/plain")
+    assert launcher.desktop_id == "first.desktop"
+    assert launcher.accepts_multiple
+    assert launcher.command(["a", "b"]) == [sys.executable, "-m", "first", "a", "b"]
+    stored = json.loads((xdg["cache"] / "pyhabitat" / "launchers.json").read_text())
+    assert len(stored["entries"]) == 1
+
+    resolve = launchers._resolve_uncached
+    calls = []
+    monkeypatch.setattr(launchers, "_resolve_uncached", lambda mime: calls.append(mime) or resolve(mime))
+    assert launchers.resolve_launcher("text/plain").desktop_id == "first.desktop"
+    assert calls == []
+
+    mimeapps.write_text("[Default Applications]\ntext/plain=second.desktop;\n")
+    os.utime(mimeapps, ns=(0, mimeapps.stat().st_mtime_ns + 10**9))
+    launcher = launchers.resolve_launcher("text/plain")
+    assert calls == ["text/plain"]
+    assert launcher.desktop_id == "second.desktop"
+    assert launcher.command(["a", "b"]) == [sys.executable, "-m", "second", "a"]
+
+
+def test_missing_program_falls_through_to_next_association(xdg):
+    _desktop(xdg, "gone.desktop", "/nonexistent/editor %f")
+    _desktop(xdg, "here.desktop", f"{sys.executable} %U")
+    (xdg["config"] / "mimeapps.list").write_text(
+        "[Default Applications]\ntext/plain=gone.desktop;\n"
+        "[Added Associations]\ntext/plain=here.desktop;\n"
+    )
+    assert launchers.resolve_launcher("text/plain").desktop_id == "here.desktop"
+    assert launchers.resolve_launcher("image/x-unknown") is None
@@ -0,0 +1,42 @@
+import pstats
+
+from pyhabitat.profiling import profile_detectors, render_profile, run_profiled
+
+
+def test_profile_selected_detectors():
+    results = profile_detectors(["on_linux", "can_spawn_shell_lite", "launch_file"], runs=3)
+    by_name = {r["name"]: r for r in results}
+    # launch_file is not a detector and must never be run
+    assert set(by_name) == {"on_linux", "can_spawn_shell_lite"}
+    for r in results:
+        assert r["error"] is None
+        assert 0 <= r["cold"]["mean"] <= r["cold"]["max"]
+        assert r["cold"]["p95"] <= r["cold"]["max"]
+    table = render_profile(results)
+    assert table.splitlines()[0].startswith("detector")
+    assert "on_linux" in table
+
+
+
+def test_timed_runs_are_not_traced(monkeypatch):
+    import tracemalloc
+
+    from pyhabitat import profiling
+
+    traced = []
+
+    def probe():
+        traced.append(tracemalloc.is_tracing())
+        return bytearray(1 << 16)
+
+    monkeypatch.setattr(profiling, "_detectors", lambda names: [("probe", probe)])
+    (result,) = profile_detectors(runs=3)
+    # 3 cold and 3 warm timed calls, then one traced call for the peak
+    assert traced == [False] * 6 + [True]
+    assert result["peak_bytes"] >= 1 << 16
+
+def test_run_profiled_dumps_stats(tmp_path, monkeypatch):
+    target = tmp_path / "cli.prof"
+    monkeypatch.setenv("PYHABITAT_PROFILE", str(target))
+    assert run_profiled(sum, [1, 2, 3]) == 6
+    assert pstats.Stats(str(target)).total_calls > 0
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+
+def _closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_wait_until_ready_tcp_and_timeout():
+    from pyhabitat.readiness import wait_until_ready
+
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        port = listener.getsockname()[1]
+        assert wait_until_ready(f"127.0.0.1:{port}", timeout=1.0)
+
+    assert not wait_until_ready(f"http://127.0.0.1:{_closed_port()}/", timeout=0.3)
+
+
+def test_async_head_probe_against_http_server():
+    from pyhabitat.readiness import wait_until_all_ready_async
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_HEAD(self):
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    httpd = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    up = f"http://127.0.0.1:{httpd.server_address[1]}/"
+    down = f"http://127.0.0.1:{_closed_port()}/"
+    try:
+        results = asyncio.run(
+            wait_until_all_ready_async([up, down], timeout=0.5, health_path="/healthz")
+        )
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    assert results == {up: True, down: False}
+
+
+def test_shared_watcher_resolves_futures_and_fires_callbacks():
+    from pyhabitat.readiness import ReadinessWatcher
+
+    watcher = ReadinessWatcher()
+    fired = []
+
+    late = socket.socket()
+    late.bind(("127.0.0.1", 0))
+    late_port = late.getsockname()[1]
+
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        up = f"127.0.0.1:{listener.getsockname()[1]}"
+        later = f"127.0.0.1:{late_port}"
+        down = f"127.0.0.1:{_closed_port()}"
+
+        futures = {
+            url: watcher.watch(url, timeout=2.0 if url != down else 0.3, callback=fired.append)
+            for url in (up, later, down)
+        }
+        threading.Timer(0.2, late.listen).start()
+
+        assert futures[up].result(timeout=3) is True
+        assert futures[later].result(timeout=3) is True
+        assert futures[down].result(timeout=3) is False
+    late.close()
+
+    assert sorted(fired) == sorted([up, later])
+    assert watcher.pending() == 0
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_process_watcher_works_in_forked_child():
+    from pyhabitat.readiness import watch_until_ready
+
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        url = f"127.0.0.1:{listener.getsockname()[1]}"
+        # Start the shared watcher thread in the parent before forking.
+        assert watch_until_ready(url, timeout=2.0).result(timeout=3) is True
+
+        pid = os.fork()
+        if pid == 0:
+            try:
+                ok = watch_until_ready(url, timeout=1.0).result(timeout=2) is True
+            except Exception:
+                ok = False
+            os._exit(0 if ok else 1)
+        _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
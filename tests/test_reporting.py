@@ -0,0 +1,35 @@
+import json
+import sys
+
+import pyhabitat
+from pyhabitat.reporting import collect_report, render_report
+
+
+def test_collect_report_structure_and_timings(tmp_path):
+    script = tmp_path / "tool.py"
+    script.write_text("print('hi')\n")
+    data = collect_report(path=script)
+
+    titles = [s["title"] for s in data["sections"]]
+    assert titles[-2:] == ["Interpreter Checks", "Current Environment Check"]
+    checks = {c["name"]: c for s in data["sections"][:3] for c in s["checks"]}
+    assert checks["on_linux"]["value"] == pyhabitat.on_linux()
+    assert all(c["seconds"] >= 0 and c["error"] is None for c in checks.values())
+
+    env = data["sections"][-1]
+    assert env["script_path"] == str(script.resolve())
+    assert {c["name"]: c["value"] for c in env["checks"]}["is_python_script"] is True
+
+    assert json.loads(render_report(data, "json"))["sections"][0]["checks"]
+    assert "| `is_python_script()` | `True` |" in render_report(data, "markdown")
+    text = render_report(data, "text")
+    assert f"script_path = {script.resolve()}" in text
+    assert text.endswith("=== PyHabitat Report Complete ===\n=================================\n\n")
+
+
+def test_classify_matches_individual_checks():
+    from pyhabitat import file_character as fc
+
+    for path in (sys.executable, __file__):
+        combined = fc.classify_executable(path)
+        assert combined == {name: bool(getattr(fc, name)(path)) for name in fc.CLASSIFY_CHECKS}
@@ -0,0 +1,170 @@
+import time
+
+
+def _wait_for_usage(cache, path, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        usage = cache.usage(path)
+        if not usage["computing"] or time.monotonic() > deadline:
+            return usage
+        time.sleep(0.01)
+
+
+def test_dir_size_cache_sums_subtree(tmp_path):
+    from pyhabitat.servedirs import DirSizeCache
+
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a" / "x.bin").write_bytes(b"x" * 100)
+    (tmp_path / "a" / "b" / "y.bin").write_bytes(b"y" * 50)
+
+    cache = DirSizeCache(revalidate_after=0)
+    try:
+        usage = _wait_for_usage(cache, tmp_path / "a")
+        assert usage == {"size": 150, "files": 2, "computing": False}
+
+        (tmp_path / "a" / "b" / "z.bin").write_bytes(b"z" * 25)
+        usage = _wait_for_usage(cache, tmp_path / "a")
+        assert usage == {"size": 175, "files": 3, "computing": False}
+    finally:
+        cache.shutdown()
+
+
+def test_mounts_are_served_under_prefix(tmp_path):
+    import json
+    import threading
+    import urllib.error
+    import urllib.request
+    from pyhabitat.servedirs import ServedirsServer, ServedirsHandler, TOKEN_HEADER
+
+    base = tmp_path / "base"
+    other = tmp_path / "other"
+    outside = tmp_path / "outside"
+    for directory in (base, other, outside):
+        directory.mkdir()
+    (other / "report.txt").write_text("mounted")
+
+    httpd = ServedirsServer(
+        ("127.0.0.1", 0),
+        lambda *args, **kwargs: ServedirsHandler(*args, directory=base, **kwargs),
+        dir_sizes=False,
+        control_token="secret",
+        allowed_mounts=[other],
+    )
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{httpd.server_address[1]}/"
+
+    def post(path, headers):
+        request = urllib.request.Request(
+            url + "api/mounts",
+            data=json.dumps({"name": "x", "path": str(path)}).encode(),
+            headers=headers,
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, None
+
+    good = {"Content-Type": "application/json", TOKEN_HEADER: "secret"}
+    try:
+        # A cross-site "simple" request: no token, text/plain body.
+        assert post(other, {"Content-Type": "text/plain"})[0] == 403
+        assert post(other, dict(good, **{TOKEN_HEADER: "wrong"}))[0] == 403
+        assert post(other, dict(good, **{"Content-Type": "text/plain"}))[0] == 415
+        assert post(other, dict(good, Origin="http://evil.example"))[0] == 403
+        assert post(outside, good)[0] == 403
+        assert httpd.mounts.names() == []
+
+        status, body = post(other, dict(good, Origin=url.rstrip("/")))
+        assert status == 201 and body["url"] == "/m/x/"
+        with urllib.request.urlopen(url + "m/x/report.txt") as response:
+            assert response.read() == b"mounted"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_parse_byte_size():
+    from pyhabitat.servedirs import parse_byte_size
+
+    assert parse_byte_size("512K") == 512 * 1024
+    assert parse_byte_size("1.5MB") == int(1.5 * 1024 * 1024)
+    assert parse_byte_size(2048) == 2048
+    assert parse_byte_size(None) is None
+    assert parse_byte_size("0") is None
+
+
+def test_token_bucket_throttles_beyond_burst():
+    from pyhabitat.servedirs import TokenBucket
+
+    bucket = TokenBucket(rate=100_000, burst=10_000)
+    start = time.monotonic()
+    bucket.consume(10_000)
+    assert time.monotonic() - start < 0.05
+    bucket.consume(20_000)
+    assert time.monotonic() - start >= 0.15
+
+
+def test_request_metrics_render():
+    from pyhabitat.servedirs import RequestMetrics
+
+    metrics = RequestMetrics()
+    metrics.observe("listing", 200, 0.003, 2000)
+    metrics.observe("listing", 200, 0.2, 900)
+    metrics.observe("file", 404, 0.001, 100)
+
+    data = metrics.to_dict()["routes"]
+    assert data["listing"]["requests"] == {"200": 2}
+    assert data["listing"]["latency_seconds"]["buckets"]["0.005"] == 1
+    assert data["listing"]["latency_seconds"]["buckets"]["+Inf"] == 2
+
+    text = metrics.to_prometheus()
+    assert 'servedirs_requests_total{route="file",code="404"} 1' in text
+    assert 'servedirs_response_size_bytes_bucket{route="listing",le="1024"} 1' in text
+
+
+def test_access_log_writes_json_and_rotates(tmp_path):
+    import json
+    from pyhabitat.servedirs import AccessLog
+
+    log_path = tmp_path / "access.log"
+    access_log = AccessLog(log_path, "json", max_bytes=300, backup_count=2, batch_size=1)
+    for n in range(10):
+        access_log.submit({
+            "time": 0, "client": "127.0.0.1", "request": f"GET /{n} HTTP/1.1",
+            "status": 200, "bytes": n,
+        })
+    access_log.close()
+
+    lines = log_path.read_text().splitlines()
+    assert json.loads(lines[-1])["request"] == "GET /9 HTTP/1.1"
+    assert (tmp_path / "access.log.1").exists()
+    assert not (tmp_path / "access.log.3").exists()
+    assert access_log.dropped == 0
+
+
+def test_errors_reach_stderr_without_access_log(tmp_path, capsys):
+    import threading
+    import urllib.error
+    import urllib.request
+    from pyhabitat.servedirs import ServedirsServer, ServedirsHandler
+
+    httpd = ServedirsServer(
+        ("127.0.0.1", 0),
+        lambda *args, **kwargs: ServedirsHandler(*args, directory=tmp_path, **kwargs),
+        dir_sizes=False,
+        access_log=None,
+    )
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{httpd.server_address[1]}/missing.txt")
+        except urllib.error.HTTPError as e:
+            assert e.code == 404
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    assert "code 404" in capsys.readouterr().err
@@ -0,0 +1,102 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from pyhabitat.cli_rising import parse_query_token, run_query
+from pyhabitat.snapshot import HabitatSnapshot, export_facts, export_facts_fd, prewarm
+
+
+def test_snapshot_memoizes_per_argument_set(monkeypatch):
+    import pyhabitat
+
+    calls = []
+    monkeypatch.setattr(pyhabitat, "is_elf", lambda **kw: calls.append(kw) or True, raising=False)
+    snap = HabitatSnapshot()
+    assert snap.fact("is_elf", exec_path=Path("/a")) is True
+    assert snap.fact("is_elf", exec_path=Path("/a")) is True
+    assert snap.fact("is_elf", exec_path=Path("/b")) is True
+    assert len(calls) == 2
+
+    snap.invalidate("is_elf")
+    snap.fact("is_elf", exec_path=Path("/a"))
+    assert len(calls) == 3
+    with pytest.raises(KeyError):
+        snap.fact("__version__")
+
+
+def test_parse_query_token():
+    assert parse_query_token("on_wsl") == ("on_wsl", {})
+    assert parse_query_token("is_elf:path=/bin/ls,debug=no") == (
+        "is_elf", {"exec_path": Path("/bin/ls"), "debug": False}
+    )
+    assert parse_query_token("read_magic_bytes:path=x,length=2")[1]["length"] == 2
+    with pytest.raises(ValueError):
+        parse_query_token("is_elf:color=blue")
+
+
+def test_run_query_json_and_env(tmp_path, capsys):
+    script = tmp_path / "tool.py"
+    script.write_text("print('hi')\n")
+    token = f"is_python_script:path={script}"
+
+    assert run_query(["on_linux", token]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert out[token] is True and isinstance(out["on_linux"], bool)
+
+    assert run_query(["on_linux", "nope"], fmt="env", prefix="PH_") == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] in ("PH_on_linux=true", "PH_on_linux=false")
+    assert lines[1] == "PH_nope=''"
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_keeps_prewarmed_facts_but_not_process_facts():
+    snap = prewarm(["on_linux", "in_repl"], snapshot=HabitatSnapshot())
+    assert "on_linux" in snap and "in_repl" in snap
+
+    pid = os.fork()
+    if pid == 0:  # child: exit status reports what survived
+        os._exit(0 if ("on_linux" in snap and "in_repl" not in snap) else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    assert "in_repl" in snap  # the parent is untouched
+
+
+def test_dumps_and_adopt_share_only_transferable_facts(monkeypatch):
+    parent = prewarm(["on_linux", "in_repl", "is_elf"], snapshot=HabitatSnapshot())
+    data = parent.dumps()
+
+    child = HabitatSnapshot()
+    assert child.adopt(data) == 1
+    assert "on_linux" in child and "in_repl" not in child and "is_elf" not in child
+
+    # A different DISPLAY (or interpreter, or boot) makes the facts stale.
+    monkeypatch.setenv("DISPLAY", ":99" if os.environ.get("DISPLAY") != ":99" else ":98")
+    assert HabitatSnapshot().adopt(data) == 0
+    assert HabitatSnapshot().adopt("not json") == 0
+
+
+@pytest.mark.parametrize("via_fd", [False, True])
+def test_child_process_adopts_exported_facts(via_fd):
+    import subprocess
+    import sys
+
+    if via_fd and not hasattr(os, "pread"):
+        pytest.skip("needs os.pread")
+    snap = prewarm(["on_linux"], snapshot=HabitatSnapshot())
+    env = dict(os.environ, PYTHONPATH=str(Path(__file__).resolve().parent.parent / "src"))
+    pass_fds = ()
+    if via_fd:
+        pass_fds = (export_facts_fd(snap, env),)
+    else:
+        export_facts(snap, env)
+    probe = "from pyhabitat.snapshot import default_snapshot; print('on_linux' in default_snapshot())"
+    try:
+        out = subprocess.run([sys.executable, "-c", probe], env=env, pass_fds=pass_fds,
+                             capture_output=True, text=True, check=True).stdout
+    finally:
+        for fd in pass_fds:
+            os.close(fd)
+    assert out.strip() == "True"
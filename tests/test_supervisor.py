@@ -0,0 +1,107 @@
+import os
+import sys
+import time
+
+import pytest
+
+from pyhabitat.supervisor import ProcessSupervisor, get_supervisor
+
+
+def test_children_are_reaped_in_background():
+    supervisor = ProcessSupervisor(poll_interval=0.05)
+    proc = supervisor.spawn([sys.executable, "-c", "import sys; sys.exit(3)"])
+    assert [r.pid for r in supervisor.children()] == [proc.pid]
+
+    deadline = time.monotonic() + 5
+    while supervisor.children() and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    assert supervisor.children() == []
+    (record,) = supervisor.records()
+    assert record.returncode == 3
+    assert not record.running
+    assert record.duration > 0
+
+
+def test_concurrent_reaps_claim_each_child_once():
+    import threading
+
+    supervisor = ProcessSupervisor(poll_interval=0.05)
+    procs = [supervisor.spawn([sys.executable, "-c", "pass"]) for _ in range(6)]
+    for proc in procs:
+        proc.wait()
+
+    counts, errors = [], []
+    barrier = threading.Barrier(8)
+
+    def reap():
+        barrier.wait()
+        try:
+            counts.append(supervisor.reap())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=reap) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    supervisor.reap()  # whatever the helper thread had not finished
+
+    assert errors == []
+    assert supervisor.children() == []
+    finished = supervisor.records()
+    assert sorted(r.pid for r in finished) == sorted(p.pid for p in procs)
+    assert all(r.pidfd is None for r in finished)
+
+
+def test_shutdown_terminates_only_flagged_children():
+    supervisor = ProcessSupervisor(poll_interval=0.05)
+    sleeper = [sys.executable, "-c", "import time; time.sleep(30)"]
+    server = supervisor.spawn(sleeper, terminate_on_exit=True)
+    editor = supervisor.spawn(sleeper)
+    try:
+        supervisor.shutdown(timeout=5)
+        assert server.poll() is not None
+        assert editor.poll() is None
+        assert [r.pid for r in supervisor.children()] == [editor.pid]
+    finally:
+        editor.kill()
+        editor.wait()
+
+
+def test_launch_handle_await_and_cancel():
+    import asyncio
+
+    from pyhabitat.supervisor import spawn_async
+
+    async def scenario():
+        quick = await spawn_async([sys.executable, "-c", "raise SystemExit(2)"])
+        assert await quick == 2
+        assert not quick.running
+
+        slow = await spawn_async([sys.executable, "-c", "import time; time.sleep(30)"])
+        assert slow.running
+        assert slow.cancel()
+        assert await asyncio.wait_for(slow.wait(), 5) != 0
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_leaves_parent_children_alone():
+    parent_supervisor = get_supervisor()
+    proc = parent_supervisor.spawn([sys.executable, "-c", "import time; time.sleep(30)"], terminate_on_exit=True)
+    try:
+        pid = os.fork()
+        if pid == 0:
+            # The inherited atexit hook must not touch the parent's children.
+            parent_supervisor.shutdown(timeout=0)
+            fresh = get_supervisor() is not parent_supervisor
+            os._exit(0 if fresh else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.WEXITSTATUS(status) == 0
+        assert proc.poll() is None
+    finally:
+        proc.kill()
+        proc.wait()
@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+from pyhabitat import watch as watch_mod
+from pyhabitat.watch import Watcher, watch
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    git = tmp_path / ".git"
+    (git / "refs" / "heads").mkdir(parents=True)
+    (git / "HEAD").write_text("ref: refs/heads/main\n")
+    (git / "refs" / "heads" / "main").write_text("a" * 40 + "\n")
+    (tmp_path / "sub").mkdir()
+    monkeypatch.chdir(tmp_path / "sub")
+    return git
+
+
+def test_git_changes_are_reported_once(repo):
+    watcher = Watcher(("git",))
+    assert watcher.poll() == {"git": {"old": None, "new": {"branch": "main", "head": "a" * 40}}}
+    assert watcher.poll() == {}
+
+    (repo / "packed-refs").write_text("b" * 40 + " refs/heads/topic\n")
+    (repo / "HEAD").write_text("ref: refs/heads/topic\n")
+    assert watcher.poll()["git"]["new"] == {"branch": "topic", "head": "b" * 40}
+
+    (repo / "HEAD").write_text("c" * 40 + "\n")
+    assert watcher.poll()["git"] == {
+        "old": {"branch": "topic", "head": "b" * 40},
+        "new": {"branch": None, "head": "c" * 40},
+    }
+
+
+def test_network_mounts_from_mountinfo(tmp_path, monkeypatch):
+    mountinfo = tmp_path / "mountinfo"
+    mountinfo.write_text(
+        "22 1 8:1 / / rw - ext4 /dev/sda1 rw\n"
+        "40 22 0:40 / /mnt/share\\040docs rw - cifs //nas/docs rw,vers=3.0\n"
+        "41 22 0:41 / /mnt/c rw - 9p drvfs rw,aname=drvfs;path=C:\\\n"
+    )
+    monkeypatch.setattr(watch_mod, "_MOUNTINFO", str(mountinfo))
+    assert watch_mod._mounts_value() == {"/mnt/share docs": {"type": "cifs", "source": "//nas/docs"}}
+
+
+def test_watch_calls_back_with_initial_state_then_stops():
+    seen = []
+    stop = threading.Event()
+
+    def callback(changes):
+        seen.append(changes)
+        stop.set()
+
+    watch(callback, interval=0.01, facts=("tty",), stop=stop)
+    assert list(seen[0]) == ["tty"] and seen[0]["tty"]["old"] is None
+
+
+def test_unknown_fact():
+    with pytest.raises(ValueError):
+        Watcher(("weather",))
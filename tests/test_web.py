@@ -0,0 +1,33 @@
+import socket
+
+import pytest
+
+
+def test_reserved_ports_are_held_and_not_reissued():
+    from pyhabitat.web import reserve_ports, find_open_port
+
+    reservations = reserve_ports(3)
+    try:
+        ports = [r.port for r in reservations]
+        assert len(set(ports)) == 3
+        assert find_open_port(ports[0]) not in ports
+
+        with socket.socket() as other:
+            with pytest.raises(OSError):
+                other.bind(("127.0.0.1", ports[0]))
+    finally:
+        for reservation in reservations:
+            reservation.release()
+
+
+def test_detach_hands_off_bound_socket():
+    from pyhabitat.web import reserve_port
+
+    reservation = reserve_port()
+    sock = reservation.detach()
+    try:
+        assert sock.getsockname()[1] == reservation.port
+        sock.listen()
+    finally:
+        sock.close()
+    reservation.release()  # no-op once detached
@@ -0,0 +1,45 @@
+import pytest
+
+from pyhabitat.wslpath import WslPathTranslator, parse_mountinfo
+
+# WSL2 (9p) drive C, a WSL1-style drvfs drive D with a space in the mount
+# point, and ordinary Linux mounts that must be ignored.
+MOUNTINFO = "\n".join([
+    r"63 1 8:48 / / rw,relatime - ext4 /dev/sdd rw,discard,errors=remount-ro",
+    r"78 63 0:61 / /mnt/c rw,noatime - 9p drvfs rw,dirsync,aname=drvfs;path=C:\134;uid=1000;gid=1000,trans=virtio",
+    r"79 63 0:62 / /win/data\040drive rw,noatime - drvfs D:\134 rw,noatime,uid=1000",
+    r"80 63 0:23 / /proc rw,nosuid - proc proc rw",
+])
+WSL_CONF = "[automount]\nroot = /win/\n"
+
+
+@pytest.fixture
+def translator():
+    return WslPathTranslator(MOUNTINFO, WSL_CONF, distro="Ubuntu")
+
+
+def test_parse_mountinfo_finds_drvfs_and_9p_drives():
+    assert parse_mountinfo(MOUNTINFO) == [("/mnt/c", "C:\\"), ("/win/data drive", "D:\\")]
+
+
+def test_linux_to_windows(translator):
+    assert translator.to_windows("/mnt/c") == "C:\\"
+    assert translator.to_windows("/mnt/c/Users/me/../me/notes.txt") == "C:\\Users\\me\\notes.txt"
+    assert translator.to_windows("/win/data drive/x") == "D:\\x"
+    # Not mounted, but under the automount root
+    assert translator.to_windows("/win/e/logs") == "E:\\logs"
+    assert translator.to_windows("/home/me/repo") == "\\\\wsl.localhost\\Ubuntu\\home\\me\\repo"
+    assert translator.to_windows_many(["/mnt/c/a", "/etc"]) == ["C:\\a", "\\\\wsl.localhost\\Ubuntu\\etc"]
+
+
+def test_windows_to_linux(translator):
+    assert translator.to_linux("C:\\Users\\me") == "/mnt/c/Users/me"
+    assert translator.to_linux("c:/Users") == "/mnt/c/Users"
+    assert translator.to_linux("D:\\") == "/win/data drive"
+    assert translator.to_linux("F:\\music") == "/win/f/music"
+    assert translator.to_linux("\\\\wsl$\\Ubuntu\\home\\me") == "/home/me"
+    assert translator.to_linux("\\\\wsl.localhost\\ubuntu") == "/"
+    with pytest.raises(ValueError):
+        translator.to_linux("\\\\wsl$\\Debian\\home")
+    with pytest.raises(ValueError):
+        translator.to_linux("relative\\path")